@@ -0,0 +1,6 @@
+"""Calculation core for the Beam SFD, BMD & Deflection Calculator."""
+from beamcalc.analysis import analyse
+from beamcalc.model import AnalysisResult, BeamModel
+from beamcalc.reactions import UnsolvableBeamError
+
+__all__ = ["AnalysisResult", "BeamModel", "UnsolvableBeamError", "analyse"]
@@ -0,0 +1,148 @@
+"""Headless analysis pipeline: BeamModel in, AnalysisResult out.
+
+The pipeline is split into stages (reactions, diagrams, influence data and
+deflection) so that callers holding an AnalysisCache, such as the Streamlit app,
+can reuse the stages whose inputs did not change.
+"""
+from beamcalc.cache import load_key
+from beamcalc.deflection import integrate_deflection
+from beamcalc.engine import bending_moment, shear_force
+from beamcalc.mesh import adaptive_mesh
+from beamcalc.model import AnalysisResult
+from beamcalc.piecewise import BeamPolynomials, beam_polynomials, deflection_polynomial
+from beamcalc.reactions import UnsolvableBeamError, solve_reactions, split_reactions
+from beamcalc.virtual_work import calculate_deflection, calculate_unit_load_moment
+
+
+def _stage(cache, stage, inputs, compute):
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(stage, inputs, compute)
+
+
+def _load_inputs(model):
+    return load_key(model.point_loads, model.distributed_loads, model.moments)
+
+
+def compute_reactions(model, cache=None):
+    """Support reactions of the model; raises UnsolvableBeamError."""
+    return _stage(
+        cache,
+        "reactions",
+        (model.supports, _load_inputs(model), model.beam_length),
+        lambda: solve_reactions(model.supports, model.point_loads, model.distributed_loads, model.moments, model.beam_length),
+    )
+
+
+def _diagram_inputs(model, reactions):
+    return (model.supports, reactions or [], _load_inputs(model), model.beam_length, model.resolution, model.mesh)
+
+
+def compute_diagrams(model, reactions, cache=None):
+    """Return (x_coords, shear, moment) for the given reactions (False when unsolved)."""
+    support_reactions, support_moments = split_reactions(model.supports, reactions)
+
+    def compute():
+        x_coords = None
+        if model.mesh == "adaptive":
+            x_coords = adaptive_mesh(model.supports, support_reactions, support_moments, model.point_loads,
+                                     model.distributed_loads, model.moments, model.beam_length, model.resolution)
+        x_coords, shear = shear_force(support_reactions, model.point_loads, model.distributed_loads, model.beam_length,
+                                      model.resolution, x_coords=x_coords)
+        x_coords, moment = bending_moment(model.supports, support_reactions, support_moments, model.point_loads,
+                                          model.distributed_loads, model.moments, model.beam_length, model.resolution,
+                                          x_coords=x_coords)
+        return x_coords, shear, moment
+
+    return _stage(cache, "diagrams", _diagram_inputs(model, reactions), compute)
+
+
+def compute_polynomials(model, reactions, cache=None):
+    """Exact BeamPolynomials of the model, independent of the grid.
+
+    Like the deflection stage, the polynomials are cached for EI = 1 and rescaled.
+    """
+    support_reactions, support_moments = split_reactions(model.supports, reactions)
+
+    def compute():
+        shear, moment = beam_polynomials(model.supports, support_reactions, support_moments, model.point_loads,
+                                         model.distributed_loads, model.moments, model.beam_length)
+        return shear, moment, deflection_polynomial(moment, model.supports, 1.0)
+
+    inputs = (model.supports, reactions or [], _load_inputs(model), model.beam_length)
+    shear, moment, deflection = _stage(cache, "polynomials", inputs, compute)
+    return BeamPolynomials(shear, moment, deflection / model.EI)
+
+
+def compute_unit_load_moments(model, cache=None):
+    """Return (x_coords, unit_weight_moments), the O(N^2) virtual work matrix, in RAM or on disk."""
+    return _stage(
+        cache,
+        "influence",
+        (model.supports, model.beam_length, model.resolution, model.matrix_storage),
+        lambda: calculate_unit_load_moment(model.supports, model.beam_length, model.resolution, model.matrix_storage),
+    )
+
+
+def compute_deflection(model, reactions, x_coords, moment, cache=None):
+    """Deflection along the beam with the model's deflection method.
+
+    The stage is cached for EI = 1 and rescaled, as deflection is proportional to 1 / EI.
+    """
+    def compute():
+        if model.deflection_method == "virtual_work":
+            _, unit_weight_moments = compute_unit_load_moments(model, cache)
+            return calculate_deflection(x_coords, moment, unit_weight_moments, model.beam_length, model.resolution, 1.0)[1]
+        shear = None
+        if model.mesh == "adaptive":
+            # The mesh is coarse where M is smooth, so integrate with the exact-for-cubics rule
+            _, shear, _ = compute_diagrams(model, reactions, cache)
+        return integrate_deflection(x_coords, moment, model.supports, 1.0, method=model.deflection_method, shear=shear)[1]
+
+    inputs = (_diagram_inputs(model, reactions), model.deflection_method)
+    return _stage(cache, "deflection", inputs, compute) / model.EI
+
+
+def stage_inputs(model):
+    """The model inputs of each cached stage, by stage name in pipeline order.
+
+    The reactions follow from the supports, loads and length, so they are not
+    listed as inputs of the stages that use them.
+    """
+    beam = (model.supports, _load_inputs(model), model.beam_length)
+    grid = beam + (model.resolution, model.mesh)
+    inputs = {"reactions": beam, "diagrams": grid}
+    if model.deflection_method == "virtual_work":
+        inputs["influence"] = (model.supports, model.beam_length, model.resolution, model.matrix_storage)
+    inputs["deflection"] = grid + (model.deflection_method,)
+    inputs["polynomials"] = beam
+    return inputs
+
+
+def changed_stages(previous, model):
+    """Stages of model whose inputs differ from those of previous (every stage when previous is None).
+
+    E and I are no stage's input: an edit of either only rescales the cached deflection.
+    """
+    before = stage_inputs(previous) if previous is not None else {}
+    return [stage for stage, inputs in stage_inputs(model).items() if before.get(stage) != inputs]
+
+
+def analyse(model, cache=None):
+    """Run the full analysis of a BeamModel."""
+    try:
+        reactions = compute_reactions(model, cache)
+    except UnsolvableBeamError as error:
+        return AnalysisResult(model=model, error=str(error))
+
+    x_coords, shear, moment = compute_diagrams(model, reactions, cache)
+    deflection = compute_deflection(model, reactions, x_coords, moment, cache)
+    return AnalysisResult(
+        model=model,
+        reactions=reactions,
+        x_coords=x_coords,
+        shear=shear,
+        moment=moment,
+        deflection=deflection,
+        polynomials=compute_polynomials(model, reactions, cache),
+    )
@@ -0,0 +1,124 @@
+"""Parallel batch analysis over a process pool.
+
+Cases are sent to the workers in chunks, with only a bounded number of chunks in
+flight, so arbitrarily long inputs are streamed with constant memory. Every case
+produces a result dict; failures (unsolvable supports, invalid definitions,
+unexpected exceptions, even a crashed worker) become error results instead of
+aborting the batch.
+"""
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+from beamcalc.analysis import analyse
+from beamcalc.model import BeamModel
+
+# Chunks queued per worker; enough to keep workers busy without buffering the input
+PENDING_CHUNKS_PER_WORKER = 4
+
+# Each worker is single threaded; nested BLAS threads only oversubscribe the cores
+THREAD_LIMIT_VARIABLES = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMBA_NUM_THREADS")
+
+
+def analyse_record(index, record, full=False):
+    """Analyse one parsed record and return its output dict; never raises for bad input."""
+    name = record.get("name", "") if isinstance(record, dict) else ""
+    try:
+        if isinstance(record, Exception):
+            raise record
+        model = BeamModel.from_dict(record)
+        result = analyse(model).to_dict(full=full)
+    except (TypeError, ValueError, KeyError) as error:
+        result = {"name": name, "error": f"Invalid beam definition: {error}"}
+    return {"index": index, **result}
+
+
+def _analyse_chunk(items, full):
+    results = []
+    for index, record in items:
+        try:
+            results.append(analyse_record(index, record, full))
+        except Exception as error:
+            results.append({"index": index, "error": f"Analysis failed: {error!r}"})
+    return results
+
+
+def _chunks(records, chunk_size):
+    numbered = enumerate(records)
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _failed_chunk(chunk, error):
+    return [{"index": index, "error": f"Worker failed: {error!r}"} for index, _ in chunk]
+
+
+def _make_executor(workers):
+    for variable in THREAD_LIMIT_VARIABLES:
+        os.environ.setdefault(variable, "1")
+    # spawn gives workers a fresh interpreter that honours the thread limits above
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def run_batch(records, workers=None, chunk_size=8, ordered=True, full=False):
+    """Analyse records (dicts, or parse errors) and yield one result dict per case.
+
+    workers defaults to the CPU count; workers=1 runs in this process. With ordered
+    results come back in input order, otherwise as soon as each chunk completes
+    (every result carries its input "index").
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(records, max(1, chunk_size))
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _analyse_chunk(chunk, full)
+        return
+
+    max_pending = workers * PENDING_CHUNKS_PER_WORKER
+    executor = _make_executor(workers)
+    pending = deque()
+    try:
+        while True:
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append((executor.submit(_analyse_chunk, chunk, full), chunk))
+            if not pending:
+                return
+
+            if ordered:
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait([future for future, _ in pending], return_when=FIRST_COMPLETED)
+                done = [item for item in pending if item[0] in finished]
+                for item in done:
+                    pending.remove(item)
+
+            rebuilt = False
+            for future, chunk in done:
+                try:
+                    yield from future.result()
+                except BrokenProcessPool as error:
+                    # A worker died (e.g. killed for memory): fail its chunk and rerun the rest on a fresh pool
+                    yield from _failed_chunk(chunk, error)
+                    if rebuilt:
+                        continue
+                    rebuilt = True
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = _make_executor(workers)
+                    resubmitted = deque()
+                    for _, waiting_chunk in pending:
+                        resubmitted.append((executor.submit(_analyse_chunk, waiting_chunk, full), waiting_chunk))
+                    pending = resubmitted
+                except Exception as error:
+                    yield from _failed_chunk(chunk, error)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
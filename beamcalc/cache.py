@@ -0,0 +1,159 @@
+"""Memoized analysis stages keyed on a canonical hash of their inputs.
+
+Streamlit reruns the whole script on every widget change, but imported modules
+stay loaded, so a module-level cache survives reruns and is shared by sessions.
+Each stage (reactions, diagrams, influence data, deflection) is stored under a
+hash of exactly the inputs it depends on, and the least recently used entries are
+evicted once the entry count, the total array size or the total size of the
+temporary files behind disk-backed (np.memmap) results exceeds its limits.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_DISK_BYTES = 4 * 1024 ** 3
+
+
+def _canonical(value):
+    """Convert tuples, lists, NumPy scalars and floats into a stable JSON-friendly form."""
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in sorted(value.items())}
+    if isinstance(value, np.ndarray):
+        return hashlib.sha1(np.ascontiguousarray(value).tobytes()).hexdigest()
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        # repr round-trips floats exactly; 1 and 1.0 (and -0.0 and 0.0) hash the same
+        return repr(float(value) + 0.0)
+    return value
+
+
+def canonical_key(*parts):
+    """Hash of the given inputs that ignores container and numeric type differences."""
+    text = json.dumps(_canonical(parts), separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def load_key(point_loads, distributed_loads, moments):
+    """Order-independent description of a load set."""
+    return (
+        sorted(tuple(load) for load in point_loads),
+        sorted(tuple(load) for load in distributed_loads),
+        sorted(tuple(moment) for moment in moments),
+    )
+
+
+def result_nbytes(value):
+    """Approximate memory held by a stage result (arrays dominate)."""
+    if isinstance(value, np.memmap):
+        # Disk-backed pages are the operating system's to evict
+        return 64
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(result_nbytes(item) for item in value) + 8 * len(value)
+    return 64
+
+
+def freeze(value):
+    """Make the arrays of a stage result (arrays, or lists and tuples of them) read-only; returns value."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            freeze(item)
+    return value
+
+
+def result_disk_bytes(value):
+    """Size of the temporary files behind the np.memmap arrays of a stage result."""
+    if isinstance(value, np.memmap):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(result_disk_bytes(item) for item in value)
+    return 0
+
+
+class AnalysisCache:
+    """Size-bounded LRU store for analysis stage results.
+
+    Cached arrays are shared between callers, so they are made read-only.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, max_disk_bytes=DEFAULT_MAX_DISK_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    @property
+    def disk_bytes(self):
+        return self._disk_bytes
+
+    def get_or_compute(self, stage, inputs, compute):
+        """Return the cached result of a stage for these inputs, computing it on a miss."""
+        key = (stage, canonical_key(inputs))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value = freeze(compute())
+        self._store(key, value)
+        return value
+
+    def _store(self, key, value):
+        size, disk = result_nbytes(value), result_disk_bytes(value)
+        # Results larger than the whole budget are returned but never kept
+        if size > self.max_bytes or disk > self.max_disk_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, size, disk)
+            self._nbytes += size
+            self._disk_bytes += disk
+            while (len(self._entries) > self.max_entries or self._nbytes > self.max_bytes
+                   or self._disk_bytes > self.max_disk_bytes):
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        # A memmap's temporary file is deleted once the last caller releases it
+        _, size, disk = self._entries.pop(key)
+        self._nbytes -= size
+        self._disk_bytes -= disk
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+            self._disk_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Process-wide cache used by the Streamlit app
+ANALYSIS_CACHE = AnalysisCache()
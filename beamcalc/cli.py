@@ -0,0 +1,131 @@
+"""Command line batch analysis of beam definitions.
+
+Reads one beam per JSON Lines record or CSV row, analyses it and writes one
+result per line as soon as it is available, so memory stays constant per case:
+
+    python -m beamcalc cases.jsonl -o results.jsonl
+    python -m beamcalc cases.csv --output-format csv -o results.csv
+    python -m beamcalc cases.jsonl -j 0 --unordered -o results.jsonl
+
+A JSON Lines record holds the BeamModel fields, e.g.
+{"name": "B1", "beam_length": 10, "supports": [["Hinge", 0], ["Roller", 10]],
+ "distributed_loads": [[0, 10, -5, -5]], "resolution": 100}.
+CSV files use the same column names with the list fields JSON encoded.
+"""
+import argparse
+import csv
+import json
+import sys
+
+from beamcalc.batch import run_batch
+
+LIST_FIELDS = ("supports", "point_loads", "distributed_loads", "moments")
+TEXT_FIELDS = ("name", "deflection_method", "mesh", "matrix_storage")
+CSV_COLUMNS = (
+    "index", "name", "error", "reactions",
+    "max_shear_x", "max_shear", "max_moment_x", "max_moment", "max_deflection_x", "max_deflection_mm",
+)
+
+
+def _parse_csv_row(row):
+    """Beam record of one CSV row: list fields JSON decoded, text fields as they are, the rest floats.
+
+    >>> _parse_csv_row({"name": "B1", "beam_length": "10", "supports": '[["Fixed", 0]]', "matrix_storage": "disk"})
+    {'name': 'B1', 'beam_length': 10.0, 'supports': [['Fixed', 0]], 'matrix_storage': 'disk'}
+    """
+    record = {}
+    for key, value in row.items():
+        if value is None or value == "":
+            continue
+        if key in LIST_FIELDS:
+            record[key] = json.loads(value)
+        elif key in TEXT_FIELDS:
+            record[key] = value
+        else:
+            record[key] = float(value)
+    return record
+
+
+def read_records(stream, input_format):
+    """Yield beam records (dicts) or the exception raised while parsing a line."""
+    if input_format == "csv":
+        for row in csv.DictReader(stream):
+            try:
+                yield _parse_csv_row(row)
+            except ValueError as error:
+                yield error
+    else:
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as error:
+                yield error
+
+
+def _csv_row(result):
+    row = {"index": result["index"], "name": result.get("name", ""), "error": result.get("error") or ""}
+    if not result.get("error"):
+        row["reactions"] = json.dumps(result["reactions"])
+        for key in ("max_shear", "max_moment"):
+            row[f"{key}_x"] = result[key]["x"]
+            row[key] = result[key]["value"]
+        row["max_deflection_x"] = result["max_deflection_mm"]["x"]
+        row["max_deflection_mm"] = result["max_deflection_mm"]["value"]
+    return row
+
+
+def write_results(results, stream, output_format):
+    """Write results as they arrive; returns (count, failures)."""
+    writer = None
+    if output_format == "csv":
+        writer = csv.DictWriter(stream, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+
+    count = failures = 0
+    for result in results:
+        count += 1
+        failures += bool(result.get("error"))
+        if writer:
+            writer.writerow(_csv_row(result))
+        else:
+            stream.write(json.dumps(result) + "\n")
+        stream.flush()
+    return count, failures
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m beamcalc", description="Analyse beam definitions in batch.")
+    parser.add_argument("input", help="JSON Lines or CSV file of beam definitions ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout, the default)")
+    parser.add_argument("--input-format", choices=("jsonl", "csv"), help="defaults to the input file extension")
+    parser.add_argument("--output-format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--full", action="store_true", help="include the sampled diagrams in JSON Lines output")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="worker processes (0 = one per CPU, default 1)")
+    parser.add_argument("--chunk-size", type=int, default=8, help="beams sent to a worker at a time")
+    parser.add_argument("--unordered", action="store_true", help="write results as they complete instead of in input order")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    input_format = args.input_format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    if args.full and args.output_format == "csv":
+        build_parser().error("--full is only available with JSON Lines output")
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        records = read_records(source, input_format)
+        results = run_batch(records, workers=args.workers or None, chunk_size=args.chunk_size,
+                            ordered=not args.unordered, full=args.full)
+        count, failures = write_results(results, target, args.output_format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    print(f"Analysed {count} beams, {failures} failed", file=sys.stderr)
+    return 0
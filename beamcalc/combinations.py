@@ -0,0 +1,201 @@
+"""Basic load cases, factored combinations and their envelopes.
+
+The beam is linear, so a factored combination of load cases has the same
+combination of their reactions, shear, moment and deflection. solve_load_cases
+analyses every basic case once on the model's grid: the reactions of an
+indeterminate beam come from one factorization of its stiffness matrix, and the
+virtual work unit-load matrix is built once and shared. combine then forms any
+number of combinations as a (combinations x cases) matrix product with the
+stacked diagrams, a block of combinations at a time, keeping only the running
+max/min envelopes.
+"""
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+
+from beamcalc.analysis import compute_deflection, compute_diagrams
+from beamcalc.cache import AnalysisCache
+from beamcalc.model import AnalysisResult
+from beamcalc.multi import BLOCK_ELEMENTS
+from beamcalc.reactions import solve_case_reactions
+
+DIAGRAM_NAMES = ("shear", "moment", "deflection")
+
+
+@dataclass
+class LoadCase:
+    """One basic load case, with the load tuples of BeamModel."""
+
+    name: str
+    point_loads: list = field(default_factory=list)
+    distributed_loads: list = field(default_factory=list)
+    moments: list = field(default_factory=list)
+
+
+@dataclass
+class Combination:
+    """A factored combination: {load case name: factor}."""
+
+    name: str
+    factors: dict
+
+
+@dataclass
+class Envelope:
+    """Max/min envelopes over a set of combinations.
+
+    upper and lower map each of DIAGRAM_NAMES to the envelope along x_coords, and
+    upper_index and lower_index to the index of the combination governing each
+    point. reactions holds the combined reaction values, one row per combination,
+    at reaction_positions.
+    """
+
+    combinations: list
+    x_coords: np.ndarray
+    reaction_positions: list
+    reactions: np.ndarray
+    upper: dict
+    lower: dict
+    upper_index: dict
+    lower_index: dict
+
+    def governing(self, diagram):
+        """(x, value, combination name) of the largest absolute value of a diagram."""
+        upper, lower = self.upper[diagram], self.lower[diagram]
+        idx_upper, idx_lower = int(np.argmax(upper)), int(np.argmin(lower))
+        if abs(upper[idx_upper]) >= abs(lower[idx_lower]):
+            idx, value, index = idx_upper, upper[idx_upper], self.upper_index[diagram][idx_upper]
+        else:
+            idx, value, index = idx_lower, lower[idx_lower], self.lower_index[diagram][idx_lower]
+        return float(self.x_coords[idx]), float(value), self.combinations[index].name
+
+    def summary(self):
+        """Governing values and reaction extremes as plain Python types."""
+        data = {}
+        for diagram in DIAGRAM_NAMES:
+            x, value, name = self.governing(diagram)
+            data[f"max_{diagram}"] = {"x": x, "value": value, "combination": name}
+        data["reactions"] = [
+            {"x": float(position), "max": float(high), "min": float(low)}
+            for position, high, low in zip(self.reaction_positions, self.reactions.max(axis=0), self.reactions.min(axis=0))
+        ]
+        return data
+
+
+@dataclass
+class LoadCaseResults:
+    """Results of every basic load case, stacked one row per case."""
+
+    model: object
+    cases: list
+    x_coords: np.ndarray
+    reaction_positions: list
+    reactions: np.ndarray
+    shear: np.ndarray
+    moment: np.ndarray
+    deflection: np.ndarray
+
+    def factor_matrix(self, combinations):
+        """(combinations, cases) array of load factors; unknown case names raise ValueError."""
+        index = {case.name: k for k, case in enumerate(self.cases)}
+        factors = np.zeros((len(combinations), len(self.cases)))
+        for row, combination in enumerate(combinations):
+            for name, factor in combination.factors.items():
+                if name not in index:
+                    raise ValueError(f"Combination {combination.name} uses unknown load case {name}")
+                factors[row, index[name]] = factor
+        return factors
+
+    def result(self, combination):
+        """Full AnalysisResult of one combination."""
+        factors = self.factor_matrix([combination])[0]
+        values = factors @ self.reactions
+        return AnalysisResult(
+            model=self.model,
+            reactions=list(zip(self.reaction_positions, values.tolist())),
+            x_coords=self.x_coords,
+            shear=factors @ self.shear,
+            moment=factors @ self.moment,
+            deflection=factors @ self.deflection,
+        )
+
+    def combine(self, combinations, block_elements=BLOCK_ELEMENTS):
+        """Envelope of the given combinations.
+
+        Combinations are formed block by block with about block_elements grid values
+        per diagram, so memory stays bounded however many there are.
+        """
+        if not combinations:
+            raise ValueError("No combinations to envelope")
+        factors = self.factor_matrix(combinations)
+        num_points = len(self.x_coords)
+        upper = {diagram: np.full(num_points, -np.inf) for diagram in DIAGRAM_NAMES}
+        lower = {diagram: np.full(num_points, np.inf) for diagram in DIAGRAM_NAMES}
+        upper_index = {diagram: np.zeros(num_points, dtype=int) for diagram in DIAGRAM_NAMES}
+        lower_index = {diagram: np.zeros(num_points, dtype=int) for diagram in DIAGRAM_NAMES}
+
+        block = max(1, block_elements // num_points)
+        for first in range(0, len(combinations), block):
+            rows = factors[first:first + block]
+            for diagram in DIAGRAM_NAMES:
+                combined = rows @ getattr(self, diagram)
+                high, low = combined.argmax(axis=0), combined.argmin(axis=0)
+                columns = np.arange(num_points)
+                better = combined[high, columns] > upper[diagram]
+                upper[diagram][better] = combined[high, columns][better]
+                upper_index[diagram][better] = first + high[better]
+                better = combined[low, columns] < lower[diagram]
+                lower[diagram][better] = combined[low, columns][better]
+                lower_index[diagram][better] = first + low[better]
+
+        return Envelope(
+            combinations=list(combinations),
+            x_coords=self.x_coords,
+            reaction_positions=self.reaction_positions,
+            reactions=factors @ self.reactions,
+            upper=upper,
+            lower=lower,
+            upper_index=upper_index,
+            lower_index=lower_index,
+        )
+
+
+def solve_load_cases(model, cases, cache=None):
+    """Analyse each basic LoadCase once on the supports, grid and section of model.
+
+    The loads of model itself are ignored. Raises UnsolvableBeamError when the
+    supports cannot hold the beam, and ValueError for duplicate case names or a
+    non-uniform mesh, since the adaptive mesh differs from case to case.
+    """
+    if not cases:
+        raise ValueError("No load cases to analyse")
+    if len({case.name for case in cases}) != len(cases):
+        raise ValueError("Load case names must be unique")
+    if model.mesh != "uniform":
+        raise ValueError("Load combinations need the uniform mesh")
+    if cache is None:
+        # Shares the unit-load matrix between cases when deflection uses virtual work
+        cache = AnalysisCache()
+
+    models = [replace(model, name=case.name, point_loads=case.point_loads,
+                      distributed_loads=case.distributed_loads, moments=case.moments) for case in cases]
+    all_reactions = solve_case_reactions(
+        model.supports, [(m.point_loads, m.distributed_loads, m.moments) for m in models], model.beam_length)
+
+    shear, moment, deflection = [], [], []
+    for case_model, reactions in zip(models, all_reactions):
+        x_coords, case_shear, case_moment = compute_diagrams(case_model, reactions, cache)
+        shear.append(case_shear)
+        moment.append(case_moment)
+        deflection.append(compute_deflection(case_model, reactions, x_coords, case_moment, cache))
+
+    return LoadCaseResults(
+        model=model,
+        cases=list(cases),
+        x_coords=x_coords,
+        reaction_positions=[position for position, _ in all_reactions[0]],
+        reactions=np.array([[value for _, value in reactions] for reactions in all_reactions]),
+        shear=np.array(shear),
+        moment=np.array(moment),
+        deflection=np.array(deflection),
+    )
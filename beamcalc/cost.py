@@ -0,0 +1,89 @@
+"""Up-front cost estimates, so oversized inputs can be caught before computing.
+
+The estimates come from the complexity of each stage: O(N) grid work for the
+diagrams and double-integration deflection, O(number of loads) for reactions
+and polynomials, and O(N^2) time and memory for the virtual work unit-load
+matrix and the moving-load influence lines. The per-unit constants were measured on a typical laptop and only need
+to be right to within a small factor.
+"""
+from dataclasses import dataclass
+
+from beamcalc.mesh import STATION_SPACING
+from beamcalc.reactions import is_statically_determinate
+from beamcalc.virtual_work import DISK_BLOCK_VALUES
+
+# Seconds per grid point of all O(N) stages together, and per load of the O(loads) ones
+SECONDS_PER_POINT = 1e-6
+SECONDS_PER_LOAD = 5e-5
+# Seconds per entry of the virtual work unit-load matrix (build plus product)
+SECONDS_PER_MATRIX_ENTRY = 2e-8
+# Arrays of N floats held by one analysis (grid, diagrams, temporaries)
+ARRAYS_PER_POINT = 16
+# Seconds per load position and response point of the influence lines, from closed-form or stiffness reactions
+SECONDS_PER_INFLUENCE_ENTRY = 6e-8
+SECONDS_PER_INDETERMINATE_INFLUENCE_ENTRY = 5e-7
+# N x N arrays held at the peak of building the influence lines (three lines, slope, temporaries)
+INFLUENCE_ARRAYS = 6
+
+DEFAULT_MAX_SECONDS = 2.0
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class CostEstimate:
+    """Estimated grid size, peak memory and run time of one analysis.
+
+    matrix_entries counts the entries of the O(N^2) matrix named by matrix (grid
+    points squared), 0 without one.
+    """
+
+    num_points: int
+    num_loads: int
+    nbytes: int
+    seconds: float
+    matrix_entries: int = 0
+    matrix: str = "unit-load matrix"
+
+    def over_budget(self, max_seconds=DEFAULT_MAX_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        """Reasons the estimate exceeds the budget; empty when it fits."""
+        reasons = []
+        if self.seconds > max_seconds:
+            matrix = f" for a {self.matrix_entries:,}-entry {self.matrix}" if self.matrix_entries else ""
+            reasons.append(f"about {self.seconds:.1f} s of computation{matrix} (budget {max_seconds:.1f} s)")
+        if self.nbytes > max_bytes:
+            reasons.append(f"about {self.nbytes / 2 ** 20:.0f} MB of memory (budget {max_bytes / 2 ** 20:.0f} MB)")
+        return reasons
+
+
+def estimate_points(model):
+    """Grid points the model's mesh will have, exactly for the uniform grid."""
+    if model.mesh == "uniform":
+        return model.num_points
+    # Two nodes per load end and support, the stations, and about 1.2 * resolution refinement nodes
+    ends = len(model.supports) + 2 * len(model.point_loads) + 4 * len(model.distributed_loads) + 2 * len(model.moments)
+    return int(2 * ends + model.beam_length / STATION_SPACING + 1.2 * model.resolution) + 1
+
+
+def estimate_cost(model):
+    """CostEstimate of analysing a BeamModel."""
+    num_points = estimate_points(model)
+    num_loads = len(model.point_loads) + len(model.distributed_loads) + len(model.moments)
+    nbytes = ARRAYS_PER_POINT * 8 * num_points
+    seconds = SECONDS_PER_POINT * num_points + SECONDS_PER_LOAD * (num_loads + len(model.supports))
+    matrix_entries = 0
+    if model.deflection_method == "virtual_work":
+        matrix_entries = num_points ** 2
+        # A disk-backed matrix only holds one block of rows in RAM at a time
+        nbytes += 8 * (min(matrix_entries, DISK_BLOCK_VALUES) if model.matrix_storage == "disk" else matrix_entries)
+        seconds += SECONDS_PER_MATRIX_ENTRY * matrix_entries
+    return CostEstimate(num_points, num_loads, nbytes, seconds, matrix_entries)
+
+
+def estimate_influence_lines(model):
+    """CostEstimate of the moving-load influence lines of a model's beam, on the uniform grid."""
+    num_points = model.num_points
+    matrix_entries = num_points ** 2
+    per_entry = (SECONDS_PER_INFLUENCE_ENTRY if is_statically_determinate(model.supports, model.beam_length)
+                 else SECONDS_PER_INDETERMINATE_INFLUENCE_ENTRY)
+    return CostEstimate(num_points, 0, INFLUENCE_ARRAYS * 8 * matrix_entries, per_entry * matrix_entries,
+                        matrix_entries, "influence line matrix")
@@ -0,0 +1,102 @@
+"""Deflection by direct double integration of M/EI.
+
+EI v'' = M is integrated twice with cumulative sums and the two constants of
+integration are fixed by the support conditions, which costs O(N) time and
+memory instead of the O(N^2) unit-load matrix of the virtual work method.
+"""
+import numpy as np
+
+from beamcalc.influence import primary_supports
+
+INTEGRATION_METHODS = ("trapezoid", "simpson")
+
+
+def cumulative_integral(values, x_coords, method="trapezoid"):
+    """Running integral of sampled values from x_coords[0] along the last axis, same shape as the input."""
+    values = np.asarray(values, dtype=float)
+    x_coords = np.asarray(x_coords, dtype=float)
+    result = np.zeros(values.shape)
+    n = values.shape[-1]
+    if n < 2:
+        return result
+
+    h = np.diff(x_coords)
+    if method == "simpson" and n >= 3:
+        # Each interval is integrated with the parabola through three neighbouring samples
+        pieces = np.empty(values.shape[:-1] + (n - 1,))
+        pieces[..., :-1] = h[:-1] / 12 * (5 * values[..., :-2] + 8 * values[..., 1:-1] - values[..., 2:])
+        pieces[..., -1] = h[-1] / 12 * (-values[..., -3] + 8 * values[..., -2] + 5 * values[..., -1])
+    elif method in INTEGRATION_METHODS:
+        pieces = 0.5 * h * (values[..., :-1] + values[..., 1:])
+    else:
+        raise ValueError(f"Unknown integration method: {method}")
+
+    np.cumsum(pieces, axis=-1, out=result[..., 1:])
+    return result
+
+
+def cumulative_integral_hermite(values, derivatives, x_coords):
+    """Running integral using the end-corrected trapezoid rule h (f0 + f1) / 2 + h² (f0' - f1') / 12.
+
+    Exact for a cubic between nodes, so on a mesh whose nodes sit at every load
+    discontinuity (with doubled nodes at jumps) it integrates the moment exactly.
+    """
+    values = np.asarray(values, dtype=float)
+    derivatives = np.asarray(derivatives, dtype=float)
+    h = np.diff(np.asarray(x_coords, dtype=float))
+    result = np.zeros(values.shape)
+    pieces = 0.5 * h * (values[..., :-1] + values[..., 1:]) + h ** 2 / 12 * (derivatives[..., :-1] - derivatives[..., 1:])
+    np.cumsum(pieces, axis=-1, out=result[..., 1:])
+    return result
+
+
+def value_at(x_coords, values, position):
+    """Linear interpolation of values at one position along their last axis, like np.interp for stacked rows."""
+    x_coords = np.asarray(x_coords, dtype=float)
+    idx = int(np.clip(np.searchsorted(x_coords, position, side="right") - 1, 0, len(x_coords) - 2))
+    span = x_coords[idx + 1] - x_coords[idx]
+    weight = np.clip((position - x_coords[idx]) / span, 0.0, 1.0) if span > 0 else 1.0
+    return values[..., idx] * (1 - weight) + values[..., idx + 1] * weight
+
+
+def apply_boundary_conditions(x_coords, slope, deflection, supports):
+    """Add the C1 * x + C0 term that makes the deflection satisfy the support conditions.
+
+    The primary_supports fix the two constants: a cantilever clamps deflection and
+    slope, otherwise the outermost supports pin the deflection. The moments of an
+    indeterminate beam come from compatible reactions, so its other supports then
+    hold as well. Beams that cannot carry load return a zero curve, as there is no
+    consistent bending moment to integrate. slope and deflection may hold one
+    curve per row.
+    """
+    primary = primary_supports(supports)
+    positions = [supports[k][1] for k in primary]
+    if len(primary) == 1:
+        fixed_pos = positions[0]
+        c1 = -value_at(x_coords, slope, fixed_pos)
+        c0 = -value_at(x_coords, deflection, fixed_pos) - c1 * fixed_pos
+    elif len(primary) == 2:
+        a, b = positions
+        v_a = value_at(x_coords, deflection, a)
+        v_b = value_at(x_coords, deflection, b)
+        c1 = -(v_b - v_a) / (b - a)
+        c0 = -v_a - c1 * a
+    else:
+        return np.zeros(np.shape(deflection))
+    return deflection + np.multiply.outer(c1, x_coords) + np.expand_dims(c0, -1)
+
+
+def integrate_deflection(x_coords, bending_moment, supports, EI, method="trapezoid", shear=None):
+    """Calculate the deflection along the beam by integrating M/EI twice.
+
+    With the shear (dM/dx) given, both integrals use the end-corrected trapezoid
+    rule instead of method; this is how deflection is integrated on the adaptive mesh.
+    """
+    curvature = np.asarray(bending_moment, dtype=float) / EI
+    if shear is not None:
+        slope = cumulative_integral_hermite(curvature, np.asarray(shear, dtype=float) / EI, x_coords)
+        deflection = cumulative_integral_hermite(slope, curvature, x_coords)
+    else:
+        slope = cumulative_integral(curvature, x_coords, method)
+        deflection = cumulative_integral(slope, x_coords, method)
+    return x_coords, apply_boundary_conditions(x_coords, slope, deflection, supports)
@@ -0,0 +1,111 @@
+"""Opt-in per-stage timing and memory instrumentation.
+
+A StageTimer wraps each stage of one run in a context manager that records the
+wall time (perf_counter), the peak memory allocated while it ran (tracemalloc,
+which also sees NumPy arrays) and, when the caller reports them, the size of the
+arrays it produced. Every finished stage is also logged as one structured line
+of key=value pairs on the beamcalc.diagnostics logger. A disabled timer only
+hands out records, so instrumented code costs nothing when diagnostics are off.
+
+tracemalloc is process-wide, and Streamlit sessions are threads of one process.
+Stages therefore share it: tracing starts with the first active stage and stops
+with the last, and the peak is only reset when no other stage is running. A
+stage that overlaps another session's stage reports the peak of both.
+"""
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+
+from beamcalc.cache import result_nbytes
+
+logger = logging.getLogger(__name__)
+
+_TRACE_LOCK = threading.Lock()
+# Stages being traced, and whether the first of them started tracemalloc
+_trace_users = 0
+_trace_started = False
+
+
+def _begin_trace():
+    """Start or join tracing for one stage; returns the traced size at its start."""
+    global _trace_users, _trace_started
+    with _TRACE_LOCK:
+        if not _trace_users:
+            _trace_started = not tracemalloc.is_tracing()
+            if _trace_started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        _trace_users += 1
+        return tracemalloc.get_traced_memory()[0]
+
+
+def _end_trace():
+    """Leave tracing for one stage; returns the peak traced size since the last reset."""
+    global _trace_users
+    with _TRACE_LOCK:
+        peak = tracemalloc.get_traced_memory()[1]
+        _trace_users -= 1
+        if not _trace_users and _trace_started:
+            tracemalloc.stop()
+        return peak
+
+
+@dataclass
+class StageRecord:
+    """Wall time, traced peak memory and output array size of one stage."""
+
+    name: str
+    seconds: float = 0.0
+    peak_bytes: int = 0
+    nbytes: int = 0
+
+    def arrays(self, *values):
+        """Report the stage's output (arrays, or lists and tuples of them) for its size."""
+        self.nbytes = result_nbytes(values)
+
+
+class StageTimer:
+    """Records StageRecords for the stages of one run when enabled."""
+
+    def __init__(self, enabled=False, run=""):
+        self.enabled = enabled
+        self.run = run
+        self.records = []
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage name; yields its StageRecord."""
+        record = StageRecord(name)
+        if not self.enabled:
+            yield record
+            return
+        # Trace only inside the stage, so an aborted run never leaves tracing on
+        base = _begin_trace()
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            record.peak_bytes = max(0, _end_trace() - base)
+            self.records.append(record)
+            logger.info("stage=%s run=%s seconds=%.6f peak_bytes=%d nbytes=%d", record.name, self.run,
+                        record.seconds, record.peak_bytes, record.nbytes, extra={"stage": asdict(record)})
+
+    @property
+    def total_seconds(self):
+        return sum(record.seconds for record in self.records)
+
+    def rows(self):
+        """One dict per stage, in run order, for a table."""
+        return [
+            {
+                "Stage": record.name,
+                "Time (ms)": round(record.seconds * 1e3, 2),
+                "Peak memory (MB)": round(record.peak_bytes / 2 ** 20, 2),
+                "Arrays (MB)": round(record.nbytes / 2 ** 20, 2),
+            }
+            for record in self.records
+        ]
@@ -0,0 +1,144 @@
+"""Chunked export of full-resolution results to CSV, Parquet or NPZ.
+
+Diagrams are written as the columns x, shear (kN), moment (kNm) and deflection
+(m); the unit-load moment matrix as one row per unit load position. Rows are
+converted, formatted and written a chunk at a time, so at most one chunk of
+text or converted values is held in memory on top of the source arrays, and a
+matrix given as row blocks (iter_row_blocks or iter_unit_load_moment_blocks) never has to
+exist in full. float32 halves the file size at about 7 significant digits.
+Parquet needs pyarrow.
+"""
+import zipfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from beamcalc.lazy import has_module, optional_module
+
+EXPORT_FORMATS = ("csv", "parquet", "npz")
+DIAGRAM_COLUMNS = ("x", "shear", "moment", "deflection")
+# Values per chunk of converted rows
+CHUNK_VALUES = 1 << 18
+# Shortest formats that round-trip each precision
+FLOAT_FORMATS = {np.dtype(np.float32): "%.9g", np.dtype(np.float64): "%.17g"}
+# Longest text of one value in those formats, with its separator (e.g. "-1.2345678901234567e-05,")
+CSV_VALUE_BYTES = {np.dtype(np.float32): 17, np.dtype(np.float64): 25}
+
+
+@contextmanager
+def _binary(target):
+    """A binary stream for a path or an already open file object."""
+    if hasattr(target, "write"):
+        yield target
+    else:
+        with open(target, "wb") as stream:
+            yield stream
+
+
+def _check(fmt, dtype):
+    dtype = np.dtype(dtype)
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if dtype not in FLOAT_FORMATS:
+        raise ValueError(f"Export precision must be float32 or float64, got {dtype}")
+    if fmt == "parquet" and not has_module("pyarrow"):
+        raise ValueError("Parquet export needs pyarrow")
+    return dtype
+
+
+def estimate_export_bytes(num_rows, num_columns, fmt="csv", dtype=np.float64):
+    """Upper bound of the size of an export of num_rows x num_columns values.
+
+    CSV is sized at the longest text per value, Parquet and NPZ before compression.
+    """
+    dtype = _check(fmt, dtype)
+    per_value = CSV_VALUE_BYTES[dtype] if fmt == "csv" else dtype.itemsize
+    return num_rows * num_columns * per_value
+
+
+def _column_blocks(columns, chunk_rows):
+    """(start_row, rows) blocks of equal-length columns stacked side by side."""
+    for start in range(0, len(columns[0]), chunk_rows):
+        yield start, np.column_stack([column[start:start + chunk_rows] for column in columns])
+
+
+def _rechunk(row_blocks, chunk_rows):
+    """Split (start_row, rows) blocks into blocks of at most chunk_rows rows."""
+    for start, rows in row_blocks:
+        for offset in range(0, len(rows), chunk_rows):
+            yield start + offset, rows[offset:offset + chunk_rows]
+
+
+def write_csv(stream, names, row_blocks, dtype):
+    """Header line, then each block of rows formatted and written on its own."""
+    stream.write((",".join(names) + "\n").encode("utf-8"))
+    for _, rows in row_blocks:
+        rows = np.asarray(rows).astype(dtype, copy=False)
+        lines = "\n".join(",".join([FLOAT_FORMATS[dtype]] * rows.shape[1]) % tuple(row) for row in rows.tolist())
+        stream.write((lines + "\n").encode("utf-8"))
+
+
+def write_parquet(stream, names, row_blocks, dtype):
+    """One Parquet row group per block of rows."""
+    pa, pq = optional_module("pyarrow"), optional_module("pyarrow.parquet")
+    schema = pa.schema([(name, pa.from_numpy_dtype(dtype)) for name in names])
+    with pq.ParquetWriter(stream, schema) as writer:
+        for _, rows in row_blocks:
+            rows = np.asarray(rows).astype(dtype, copy=False)
+            writer.write_table(pa.Table.from_arrays([pa.array(rows[:, k]) for k in range(len(names))], schema=schema))
+
+
+def write_npy_member(archive, name, shape, row_blocks, dtype):
+    """Stream row blocks into a compressed .npy member of an open ZipFile, as np.savez_compressed would store it."""
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as member:
+        header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": tuple(shape)}
+        np.lib.format.write_array_header_2_0(member, header)
+        for _, rows in row_blocks:
+            member.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+
+
+def export_diagrams(result, target, fmt="csv", dtype=np.float64, chunk_rows=None):
+    """Write the sampled diagrams of an AnalysisResult to a path or binary file object."""
+    dtype = _check(fmt, dtype)
+    columns = [np.asarray(getattr(result, "x_coords" if name == "x" else name)) for name in DIAGRAM_COLUMNS]
+    chunk_rows = chunk_rows or CHUNK_VALUES // len(columns)
+    with _binary(target) as stream:
+        if fmt == "npz":
+            with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                for name, column in zip(DIAGRAM_COLUMNS, columns):
+                    blocks = ((start, column[start:start + chunk_rows]) for start in range(0, len(column), chunk_rows))
+                    write_npy_member(archive, name, column.shape, blocks, dtype)
+        elif fmt == "parquet":
+            write_parquet(stream, DIAGRAM_COLUMNS, _column_blocks(columns, chunk_rows), dtype)
+        else:
+            write_csv(stream, DIAGRAM_COLUMNS, _column_blocks(columns, chunk_rows), dtype)
+
+
+def export_matrix(x_coords, row_blocks, target, fmt="csv", dtype=np.float64, name="unit_load_moments", chunk_rows=None):
+    """Write a square matrix over x_coords, given as (start_row, rows) blocks, one row per load position.
+
+    CSV and Parquet rows start with the load position in a load_x column followed
+    by one column per grid position; NPZ stores x and the matrix as arrays. The
+    blocks are split to chunk_rows rows (about CHUNK_VALUES values) whatever size
+    they come in.
+    """
+    dtype = _check(fmt, dtype)
+    x_coords = np.asarray(x_coords, dtype=float)
+    num_points = len(x_coords)
+    names = ["load_x"] + [repr(float(x)) for x in x_coords]
+    row_blocks = _rechunk(row_blocks, chunk_rows or max(1, CHUNK_VALUES // (num_points + 1)))
+
+    def with_positions():
+        for start, rows in row_blocks:
+            yield start, np.column_stack([x_coords[start:start + len(rows)], rows])
+
+    with _binary(target) as stream:
+        if fmt == "npz":
+            with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+                write_npy_member(archive, "x", (num_points,), [(0, x_coords)], dtype)
+                write_npy_member(archive, name, (num_points, num_points), row_blocks, dtype)
+        elif fmt == "parquet":
+            write_parquet(stream, names, with_positions(), dtype)
+        else:
+            write_csv(stream, names, with_positions(), dtype)
+
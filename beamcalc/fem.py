@@ -0,0 +1,187 @@
+"""Direct stiffness solver for statically indeterminate and multi-span beams.
+
+The beam between its outermost supports is split into Euler-Bernoulli elements
+with one node per support. With cubic Hermite elements and work-equivalent nodal
+loads the nodal displacements, and so the reactions, are exact for the supported
+load types however long the elements, so no nodes are needed at the loads; the
+overhangs are statically determinate and handled by statics. Each node has a
+deflection and a rotation degree of freedom, so the stiffness matrix is banded
+with three off-diagonals; beamcalc.solvers solves it (banded Cholesky for large
+systems) in O(number of supports).
+
+Only the reactions are taken from the solve; the diagrams and deflection then
+follow from statics exactly as for determinate beams.
+"""
+import numpy as np
+
+from beamcalc.engine import active_distributed_loads, load_intensity
+from beamcalc.solvers import solve_spd_banded
+
+# Upper bandwidth of the stiffness matrix: an element couples four consecutive DOFs
+BANDWIDTH = 3
+
+
+def element_stiffness(lengths, EI=1.0):
+    """Element stiffness matrices for DOFs (v1, theta1, v2, theta2), shaped (n, 4, 4)."""
+    h = np.asarray(lengths, dtype=float)[:, None, None]
+    unit = np.array([
+        [12, 6, -12, 6],
+        [6, 4, -6, 2],
+        [-12, -6, 12, -6],
+        [6, 2, -6, 4],
+    ], dtype=float)
+    # Rotation rows and columns carry one power of the element length each
+    scale = np.ones((len(lengths), 4))
+    scale[:, 1::2] = h[:, :, 0]
+    return EI * unit * scale[:, :, None] * scale[:, None, :] / h ** 3
+
+
+def shape_functions(xi, lengths):
+    """Hermite shape functions (N, dN/dx) at local coordinates xi in [0, 1], each shaped (n, 4)."""
+    xi = np.asarray(xi, dtype=float)
+    h = np.asarray(lengths, dtype=float)
+    values = np.column_stack([
+        1 - 3 * xi ** 2 + 2 * xi ** 3,
+        h * (xi - 2 * xi ** 2 + xi ** 3),
+        3 * xi ** 2 - 2 * xi ** 3,
+        h * (xi ** 3 - xi ** 2),
+    ])
+    slopes = np.column_stack([
+        (6 * xi ** 2 - 6 * xi) / h,
+        1 - 4 * xi + 3 * xi ** 2,
+        (6 * xi - 6 * xi ** 2) / h,
+        3 * xi ** 2 - 2 * xi,
+    ])
+    return values, slopes
+
+
+# Three-point Gauss-Legendre rule on [0, 1]; exact for the degree 4 product of a linear load and a cubic shape function
+GAUSS_POINTS = 0.5 + 0.5 * np.sqrt(0.6) * np.array([-1.0, 0.0, 1.0])
+GAUSS_WEIGHTS = np.array([5.0, 8.0, 5.0]) / 18
+
+
+def _band_indices(num_elements):
+    """Global (row, column) pairs of the upper triangle of every element matrix."""
+    local_row, local_col = np.triu_indices(4)
+    first = 2 * np.arange(num_elements)[:, None]
+    return local_row, local_col, first + local_row, first + local_col
+
+
+def assemble_banded(stiffness, num_dofs):
+    """Assemble element matrices into LAPACK upper banded storage of shape (BANDWIDTH + 1, num_dofs)."""
+    local_row, local_col, rows, cols = _band_indices(len(stiffness))
+    banded = np.zeros((BANDWIDTH + 1, num_dofs))
+    np.add.at(banded, (BANDWIDTH + rows - cols, cols), stiffness[:, local_row, local_col])
+    return banded
+
+
+def beam_nodes(supports):
+    """Sorted node positions, one per distinct support position."""
+    return np.unique(np.array([position for _, position in supports], dtype=float))
+
+
+def nodal_loads(nodes, point_loads, distributed_loads, moments):
+    """Work-equivalent load vector over the (v, theta) DOFs of every node.
+
+    Loads inside an element are distributed to its end DOFs with the element's
+    shape functions, so no node is needed at a load. Loads on an overhang beyond
+    the outermost nodes are statically determinate and move to that node as a
+    force and a couple.
+    """
+    lengths = np.diff(nodes)
+    loads = np.zeros(2 * len(nodes))
+
+    def add(positions, forces, couples):
+        # forces upward, couples counterclockwise, both acting at positions
+        inside = (positions > nodes[0]) & (positions < nodes[-1])
+        if inside.any():
+            element = np.clip(np.searchsorted(nodes, positions[inside], side="right") - 1, 0, len(lengths) - 1)
+            xi = (positions[inside] - nodes[element]) / lengths[element]
+            values, slopes = shape_functions(xi, lengths[element])
+            vectors = forces[inside, None] * values + couples[inside, None] * slopes
+            np.add.at(loads, 2 * element[:, None] + np.arange(4), vectors)
+        outside = ~inside
+        node = np.where(positions[outside] <= nodes[0], 0, len(nodes) - 1)
+        np.add.at(loads, 2 * node, forces[outside])
+        np.add.at(loads, 2 * node + 1, couples[outside] + forces[outside] * (positions[outside] - nodes[node]))
+
+    if point_loads:
+        positions, magnitudes = np.array(point_loads, dtype=float).T
+        add(positions, magnitudes, np.zeros(len(positions)))
+    if moments:
+        # Clockwise couples act against the counterclockwise rotation DOF
+        positions, magnitudes = np.array(moments, dtype=float).T
+        add(positions, np.zeros(len(positions)), -magnitudes)
+
+    active = active_distributed_loads(distributed_loads)
+    if active:
+        # Split the loaded length at every node and load end so each piece lies in one element
+        breaks = np.unique(np.concatenate([nodes, [position for load in active for position in load[:2]]]))
+        start, length = breaks[:-1], np.diff(breaks)
+        mid = start + 0.5 * length
+        intensity, gradient = load_intensity(mid, active)
+        for point, weight in zip(GAUSS_POINTS, GAUSS_WEIGHTS):
+            x = start + point * length
+            add(x, weight * length * (intensity + gradient * (x - mid)), np.zeros(len(x)))
+    return loads
+
+
+def solve_support_reactions(supports, point_loads, distributed_loads, moments, beam_length, backend=None):
+    """Reaction forces and couples at every support of a beam with uniform EI.
+
+    Returns (forces, couples, stats): one entry per support in the given order of
+    upward forces and of clockwise couples on the beam (zero at Hinge/Roller
+    supports), and the SolveStats of the linear solve. Supports sharing a position
+    share one node, and its reaction is given to the first of them. backend names
+    a solver from beamcalc.solvers (chosen by size by default). Raises
+    MechanismError when the beam is not stable.
+    """
+    forces, couples, stats = solve_load_cases(supports, [(point_loads, distributed_loads, moments)], beam_length, backend)
+    return forces[:, 0], couples[:, 0], stats
+
+
+def solve_load_cases(supports, load_cases, beam_length, backend=None):
+    """Reactions for several load cases on the same supports from one factorization.
+
+    load_cases holds (point_loads, distributed_loads, moments) per case; the cases
+    become the columns of one right-hand side. Returns (forces, couples, stats)
+    like solve_support_reactions, with forces and couples shaped (supports, cases).
+    """
+    nodes = beam_nodes(supports)
+    num_dofs = 2 * len(nodes)
+    lengths = np.diff(nodes)
+    stiffness = element_stiffness(lengths)
+    loads = np.column_stack([nodal_loads(nodes, *case) for case in load_cases])
+    # Restrained DOFs: deflection at every support, rotation at Fixed supports
+    support_nodes = np.searchsorted(nodes, [position for _, position in supports])
+    restrained = np.zeros(num_dofs, dtype=bool)
+    restrained[2 * support_nodes] = True
+    restrained[2 * support_nodes[[support_type == "Fixed" for support_type, _ in supports]] + 1] = True
+
+    # Zero restrained rows and columns and put ones on their diagonal, which keeps the band
+    banded = assemble_banded(stiffness, num_dofs)
+    free = ~restrained
+    for offset in range(BANDWIDTH + 1):
+        columns = np.arange(offset, num_dofs)
+        keep = free[columns] & free[columns - offset]
+        banded[BANDWIDTH - offset, offset:] *= keep
+    banded[BANDWIDTH, restrained] = 1.0
+    displacements, stats = solve_spd_banded(banded, np.where(free[:, None], loads, 0.0), backend)
+
+    # Reactions are the out-of-balance nodal forces K u - F at the restrained DOFs
+    element_dofs = 2 * np.arange(len(lengths))[:, None] + np.arange(4)
+    residual = np.zeros(loads.shape)
+    np.add.at(residual, element_dofs, np.einsum("eij,ejk->eik", stiffness, displacements[element_dofs]))
+    residual -= loads
+
+    forces = np.zeros((len(supports), len(load_cases)))
+    couples = np.zeros((len(supports), len(load_cases)))
+    seen = set()
+    for k, ((support_type, _), node) in enumerate(zip(supports, support_nodes)):
+        if node in seen:
+            continue
+        seen.add(node)
+        forces[k] = residual[2 * node]
+        if restrained[2 * node + 1]:
+            couples[k] = -residual[2 * node + 1]
+    return forces, couples, stats
@@ -0,0 +1,104 @@
+"""Process-wide registry of the decoded support and moment icons.
+
+draw_beam runs on every Streamlit rerun; reading and decoding the PNGs each time
+cost more than drawing them. The registry decodes each file once, can keep copies
+pre-scaled to the zoom used on the diagram (so OffsetImage does not resample on
+every draw), and shares the read-only arrays across sessions.
+"""
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+ICON_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "icons")
+
+ICON_FILES = {
+    "fixed_left": "fixed_support_left.png",
+    "fixed_right": "fixed_support_right.png",
+    "hinge": "hinge_support.png",
+    "roller": "roller_support.png",
+    "moment_clockwise": "moment_clockwise.png",
+    "moment_anticlockwise": "moment_anticlockwise.png",
+}
+
+# Zoom levels draw_beam uses for each icon
+ICON_ZOOMS = {
+    "fixed_left": 0.5,
+    "fixed_right": 0.5,
+    "hinge": 0.3,
+    "roller": 0.3,
+    "moment_clockwise": 0.13,
+    "moment_anticlockwise": 0.13,
+}
+
+
+def _rescale(image, zoom):
+    """Resample an RGBA float image by zoom with Pillow's Lanczos filter."""
+    from PIL import Image
+
+    height, width = image.shape[:2]
+    size = (max(1, round(width * zoom)), max(1, round(height * zoom)))
+    pixels = image if image.dtype == np.uint8 else (np.clip(image, 0, 1) * 255).astype(np.uint8)
+    return np.asarray(Image.fromarray(pixels).resize(size, Image.LANCZOS))
+
+
+class IconRegistry:
+    """Decode-once cache of icon images, optionally pre-scaled per zoom level."""
+
+    def __init__(self, icon_dir=ICON_DIR, prescale=True):
+        self.icon_dir = icon_dir
+        self.prescale = prescale
+        self.load_times = {}
+        self._images = {}
+        self._lock = threading.RLock()
+
+    def get(self, name, zoom=None):
+        """Decoded image array for an icon, resampled to zoom when given."""
+        key = (name, zoom)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+
+        with self._lock:
+            if key not in self._images:
+                source = None if zoom is None else self.get(name)
+                started = time.perf_counter()
+                if source is None:
+                    import matplotlib.image as mpimg
+
+                    image = mpimg.imread(os.path.join(self.icon_dir, ICON_FILES[name]))
+                else:
+                    image = _rescale(source, zoom)
+                image.flags.writeable = False
+                self._images[key] = image
+                self.load_times[key] = time.perf_counter() - started
+                logger.info("Loaded icon %s (zoom %s) in %.1f ms", name, zoom, self.load_times[key] * 1000)
+            return self._images[key]
+
+    def offset_image(self, name, zoom):
+        """OffsetImage of an icon at the given zoom, using the pre-scaled copy when enabled."""
+        from matplotlib.offsetbox import OffsetImage
+
+        if self.prescale:
+            return OffsetImage(self.get(name, zoom), zoom=1.0)
+        return OffsetImage(self.get(name), zoom=zoom)
+
+    def preload(self):
+        """Decode (and pre-scale) every icon up front, returning the total load time in seconds."""
+        for name, zoom in ICON_ZOOMS.items():
+            self.get(name)
+            if self.prescale:
+                self.get(name, zoom)
+        return self.total_load_time
+
+    @property
+    def total_load_time(self):
+        return sum(self.load_times.values())
+
+
+# Shared by every session in the Streamlit process
+ICONS = IconRegistry()
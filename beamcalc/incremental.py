@@ -0,0 +1,196 @@
+"""Incremental re-analysis for interactive editing, one load at a time.
+
+Reactions, shear, moment and deflection are linear in the loads, so the result
+for a load set is the sum of the results for each load on its own.
+IncrementalAnalysis keeps the running totals of one beam; sync compares a new
+BeamModel with the loads already applied and only subtracts the contributions of
+removed loads and adds those of new ones. A load's contribution is computed the
+first time it is needed and the most recently used ones are kept, up to
+CONTRIBUTION_BYTES, so editing one load of many costs at most two single-load
+analyses instead of a pass over every load.
+"""
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from beamcalc.analysis import analyse, compute_diagrams, compute_reactions, compute_unit_load_moments
+from beamcalc.deflection import integrate_deflection
+from beamcalc.model import AnalysisResult
+from beamcalc.reactions import UnsolvableBeamError
+from beamcalc.virtual_work import calculate_deflection
+
+LOAD_KINDS = ("point_loads", "distributed_loads", "moments")
+
+# Edits between full re-analyses of the totals, so rounding does not accumulate
+REFRESH_EDITS = 256
+
+# Arrays of single-load contributions kept per analysis; older ones are recomputed when a load is removed
+CONTRIBUTION_BYTES = 32 * 1024 * 1024
+
+
+@dataclass
+class Contribution:
+    """Reaction values and diagrams of a single load; deflection is for EI = 1."""
+
+    reactions: np.ndarray
+    shear: np.ndarray
+    moment: np.ndarray
+    deflection: np.ndarray
+
+    @property
+    def nbytes(self):
+        return self.reactions.nbytes + self.shear.nbytes + self.moment.nbytes + self.deflection.nbytes
+
+
+def _beam_key(model):
+    """Everything but the loads and EI, which the stored contributions depend on."""
+    return (model.supports, model.beam_length, model.resolution, model.deflection_method, model.mesh, model.matrix_storage)
+
+
+def _model_loads(model):
+    return Counter((kind, load) for kind in LOAD_KINDS for load in getattr(model, kind))
+
+
+class IncrementalAnalysis:
+    """Running analysis of one beam, updated by load additions and removals.
+
+    Only the uniform mesh is updated incrementally; the adaptive mesh depends on
+    every load, so models using it are analysed in full. cache, if given, is used
+    for full analyses and for the virtual work unit-load matrix.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.model = None
+        self.error = None
+        self._key = None
+        self._counts = Counter()
+        self._contributions = OrderedDict()
+        self._contribution_bytes = 0
+        self._unit_weight_moments = None
+        self._edits = 0
+
+    def refresh(self, model):
+        """Analyse model's loads in full and make them the applied loads."""
+        self.model = model
+        self._key = _beam_key(model)
+        self._counts = _model_loads(model)
+        for key in [key for key in self._contributions if key not in self._counts]:
+            self._forget(key)
+        self._edits = 0
+        self.error = None
+        try:
+            reactions = compute_reactions(model, self.cache)
+        except UnsolvableBeamError as error:
+            self.error = str(error)
+            return
+        self.reaction_positions = [position for position, _ in reactions]
+        self.reactions = np.array([value for _, value in reactions])
+        self.x_coords, self.shear, self.moment = compute_diagrams(model, reactions, self.cache)
+        self.deflection = self._deflection(model, reactions, self.x_coords, self.moment)
+
+    def _deflection(self, model, reactions, x_coords, moment):
+        """Deflection for EI = 1."""
+        if model.deflection_method == "virtual_work":
+            # The unit-load matrix does not depend on the loads; build it once per beam
+            if self._unit_weight_moments is None:
+                _, self._unit_weight_moments = compute_unit_load_moments(model, self.cache)
+            return calculate_deflection(x_coords, moment, self._unit_weight_moments, model.beam_length,
+                                        model.resolution, 1.0)[1]
+        return integrate_deflection(x_coords, moment, model.supports, 1.0, model.deflection_method)[1]
+
+    def contribution(self, kind, load):
+        """Contribution of one load, computed when it is not among the recently used ones kept."""
+        key = (kind, load)
+        if key in self._contributions:
+            self._contributions.move_to_end(key)
+        else:
+            loads = {other: [] for other in LOAD_KINDS}
+            loads[kind] = [load]
+            single = replace(self.model, **loads)
+            reactions = compute_reactions(single)
+            x_coords, shear, moment = compute_diagrams(single, reactions)
+            deflection = self._deflection(single, reactions, x_coords, moment)
+            values = np.array([value for _, value in reactions])
+            self._contributions[key] = Contribution(values, shear, moment, deflection)
+            self._contribution_bytes += self._contributions[key].nbytes
+            while self._contribution_bytes > CONTRIBUTION_BYTES and len(self._contributions) > 1:
+                self._forget(next(iter(self._contributions)))
+        return self._contributions[key]
+
+    def _forget(self, key):
+        self._contribution_bytes -= self._contributions.pop(key).nbytes
+
+    def _apply(self, contribution, sign):
+        # New arrays rather than in-place updates, so results already returned stay unchanged
+        self.reactions = self.reactions + sign * contribution.reactions
+        self.shear = self.shear + sign * contribution.shear
+        self.moment = self.moment + sign * contribution.moment
+        self.deflection = self.deflection + sign * contribution.deflection
+
+    def add(self, kind, load):
+        """Add one load given as a BeamModel load tuple of the given kind."""
+        self._apply(self.contribution(kind, load), 1.0)
+        self._counts[(kind, load)] += 1
+        self._edits += 1
+
+    def remove(self, kind, load):
+        """Remove one applied load; raises KeyError if it is not applied."""
+        key = (kind, load)
+        if not self._counts[key]:
+            del self._counts[key]
+            raise KeyError(f"{kind} {load} is not applied")
+        self._apply(self.contribution(kind, load), -1.0)
+        self._counts[key] -= 1
+        if not self._counts[key]:
+            del self._counts[key]
+            if key in self._contributions:
+                self._forget(key)
+        self._edits += 1
+
+    def sync(self, model):
+        """Bring the analysis to model's loads and return its AnalysisResult.
+
+        A change of supports, length, resolution, deflection method or mesh starts
+        over with a full analysis; a change of E or I only rescales the deflection.
+        """
+        if model.mesh != "uniform":
+            self._key = None
+            return analyse(model, self.cache)
+        if _beam_key(model) != self._key:
+            self._unit_weight_moments = None
+            self._contributions.clear()
+            self._contribution_bytes = 0
+            self.refresh(model)
+            return self.result()
+        if self.error:
+            self.model = model
+            return self.result()
+
+        target = _model_loads(model)
+        removed, added = self._counts - target, target - self._counts
+        if sum(removed.values()) + sum(added.values()) + self._edits >= REFRESH_EDITS:
+            self.refresh(model)
+            return self.result()
+        self.model = model
+        for (kind, load), count in removed.items():
+            for _ in range(count):
+                self.remove(kind, load)
+        for (kind, load), count in added.items():
+            for _ in range(count):
+                self.add(kind, load)
+        return self.result()
+
+    def result(self):
+        """AnalysisResult of the loads currently applied."""
+        if self.error:
+            return AnalysisResult(model=self.model, error=self.error)
+        return AnalysisResult(
+            model=self.model,
+            reactions=[(position, float(value)) for position, value in zip(self.reaction_positions, self.reactions)],
+            x_coords=self.x_coords,
+            shear=self.shear,
+            moment=self.moment,
+            deflection=self.deflection / self.model.EI,
+        )
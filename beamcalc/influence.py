@@ -0,0 +1,97 @@
+"""Closed-form influence functions for a downward unit load.
+
+For the support configurations the calculator solves, the reactions to a unit
+load are linear in its position, so reactions and bending moments for every
+load position come out of a few broadcast array operations instead of one
+equilibrium solve and one bending moment pass per position.
+"""
+import numpy as np
+
+from beamcalc import jit
+
+
+def is_cantilever(supports):
+    """True for a single Fixed support."""
+    return len(supports) == 1 and supports[0][0] == "Fixed"
+
+
+def is_simply_supported(supports):
+    """True for two Hinge/Roller supports at distinct positions."""
+    return (
+        len(supports) == 2
+        and all(support_type != "Fixed" for support_type, _ in supports)
+        and supports[0][1] != supports[1][1]
+    )
+
+
+def primary_supports(supports):
+    """Indices of a statically determinate subset of the supports.
+
+    With two or more support positions the outermost two act as pins; otherwise a
+    single Fixed support forms a cantilever. Any other supports of an indeterminate
+    beam are the redundants. Returns () when the supports cannot carry load.
+    """
+    positions = [position for _, position in supports]
+    if len(set(positions)) >= 2:
+        return positions.index(min(positions)), positions.index(max(positions))
+    fixed = [k for k, (support_type, _) in enumerate(supports) if support_type == "Fixed"]
+    return tuple(fixed[:1])
+
+
+def unit_load_reactions(supports, load_positions):
+    """Reactions to a unit downward load at each of load_positions.
+
+    Returns (forces, moments), both shaped (len(load_positions), len(supports)).
+    forces use the same signs as calculate_reactions; moments are the fixed-end
+    couples as they enter the bending moment beyond their support, so unlike the
+    reported reactions they carry no sign that depends on the support's position
+    along the beam. The unit load is carried by the
+    primary_supports, which is all the virtual work method needs, so redundant
+    supports get zero; beams that cannot carry load give zero reactions.
+    """
+    xi = np.asarray(load_positions, dtype=float)
+    forces = np.zeros((len(xi), len(supports)))
+    moments = np.zeros((len(xi), len(supports)))
+
+    primary = primary_supports(supports)
+    if len(primary) == 1:
+        k = primary[0]
+        forces[:, k] = 1.0
+        # Signed lever arm: hogging for loads on either side of the support
+        moments[:, k] = supports[k][1] - xi
+    elif len(primary) == 2:
+        i, j = primary
+        a, b = supports[i][1], supports[j][1]
+        forces[:, j] = (xi - a) / (b - a)
+        forces[:, i] = 1.0 - forces[:, j]
+    return forces, moments
+
+
+def unit_load_moments(supports, load_positions, x_coords, out=None):
+    """Bending moment at x_coords for a unit downward load at each of load_positions.
+
+    Row i is the bending moment diagram for the load at load_positions[i], i.e. one
+    row of the unit load moment matrix. out, if given, is filled in place, e.g. a
+    block of rows of the full matrix.
+    """
+    forces, moments = unit_load_reactions(supports, load_positions)
+    if jit.ENABLED and (out is None or out.flags.c_contiguous):
+        if out is None:
+            out = np.empty((len(load_positions), len(x_coords)))
+        return jit.unit_load_moment_rows(load_positions, x_coords, [position for _, position in supports],
+                                         forces, moments, np.asarray(out))
+
+    xi = np.asarray(load_positions, dtype=float)[:, None]
+    x = np.asarray(x_coords, dtype=float)[None, :]
+
+    # Unit load itself
+    result = -np.where(x >= xi, x - xi, 0.0)
+
+    for k, (_, position) in enumerate(supports):
+        beyond = x >= position
+        result += forces[:, k:k + 1] * np.where(beyond, x - position, 0.0)
+        result += moments[:, k:k + 1] * beyond
+    if out is not None:
+        out[...] = result
+        return out
+    return result
@@ -0,0 +1,115 @@
+"""Optional Numba-compiled kernels for the grid solvers.
+
+When Numba is installed the hot loops of the discretized numerics run as
+nopython machine code: the scatter and prefix sum of step_sum behind shear_force
+and bending_moment, the fill of the unit-load moment matrix and the matrix-vector
+summation of the virtual work deflection, the last two parallel over rows with
+prange. The step sums and the matrix fill repeat their NumPy counterparts'
+arithmetic exactly; the deflection summation, like BLAS, is free to reorder its
+sums and is only used when Numba has more than one thread (PARALLEL), as a
+single-threaded BLAS product is faster. Without Numba, or with BEAMCALC_JIT=0 in
+the environment, ENABLED is False and callers keep their NumPy code.
+
+Numba is only imported by the first kernel call. The kernels are compiled for
+explicit signatures and cached on disk (cache=True), so later processes load
+them instead of compiling. Run ``python -c "from beamcalc import jit; jit.kernels()"``
+at install or deploy time to fill the cache before the app serves its first page.
+"""
+import os
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+from beamcalc.lazy import has_module
+
+ENABLED = has_module("numba") and os.environ.get("BEAMCALC_JIT", "1") != "0"
+# Numba runs one thread per CPU unless NUMBA_NUM_THREADS says otherwise
+PARALLEL = ENABLED and int(os.environ.get("NUMBA_NUM_THREADS", os.cpu_count() or 1)) > 1
+
+_PARALLEL_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def kernels():
+    """(step_sum, unit_load_moment_rows, matvec) kernels, importing Numba and compiling or loading them on first call."""
+    import numba
+    from numba import prange
+
+    # TBB, picked by default when installed, can hang interpreter exit once loaded (seen
+    # under Streamlit); the built-in workqueue is not thread safe, so parallel kernels
+    # are launched under _PARALLEL_LOCK
+    if "NUMBA_THREADING_LAYER" not in os.environ:
+        numba.config.THREADING_LAYER = "workqueue"
+
+    @numba.njit("float64[::1](float64[::1], float64[::1], float64[::1])", cache=True, nogil=True)
+    def _step_sum(x_coords, positions, values):
+        num_points = len(x_coords)
+        totals = np.zeros(num_points)
+        for k in range(len(positions)):
+            idx = np.searchsorted(x_coords, positions[k], side="left")
+            # Where a mesh doubles the node at p the jump belongs to the last copy
+            last = np.searchsorted(x_coords, positions[k], side="right") - 1
+            if last > idx:
+                idx = last
+            if idx < num_points:
+                totals[idx] += values[k]
+        for i in range(1, num_points):
+            totals[i] += totals[i - 1]
+        return totals
+
+    @numba.njit("void(float64[::1], float64[::1], float64[::1], float64[:, ::1], float64[:, ::1], float64[:, ::1])",
+                cache=True, nogil=True, parallel=True)
+    def _unit_load_moment_rows(load_positions, x_coords, support_positions, forces, couples, out):
+        for i in prange(len(load_positions)):
+            xi = load_positions[i]
+            for j in range(len(x_coords)):
+                x = x_coords[j]
+                value = xi - x if x >= xi else 0.0
+                for k in range(len(support_positions)):
+                    if x >= support_positions[k]:
+                        value += forces[i, k] * (x - support_positions[k])
+                        value += couples[i, k]
+                out[i, j] = value
+
+    @numba.njit("void(float64[:, ::1], float64[::1], float64[::1])", cache=True, nogil=True, parallel=True, fastmath=True)
+    def _matvec(matrix, vector, out):
+        for i in prange(matrix.shape[0]):
+            total = 0.0
+            for j in range(matrix.shape[1]):
+                total += matrix[i, j] * vector[j]
+            out[i] = total
+
+    return _step_sum, _unit_load_moment_rows, _matvec
+
+
+def _vector(values):
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def step_sum(x_coords, positions, values):
+    """Compiled engine.step_sum."""
+    return kernels()[0](_vector(x_coords), _vector(positions), _vector(values))
+
+
+def unit_load_moment_rows(load_positions, x_coords, support_positions, forces, couples, out):
+    """Fill out (C-contiguous, one row per load position) with unit-load bending moments.
+
+    forces and couples are shaped (loads, supports), as from
+    influence.unit_load_reactions; couples are zero for pins and rollers.
+    """
+    args = (_vector(load_positions), _vector(x_coords), _vector(support_positions),
+            np.ascontiguousarray(forces, dtype=np.float64), np.ascontiguousarray(couples, dtype=np.float64), out)
+    with _PARALLEL_LOCK:
+        kernels()[1](*args)
+    return out
+
+
+def matvec(matrix, vector):
+    """matrix @ vector with rows summed in parallel."""
+    out = np.empty(matrix.shape[0])
+    matrix, vector = np.ascontiguousarray(matrix, dtype=np.float64), _vector(vector)
+    with _PARALLEL_LOCK:
+        kernels()[2](matrix, vector, out)
+    return out
+
@@ -0,0 +1,27 @@
+"""Deferred imports of optional and heavy dependencies.
+
+The compute core only needs NumPy at import time. SciPy, Numba, pyarrow and the
+plotting libraries are imported the first time a code path needs them, so the
+batch CLI and each new Streamlit worker start without paying for them.
+"""
+import importlib
+import importlib.util
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def has_module(name):
+    """True if name can be imported, found without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def optional_module(name):
+    """Import name on first call; None if it is not installed."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
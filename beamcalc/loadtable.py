@@ -0,0 +1,76 @@
+"""Bulk load tables: CSV text and editor rows to BeamModel load tuples.
+
+Each load kind has a fixed column order, the same as its tuple in BeamModel:
+
+    point_loads        position, magnitude
+    distributed_loads  start, end, start_magnitude, end_magnitude
+    moments            position, magnitude
+
+CSV files may name the columns in a header row (in any order) or give them in
+this order without a header.
+"""
+import csv
+import io
+import math
+
+LOAD_TABLE_COLUMNS = {
+    "point_loads": ("position", "magnitude"),
+    "distributed_loads": ("start", "end", "start_magnitude", "end_magnitude"),
+    "moments": ("position", "magnitude"),
+}
+
+# Columns holding positions along the beam, checked against its length
+POSITION_COLUMNS = ("position", "start", "end")
+
+
+def _is_blank(value):
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def clean_load_rows(rows, kind, beam_length):
+    """Load tuples from table rows of the given kind.
+
+    Blank rows (as left by a table editor) are skipped. Raises ValueError naming
+    the row for missing or non-numeric values and positions outside the beam.
+    """
+    columns = LOAD_TABLE_COLUMNS[kind]
+    loads = []
+    for number, row in enumerate(rows, start=1):
+        row = list(row)
+        if all(_is_blank(value) for value in row):
+            continue
+        if len(row) != len(columns) or any(_is_blank(value) for value in row):
+            raise ValueError(f"Row {number}: expected {', '.join(columns)}")
+        try:
+            load = tuple(float(value) for value in row)
+        except (TypeError, ValueError):
+            raise ValueError(f"Row {number}: values must be numbers") from None
+        for name, value in zip(columns, load):
+            if name in POSITION_COLUMNS and not 0 <= value <= beam_length:
+                raise ValueError(f"Row {number}: {name} {value} m lies outside the beam")
+        loads.append(load)
+    return loads
+
+
+def parse_load_csv(text, kind, beam_length):
+    """Load tuples of the given kind from CSV text."""
+    columns = LOAD_TABLE_COLUMNS[kind]
+    records = [record for record in csv.reader(io.StringIO(text)) if any(field.strip() for field in record)]
+    if not records:
+        return []
+    header = [field.strip().lower() for field in records[0]]
+    if set(columns) <= set(header):
+        order = [header.index(name) for name in columns]
+        rows = [[record[i].strip() if i < len(record) else "" for i in order] for record in records[1:]]
+    else:
+        rows = [[field.strip() for field in record] for record in records]
+    return clean_load_rows(rows, kind, beam_length)
+
+
+def loads_to_csv(loads, kind):
+    """CSV text with a header row for load tuples of the given kind."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(LOAD_TABLE_COLUMNS[kind])
+    writer.writerows(loads)
+    return buffer.getvalue()
@@ -0,0 +1,92 @@
+"""Load-aware, adaptive discretisation of the beam.
+
+The uniform grid samples the beam without regard to the loads: a point load
+between two samples is smeared over an interval and peaks are only as accurate
+as the resolution. adaptive_mesh instead places nodes at every support, load
+start and end and moment position, doubles the node wherever shear or moment
+jumps (the first copy holds the value just left of the jump, the second the
+value just right), adds the zero-shear points where the moment peaks, and
+subdivides each segment only as far as its curvature needs.
+"""
+import numpy as np
+
+from beamcalc.engine import active_distributed_loads, bending_moment, load_intensity, shear_force
+
+MESH_TYPES = ("uniform", "adaptive")
+
+# Nodes at every whole metre, so tabulated stations fall on the mesh
+STATION_SPACING = 1.0
+
+
+def mesh_tolerance(resolution):
+    """Relative interpolation error targeted for a resolution, about that of the uniform grid."""
+    return 1.0 / resolution ** 2
+
+
+def _zero_shear(shear_start, intensity, gradient, length):
+    """Offsets from the segment start of the roots of V0 + w t + dw t² / 2 within the segment, NaN if none."""
+    a, b, c = 0.5 * gradient, intensity, shear_start
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discriminant = b * b - 4 * a * c
+        # Numerically stable quadratic roots; also covers the linear case a == 0
+        q = -0.5 * (b + np.copysign(np.sqrt(np.where(discriminant >= 0, discriminant, np.nan)), b))
+        roots = np.stack([q / a, c / q])
+    return np.where((roots > 0) & (roots < length), roots, np.nan)
+
+
+def adaptive_mesh(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
+    """Sorted node coordinates, with doubled nodes at jumps, refined to mesh_tolerance(resolution)."""
+    forces = list(support_reactions or []) + list(point_loads)
+    couples = list(support_moments or []) + list(external_moments)
+    loads = active_distributed_loads(distributed_loads)
+
+    breaks = np.concatenate([
+        [0.0, beam_length],
+        np.arange(0.0, beam_length, STATION_SPACING),
+        [position for _, position in supports],
+        [position for position, _ in forces + couples],
+        [position for load in loads for position in load[:2]],
+    ])
+    jumps = [position for position, magnitude in forces + couples if magnitude != 0]
+    nodes = np.sort(np.concatenate([np.unique(breaks.clip(0.0, beam_length)), np.unique(np.clip(jumps, 0.0, beam_length))]))
+
+    # Exact values at the nodes; between nodes V is at most quadratic and M cubic
+    args = (point_loads, distributed_loads, beam_length, resolution)
+    _, shear = shear_force(support_reactions, *args, x_coords=nodes)
+    _, moment = bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads,
+                               external_moments, beam_length, resolution, x_coords=nodes)
+
+    segment = np.flatnonzero(np.diff(nodes) > 0)
+    start, length = nodes[segment], np.diff(nodes)[segment]
+    if loads:
+        intensity, gradient = load_intensity(start + 0.5 * length, loads)
+        intensity = intensity - gradient * 0.5 * length
+    else:
+        intensity = gradient = np.zeros(len(segment))
+
+    roots = _zero_shear(shear[segment], intensity, gradient, length)
+    t = np.nan_to_num(roots)
+    root_moment = moment[segment] + shear[segment] * t + intensity * t ** 2 / 2 + gradient * t ** 3 / 6
+    segment_moment = np.nanmax(np.abs(np.vstack([moment[segment], moment[segment + 1],
+                                                 np.where(np.isnan(roots), np.nan, root_moment)])), axis=0)
+    peak_moment = segment_moment.max(initial=0.0)
+    if peak_moment == 0:
+        return nodes
+
+    # Linear interpolation error is h² |f''| / 8: f = M has f'' = w, and f = v has f'' = M / EI
+    # against a deflection scale of at least peak M L² / (10 EI) for any supported beam
+    tolerance = mesh_tolerance(resolution)
+    max_intensity = np.maximum(np.abs(intensity), np.abs(intensity + gradient * length))
+    divisions = np.maximum.reduce([
+        np.ceil(length * np.sqrt(max_intensity / (8 * tolerance * peak_moment))),
+        np.ceil(length / beam_length * np.sqrt(segment_moment / (0.8 * tolerance * peak_moment))),
+        np.ones(len(segment)),
+    ]).astype(int)
+
+    # Evenly spaced interior nodes of every segment, plus its zero-shear points
+    count = divisions - 1
+    owner = np.repeat(np.arange(len(segment)), count)
+    step = np.arange(owner.size) - np.repeat(np.cumsum(count) - count, count) + 1
+    interior = start[owner] + step * (length / divisions)[owner]
+    peaks = (start + roots)[~np.isnan(roots)]
+    return np.sort(np.concatenate([nodes, interior, peaks]))
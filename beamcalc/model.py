@@ -0,0 +1,168 @@
+"""Beam definitions and analysis results, independent of any user interface."""
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from beamcalc.mesh import MESH_TYPES
+from beamcalc.piecewise import BeamPolynomials
+from beamcalc.virtual_work import MATRIX_STORAGE
+
+SUPPORT_TYPES = ("Fixed", "Hinge", "Roller")
+DEFLECTION_METHODS = ("trapezoid", "simpson", "virtual_work")
+
+
+@dataclass
+class BeamModel:
+    """A beam with its supports, loads, grid resolution and section stiffness.
+
+    mesh "uniform" samples int(beam_length * resolution) + 1 evenly spaced points;
+    "adaptive" builds a load-aware mesh with a tolerance derived from resolution.
+    matrix_storage "disk" keeps the virtual work unit-load matrix in a memory-mapped
+    temporary file instead of RAM.
+
+    Loads use the same tuples as the calculator: point loads (position, magnitude),
+    distributed loads (start_pos, end_pos, start_mag, end_mag) and moments
+    (position, magnitude), with upward forces and clockwise moments positive.
+    """
+
+    beam_length: float
+    supports: list
+    point_loads: list = field(default_factory=list)
+    distributed_loads: list = field(default_factory=list)
+    moments: list = field(default_factory=list)
+    resolution: int = 100
+    E: float = 2e8
+    I: float = 1e-4
+    deflection_method: str = "trapezoid"
+    mesh: str = "uniform"
+    matrix_storage: str = "memory"
+    name: str = ""
+
+    def __post_init__(self):
+        self.beam_length = float(self.beam_length)
+        self.supports = [(str(support_type), float(position)) for support_type, position in self.supports]
+        self.point_loads = [tuple(float(v) for v in load) for load in self.point_loads]
+        self.distributed_loads = [tuple(float(v) for v in load) for load in self.distributed_loads]
+        self.moments = [tuple(float(v) for v in moment) for moment in self.moments]
+        self.resolution = int(self.resolution)
+        self.E = float(self.E)
+        self.I = float(self.I)
+        self.validate()
+
+    @property
+    def EI(self):
+        """Flexural rigidity in kNm²."""
+        return self.E * self.I
+
+    @property
+    def num_points(self):
+        return int(self.beam_length * self.resolution) + 1
+
+    def validate(self):
+        """Raise ValueError for definitions no solver can use."""
+        if self.beam_length <= 0:
+            raise ValueError("beam_length must be positive")
+        if self.resolution <= 0:
+            raise ValueError("resolution must be positive")
+        if self.EI <= 0:
+            raise ValueError("E and I must be positive")
+        if self.deflection_method not in DEFLECTION_METHODS:
+            raise ValueError(f"Unknown deflection method: {self.deflection_method}")
+        if self.mesh not in MESH_TYPES:
+            raise ValueError(f"Unknown mesh: {self.mesh}")
+        if self.matrix_storage not in MATRIX_STORAGE:
+            raise ValueError(f"Unknown matrix storage: {self.matrix_storage}")
+        if self.mesh != "uniform" and self.deflection_method == "virtual_work":
+            raise ValueError("Virtual work deflection needs the uniform mesh")
+        for support_type, position in self.supports:
+            if support_type not in SUPPORT_TYPES:
+                raise ValueError(f"Unknown support type: {support_type}")
+            if not 0 <= position <= self.beam_length:
+                raise ValueError(f"Support at {position} m lies outside the beam")
+        for load in self.point_loads + self.moments:
+            if len(load) != 2:
+                raise ValueError(f"Expected (position, magnitude), got {load}")
+        for load in self.distributed_loads:
+            if len(load) != 4:
+                raise ValueError(f"Expected (start_pos, end_pos, start_mag, end_mag), got {load}")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a model from a plain dict, e.g. one JSON Lines record."""
+        known = set(cls.__dataclass_fields__)
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Unknown beam fields: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "beam_length": self.beam_length,
+            "supports": [list(support) for support in self.supports],
+            "point_loads": [list(load) for load in self.point_loads],
+            "distributed_loads": [list(load) for load in self.distributed_loads],
+            "moments": [list(moment) for moment in self.moments],
+            "resolution": self.resolution,
+            "E": self.E,
+            "I": self.I,
+            "deflection_method": self.deflection_method,
+            "mesh": self.mesh,
+            "matrix_storage": self.matrix_storage,
+        }
+
+
+def _extreme(x_coords, values):
+    """Position and value of the largest absolute value of a diagram."""
+    idx = int(np.argmax(np.abs(values)))
+    return {"x": float(x_coords[idx]), "value": float(values[idx])}
+
+
+@dataclass
+class AnalysisResult:
+    """Reactions and diagrams for one BeamModel.
+
+    When the supports cannot be solved, error holds the reason and the arrays are None.
+    polynomials, when present, holds the exact diagrams used for the shear and
+    moment extremes and the zero-shear points.
+    """
+
+    model: BeamModel
+    reactions: list = None
+    error: str = None
+    x_coords: np.ndarray = None
+    shear: np.ndarray = None
+    moment: np.ndarray = None
+    deflection: np.ndarray = None
+    polynomials: BeamPolynomials = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def summary(self):
+        """Reactions and governing values as plain Python types."""
+        data = {"name": self.model.name, "error": self.error}
+        if not self.ok:
+            return data
+        data["reactions"] = [[float(position), float(value)] for position, value in self.reactions]
+        if self.polynomials is not None:
+            for key, diagram in (("max_shear", self.polynomials.shear), ("max_moment", self.polynomials.moment)):
+                x, value = diagram.extreme()
+                data[key] = {"x": x, "value": value}
+            data["zero_shear"] = self.polynomials.zero_shear().tolist()
+        else:
+            data["max_shear"] = _extreme(self.x_coords, self.shear)
+            data["max_moment"] = _extreme(self.x_coords, self.moment)
+        data["max_deflection_mm"] = _extreme(self.x_coords, self.deflection * 1000)
+        return data
+
+    def to_dict(self, full=False):
+        """Summary, plus the sampled diagrams when full is True."""
+        data = self.summary()
+        if full and self.ok:
+            data["x"] = self.x_coords.tolist()
+            data["shear"] = self.shear.tolist()
+            data["moment"] = self.moment.tolist()
+            data["deflection"] = self.deflection.tolist()
+        return data
@@ -0,0 +1,245 @@
+"""Moving-load scans of axle trains over influence lines.
+
+Row j of an influence matrix is the shear, moment or deflection along the beam
+for a unit upward load at grid point j, the unit-load idea behind
+calculate_unit_load_moment extended to every support arrangement: determinate
+beams use the closed-form unit-load reactions, indeterminate ones the reactions
+of all unit loads from one stiffness factorization. The matrices are built once
+per beam. An axle train is deposited onto the grid as a short kernel of taps, and
+its response for every position of the train is the correlation of that kernel
+with the influence matrix along the load axis: a few shifted row slices when the
+train has few axles, or an FFT along the load axis when it has many.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from beamcalc.cost import DEFAULT_MAX_BYTES, DEFAULT_MAX_SECONDS, estimate_influence_lines
+from beamcalc.deflection import INTEGRATION_METHODS, apply_boundary_conditions, cumulative_integral
+from beamcalc.engine import beam_grid
+from beamcalc.fem import solve_load_cases
+from beamcalc.influence import primary_supports, unit_load_reactions
+from beamcalc.multi import BLOCK_ELEMENTS
+from beamcalc.reactions import UnsolvableBeamError, is_statically_determinate
+from beamcalc.solvers import MechanismError
+
+DIAGRAM_NAMES = ("shear", "moment", "deflection")
+SCAN_METHODS = ("auto", "direct", "fft")
+
+
+@dataclass
+class AxleTrain:
+    """A train of axle loads (offset, load) with offsets in m from the reference axle.
+
+    Loads follow the point load convention, upward positive, so axles pressing
+    down on the beam are negative.
+    """
+
+    name: str
+    axles: list
+
+
+@dataclass
+class InfluenceLines:
+    """Unit-load response matrices, rows indexed by load position and columns by response point.
+
+    deflection is for EI = 1.
+    """
+
+    x_coords: np.ndarray
+    shear: np.ndarray
+    moment: np.ndarray
+    deflection: np.ndarray
+
+
+@dataclass
+class MovingLoadEnvelope:
+    """Max/min envelopes of one axle train over every train position.
+
+    upper and lower map each of DIAGRAM_NAMES to the envelope along x_coords, and
+    upper_position and lower_position to the position of the reference axle that
+    produces it at each point.
+    """
+
+    train: AxleTrain
+    x_coords: np.ndarray
+    upper: dict
+    lower: dict
+    upper_position: dict
+    lower_position: dict
+
+    def critical(self, diagram):
+        """(x, value, reference axle position) of the largest absolute value of a diagram."""
+        upper, lower = self.upper[diagram], self.lower[diagram]
+        idx_upper, idx_lower = int(np.argmax(upper)), int(np.argmin(lower))
+        if abs(upper[idx_upper]) >= abs(lower[idx_lower]):
+            return float(self.x_coords[idx_upper]), float(upper[idx_upper]), float(self.upper_position[diagram][idx_upper])
+        return float(self.x_coords[idx_lower]), float(lower[idx_lower]), float(self.lower_position[diagram][idx_lower])
+
+    def summary(self):
+        """Critical values and train positions as plain Python types."""
+        data = {"train": self.train.name}
+        for diagram in DIAGRAM_NAMES:
+            x, value, position = self.critical(diagram)
+            data[f"max_{diagram}"] = {"x": x, "value": value, "train_position": position}
+        return data
+
+
+def _unit_load_support_actions(supports, load_positions, beam_length):
+    """Support forces and diagram couples for a unit upward load at each position, shaped (loads, supports)."""
+    if is_statically_determinate(supports, beam_length):
+        if not primary_supports(supports):
+            raise UnsolvableBeamError("Unable to Solve: Singular Matrix")
+        forces, moments = unit_load_reactions(supports, load_positions)
+        # unit_load_reactions is for a downward load
+        return -forces, -moments
+    if not supports or (len(supports) == 1 and supports[0][0] != "Fixed"):
+        raise UnsolvableBeamError("Unable to Solve")
+    try:
+        forces, couples, _ = solve_load_cases(supports, [([(position, 1.0)], [], []) for position in load_positions], beam_length)
+    except MechanismError:
+        raise UnsolvableBeamError("Unable to Solve: Singular Matrix")
+    return forces.T, couples.T
+
+
+def influence_lines(supports, beam_length, resolution, method="trapezoid"):
+    """InfluenceLines on the uniform grid, deflection integrated with the given method."""
+    x_coords = beam_grid(beam_length, resolution)
+    forces, couples = _unit_load_support_actions(supports, x_coords, beam_length)
+    load = x_coords[:, None]
+    x = x_coords[None, :]
+
+    shear = (x >= load).astype(float)
+    moment = np.where(x >= load, x - load, 0.0)
+    for k, (_, position) in enumerate(supports):
+        beyond = x_coords >= position
+        shear += np.multiply.outer(forces[:, k], beyond)
+        moment += np.multiply.outer(forces[:, k], np.where(beyond, x_coords - position, 0.0))
+        moment += np.multiply.outer(couples[:, k], beyond)
+
+    slope = cumulative_integral(moment, x_coords, method)
+    deflection = apply_boundary_conditions(x_coords, slope, cumulative_integral(slope, x_coords, method), supports)
+    return InfluenceLines(x_coords, shear, moment, deflection)
+
+
+def compute_influence_lines(model, cache=None, max_seconds=DEFAULT_MAX_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+    """InfluenceLines of a model, cached per supports and grid.
+
+    The three N x N matrices are only built when their estimated cost fits
+    max_seconds and max_bytes; otherwise ValueError says what they would need.
+    """
+    over_budget = estimate_influence_lines(model).over_budget(max_seconds, max_bytes)
+    if over_budget:
+        raise ValueError(f"Influence lines of this beam need {' and '.join(over_budget)}; lower the resolution")
+    method = model.deflection_method if model.deflection_method in INTEGRATION_METHODS else "trapezoid"
+
+    def compute():
+        return influence_lines(model.supports, model.beam_length, model.resolution, method)
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute("influence_lines", (model.supports, model.beam_length, model.resolution, method), compute)
+
+
+def train_kernel(axles, dx):
+    """Deposit axle loads onto a grid of spacing dx.
+
+    Returns (base, taps): taps[t] is the load at grid offset base + t from the
+    reference axle, each axle split linearly between its two neighbouring grid
+    points, which is exact for influence lines that are linear between them.
+    """
+    offsets = np.array([offset for offset, _ in axles], dtype=float) / dx
+    loads = np.array([load for _, load in axles], dtype=float)
+    base = int(np.floor(offsets.min()))
+    relative = offsets - base
+    idx = np.floor(relative).astype(int)
+    weight = relative - idx
+    taps = np.zeros(idx.max() + 2)
+    np.add.at(taps, idx, loads * (1 - weight))
+    np.add.at(taps, idx + 1, loads * weight)
+    return base, taps
+
+
+def _correlate_direct(padded, taps, num_positions):
+    """sum_t taps[t] * padded[m + 1 + t] for every train position m, one shifted slice per tap."""
+    result = np.zeros((num_positions, padded.shape[1]))
+    for t in np.flatnonzero(taps):
+        result += taps[t] * padded[1 + t:1 + t + num_positions]
+    return result
+
+
+def _correlate_fft(padded, taps, num_positions):
+    """The same correlation as a convolution with the reversed taps, by real FFTs along the load axis."""
+    length = 1 << (len(padded) + len(taps) - 2).bit_length()
+    spectrum = np.fft.rfft(padded, length, axis=0) * np.fft.rfft(taps[::-1], length)[:, None]
+    return np.fft.irfft(spectrum, length, axis=0)[len(taps):len(taps) + num_positions]
+
+
+def _use_fft(num_taps, num_rows):
+    # A tap costs one pass over the rows; the FFT about 5 n log2 n for its padded length n
+    length = 1 << (num_rows + num_taps - 2).bit_length()
+    return num_taps * num_rows > 5 * length * np.log2(length)
+
+
+def scan_train(lines, train, method="auto", EI=1.0, block_elements=BLOCK_ELEMENTS):
+    """MovingLoadEnvelope of one AxleTrain crossing the beam.
+
+    The reference axle moves in grid steps from the position that puts the lead
+    axle at x = 0 to the one that puts the last axle at the far end. method is
+    "direct", "fft" or "auto", which picks the cheaper one for the number of grid
+    taps the train covers. Response columns are processed in blocks of about
+    block_elements values to bound memory.
+    """
+    if method not in SCAN_METHODS:
+        raise ValueError(f"Unknown scan method: {method}")
+    if not train.axles:
+        raise ValueError(f"Train {train.name} has no axles")
+    x_coords = lines.x_coords
+    dx = x_coords[1] - x_coords[0]
+    base, taps = train_kernel(train.axles, dx)
+    num_points, num_taps = len(x_coords), len(taps)
+    # Zero rows either side of the beam stand for axles off the beam
+    num_rows = num_points + 2 * num_taps
+    num_positions = num_points + num_taps - 1
+    positions = (np.arange(num_positions) - base - num_taps + 1) * dx
+    # One grid step further out only an axle's interpolation tap, not the axle, is on the beam
+    offsets = [offset for offset, _ in train.axles]
+    tolerance = 1e-9 * dx
+    on_beam = (positions + max(offsets) >= -tolerance) & (positions + min(offsets) <= x_coords[-1] + tolerance)
+    positions = positions[on_beam]
+    if method == "auto":
+        method = "fft" if _use_fft(int(np.count_nonzero(taps)), num_rows) else "direct"
+    correlate = _correlate_fft if method == "fft" else _correlate_direct
+
+    upper, lower, upper_position, lower_position = {}, {}, {}, {}
+    block = max(1, block_elements // num_rows)
+    for diagram in DIAGRAM_NAMES:
+        matrix = getattr(lines, diagram)
+        scale = 1.0 / EI if diagram == "deflection" else 1.0
+        upper[diagram], lower[diagram] = np.empty(num_points), np.empty(num_points)
+        upper_position[diagram], lower_position[diagram] = np.empty(num_points), np.empty(num_points)
+        for first in range(0, num_points, block):
+            columns = slice(first, first + block)
+            padded = np.zeros((num_rows, matrix[:, columns].shape[1]))
+            padded[num_taps:num_taps + num_points] = matrix[:, columns]
+            response = correlate(padded, taps, num_positions)[on_beam] * scale
+            high, low = response.argmax(axis=0), response.argmin(axis=0)
+            span = np.arange(response.shape[1])
+            upper[diagram][columns] = response[high, span]
+            lower[diagram][columns] = response[low, span]
+            upper_position[diagram][columns] = positions[high]
+            lower_position[diagram][columns] = positions[low]
+
+    return MovingLoadEnvelope(train, x_coords, upper, lower, upper_position, lower_position)
+
+
+def moving_load_envelopes(model, trains, method="auto", cache=None, max_seconds=DEFAULT_MAX_SECONDS,
+                          max_bytes=DEFAULT_MAX_BYTES):
+    """MovingLoadEnvelope of every AxleTrain over the model's beam, keyed by train name.
+
+    The influence lines are built once and shared by all trains; the loads of
+    model itself are ignored. Raises UnsolvableBeamError for unstable supports
+    and ValueError when the influence lines exceed max_seconds or max_bytes.
+    """
+    lines = compute_influence_lines(model, cache, max_seconds, max_bytes)
+    return {train.name: scan_train(lines, train, method, model.EI) for train in trains}
@@ -0,0 +1,245 @@
+"""Batched solver for many beams sharing one grid.
+
+K beams with the same length and resolution are stacked into padded load arrays
+of shape (K, n_loads) and solved together: reactions with one batched
+np.linalg.solve over the (K, 2, 2) equilibrium systems, and shear, moment and
+deflection as (K, N) array operations. This removes the per-call overhead that
+dominates when each beam on its own is cheap.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from beamcalc.deflection import cumulative_integral
+from beamcalc.engine import beam_grid
+from beamcalc.influence import is_cantilever, is_simply_supported
+from beamcalc.model import AnalysisResult
+
+# Grid values per block of cases; keeps the (K, N) temporaries within the CPU cache
+BLOCK_ELEMENTS = 1 << 16
+
+
+def _pad(rows, width):
+    """Stack ragged lists of load tuples into a zero-padded (K, n, width) array."""
+    count = max((len(row) for row in rows), default=0)
+    padded = np.zeros((len(rows), count, width))
+    for k, row in enumerate(rows):
+        if row:
+            padded[k, :len(row)] = row
+    return padded
+
+
+def _step_sum_rows(x_coords, positions, values):
+    """Row-wise sum of values * H(x - position) for (K, n) positions and values."""
+    num_cases, num_points = positions.shape[0], len(x_coords)
+    idx = np.searchsorted(x_coords, positions, side="left")
+    inside = (idx < num_points) & (values != 0)
+    rows = np.broadcast_to(np.arange(num_cases)[:, None], idx.shape)
+    totals = np.zeros(num_cases * num_points)
+    np.add.at(totals, rows[inside] * num_points + idx[inside], values[inside])
+    return np.cumsum(totals.reshape(num_cases, num_points), axis=1)
+
+
+def _interp_rows(x_coords, values, positions):
+    """Linear interpolation of each row of values at its own position."""
+    idx = np.clip(np.searchsorted(x_coords, positions, side="right") - 1, 0, len(x_coords) - 2)
+    x0, x1 = x_coords[idx], x_coords[idx + 1]
+    weight = np.clip((positions - x0) / (x1 - x0), 0.0, 1.0)
+    rows = np.arange(len(positions))
+    return values[rows, idx] * (1 - weight) + values[rows, idx + 1] * weight
+
+
+@dataclass
+class StackedAnalysis:
+    """Results for K beams on a shared grid; rows of failed cases are NaN."""
+
+    models: list
+    x_coords: np.ndarray
+    reactions: list
+    errors: list
+    shear: np.ndarray
+    moment: np.ndarray
+    deflection: np.ndarray
+
+    def __len__(self):
+        return len(self.models)
+
+    def result(self, k):
+        """AnalysisResult for case k, sharing the stacked arrays."""
+        if self.errors[k]:
+            return AnalysisResult(model=self.models[k], error=self.errors[k])
+        return AnalysisResult(
+            model=self.models[k],
+            reactions=self.reactions[k],
+            x_coords=self.x_coords,
+            shear=self.shear[k],
+            moment=self.moment[k],
+            deflection=self.deflection[k],
+        )
+
+
+def _end_cantilever(model):
+    """True for a single Fixed support at either end, the cantilevers solved by statics."""
+    return is_cantilever(model.supports) and model.supports[0][1] in (0, model.beam_length)
+
+
+def stacked_reactions(models, point, dist, couples):
+    """Reactions for every case, following solve_reactions case by case.
+
+    Returns (forces (K, 2), moments (K,), support positions (K, 2), errors).
+    """
+    num_cases = len(models)
+    p_pos, p_mag = point[..., 0], point[..., 1]
+    start, end, w1, w2 = dist[..., 0], dist[..., 1], dist[..., 2], dist[..., 3]
+    length = np.abs(end - start)
+    total = 0.5 * (w1 + w2) * length
+    loaded = (w1 + w2) != 0
+    safe_sum = np.where(loaded, w1 + w2, 1.0)
+    centroid_left = np.where(loaded, length / 3 * (2 * w2 + w1) / safe_sum, 0.0)
+    distance_left = np.minimum(start, end)
+    distance_right = np.array([model.beam_length for model in models])[:, None] - np.maximum(start, end)
+
+    sum_loads = p_mag.sum(axis=1) + total.sum(axis=1)
+    sum_couples = couples[..., 1].sum(axis=1)
+
+    forces = np.zeros((num_cases, 2))
+    moments = np.zeros(num_cases)
+    support_pos = np.zeros((num_cases, 2))
+    errors = [None] * num_cases
+
+    cantilever = np.array([_end_cantilever(model) for model in models], dtype=bool)
+    pinned = np.array([is_simply_supported(model.supports) for model in models], dtype=bool)
+
+    for k, model in enumerate(models):
+        positions = [position for _, position in model.supports]
+        support_pos[k, :len(positions[:2])] = positions[:2]
+        if cantilever[k] or pinned[k]:
+            continue
+        if len(model.supports) == 1 and model.supports[0][0] != "Fixed":
+            errors[k] = "Unable to Solve"
+        elif len(model.supports) == 2 and positions[0] == positions[1] and "Fixed" not in dict(model.supports):
+            errors[k] = "Unable to Solve: Singular Matrix"
+        else:
+            errors[k] = "The stacked solver only handles end-fixed cantilevers and simply supported beams"
+
+    if cantilever.any():
+        fixed = support_pos[cantilever, 0][:, None]
+        point_moments = (p_mag[cantilever] * np.abs(p_pos[cantilever] - fixed)).sum(axis=1)
+        arm = np.where(fixed == 0,
+                       centroid_left[cantilever] + distance_left[cantilever],
+                       length[cantilever] - centroid_left[cantilever] + distance_right[cantilever])
+        dist_moments = np.where(loaded[cantilever], total[cantilever] * arm, 0.0).sum(axis=1)
+        couple_sign = np.where(fixed[:, 0] == 0, 1.0, -1.0)
+        forces[cantilever, 0] = -sum_loads[cantilever]
+        moments[cantilever] = point_moments + dist_moments - couple_sign * sum_couples[cantilever]
+
+    if pinned.any():
+        coefficients = np.ones((int(pinned.sum()), 2, 2))
+        coefficients[:, 1, :] = support_pos[pinned]
+        first_moments = (p_mag[pinned] * p_pos[pinned]).sum(axis=1) + np.where(
+            loaded[pinned], total[pinned] * (centroid_left[pinned] + distance_left[pinned]), 0.0).sum(axis=1)
+        constants = np.stack([sum_loads[pinned], first_moments - sum_couples[pinned]], axis=1)
+        forces[pinned] = -np.linalg.solve(coefficients, constants[..., None])[..., 0]
+
+    return forces, moments, support_pos, errors
+
+
+def _solve_block(models, x_coords, method):
+    """Reactions and (K, N) diagrams for one block of cases."""
+    point = _pad([model.point_loads for model in models], 2)
+    dist = _pad([model.distributed_loads for model in models], 4)
+    couples = _pad([model.moments for model in models], 2)
+
+    forces, support_moments, support_pos, errors = stacked_reactions(models, point, dist, couples)
+
+    # Point forces: loads plus support reactions
+    force_pos = np.concatenate([point[..., 0], support_pos], axis=1)
+    force_mag = np.concatenate([point[..., 1], forces], axis=1)
+    shear = _step_sum_rows(x_coords, force_pos, force_mag)
+    moment = x_coords * shear - _step_sum_rows(x_coords, force_pos, force_mag * force_pos)
+
+    # Couples: external moments plus the fixed support moment with its end's sign convention
+    fixed_sign = np.where(support_pos[:, 0] == 0, 1.0, -1.0)
+    couple_pos = np.concatenate([couples[..., 0], support_pos[:, :1]], axis=1)
+    couple_mag = np.concatenate([couples[..., 1], (fixed_sign * support_moments)[:, None]], axis=1)
+    moment += _step_sum_rows(x_coords, couple_pos, couple_mag)
+
+    # Distributed loads, one padded load slot at a time across all cases
+    for slot in range(dist.shape[1]):
+        start, end, w1, w2 = (dist[:, slot, i][:, None] for i in range(4))
+        active = end > start
+        span = np.where(active, end - start, 1.0)
+        slope = np.where(active, (w2 - w1) / span, 0.0)
+        covered = np.where(active, np.clip(x_coords, start, np.maximum(end, start)) - start, 0.0)
+        arm = x_coords - start
+        shear += w1 * covered + 0.5 * slope * covered ** 2
+        moment += w1 * (arm * covered - 0.5 * covered ** 2) + slope * (0.5 * arm * covered ** 2 - covered ** 3 / 3)
+
+    # Deflection: integrate M/EI twice for all cases, then apply each case's support conditions
+    EI = np.array([model.EI for model in models])[:, None]
+    slope_curve = cumulative_integral(moment / EI, x_coords, method)
+    deflection = cumulative_integral(slope_curve, x_coords, method)
+    cantilever = np.array([_end_cantilever(model) for model in models], dtype=bool)
+    a, b = support_pos[:, 0], support_pos[:, 1]
+    v_a = _interp_rows(x_coords, deflection, a)
+    c1 = np.where(
+        cantilever,
+        -_interp_rows(x_coords, slope_curve, a),
+        -(_interp_rows(x_coords, deflection, b) - v_a) / np.where(a == b, 1.0, b - a),
+    )
+    c0 = -v_a - c1 * a
+    deflection += c1[:, None] * x_coords + c0[:, None]
+
+    reactions = []
+    for k, model in enumerate(models):
+        if errors[k]:
+            reactions.append(False)
+        elif cantilever[k]:
+            reactions.append([(support_pos[k, 0], forces[k, 0]), (support_pos[k, 0], support_moments[k])])
+        else:
+            reactions.append(sorted(zip(support_pos[k], forces[k]), key=lambda x: x[0]))
+    return reactions, errors, shear, moment, deflection
+
+
+def analyse_stack(models, method="trapezoid", block_elements=BLOCK_ELEMENTS):
+    """Analyse K BeamModels that share beam_length and resolution in one set of array operations.
+
+    Cases are processed in row blocks of about block_elements grid values so the
+    working arrays stay cache sized; every model uses the given integration method.
+    """
+    if not models:
+        raise ValueError("No models to analyse")
+    beam_length, resolution = models[0].beam_length, models[0].resolution
+    if any(model.beam_length != beam_length or model.resolution != resolution for model in models):
+        raise ValueError("Stacked models must share beam_length and resolution")
+    if any(model.mesh != "uniform" for model in models):
+        raise ValueError("Stacked models must use the uniform mesh")
+
+    x_coords = beam_grid(beam_length, resolution)
+    num_cases, num_points = len(models), len(x_coords)
+    shear = np.empty((num_cases, num_points))
+    moment = np.empty((num_cases, num_points))
+    deflection = np.empty((num_cases, num_points))
+    reactions, errors = [], []
+
+    block = max(1, block_elements // num_points)
+    for first in range(0, num_cases, block):
+        rows = slice(first, first + block)
+        block_reactions, block_errors, shear[rows], moment[rows], deflection[rows] = _solve_block(models[rows], x_coords, method)
+        reactions += block_reactions
+        errors += block_errors
+
+    failed = np.array([error is not None for error in errors], dtype=bool)
+    shear[failed] = np.nan
+    moment[failed] = np.nan
+    deflection[failed] = np.nan
+
+    return StackedAnalysis(
+        models=list(models),
+        x_coords=x_coords,
+        reactions=reactions,
+        errors=errors,
+        shear=shear,
+        moment=moment,
+        deflection=deflection,
+    )
@@ -0,0 +1,204 @@
+"""Exact piecewise-polynomial shear, moment and deflection.
+
+Between two load discontinuities the supported loads (point forces, linearly
+varying distributed loads and couples) give a shear of degree <= 2, a moment of
+degree <= 3 and a deflection of degree <= 5. beam_polynomials builds the
+coefficients of every segment from the same load lists as shear_force and
+bending_moment, so values, extrema, zero-shear points and integrals come out
+analytically at any x, in time proportional to the number of loads rather than
+the number of grid points.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from beamcalc.engine import active_distributed_loads, bending_moment, load_intensity, shear_force
+from beamcalc.influence import primary_supports
+
+
+class PiecewisePolynomial:
+    """Polynomial pieces on [breaks[k], breaks[k + 1]).
+
+    coefficients[k] holds piece k in increasing powers of x - breaks[k]. Like the
+    sampled diagrams the function is right-continuous: at a break it takes the
+    value just right of it, except at the last break, which closes the last piece.
+    """
+
+    def __init__(self, breaks, coefficients):
+        self.breaks = np.asarray(breaks, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+
+    @property
+    def lengths(self):
+        return np.diff(self.breaks)
+
+    def _pieces(self, x_coords, side):
+        idx = np.searchsorted(self.breaks, x_coords, side=side) - 1
+        return np.clip(idx, 0, len(self.coefficients) - 1)
+
+    def __call__(self, x_coords, side="right"):
+        """Values at x_coords; side="left" gives the limit from the left at breaks."""
+        x_coords = np.asarray(x_coords, dtype=float)
+        idx = self._pieces(x_coords, side)
+        offset = x_coords - self.breaks[idx]
+        values = np.zeros(x_coords.shape)
+        for power in range(self.coefficients.shape[1] - 1, -1, -1):
+            values = values * offset + self.coefficients[idx, power]
+        return values
+
+    def end_values(self):
+        """(value at the start, value at the end) of every piece."""
+        powers = self.lengths[:, None] ** np.arange(self.coefficients.shape[1])
+        return self.coefficients[:, 0], (self.coefficients * powers).sum(axis=1)
+
+    def __truediv__(self, divisor):
+        return PiecewisePolynomial(self.breaks, self.coefficients / divisor)
+
+    def derivative(self):
+        powers = np.arange(1, self.coefficients.shape[1])
+        return PiecewisePolynomial(self.breaks, self.coefficients[:, 1:] * powers)
+
+    def antiderivative(self):
+        """Continuous antiderivative that is zero at breaks[0]."""
+        num_pieces, order = self.coefficients.shape
+        coefficients = np.zeros((num_pieces, order + 1))
+        coefficients[:, 1:] = self.coefficients / np.arange(1, order + 1)
+        # Each piece starts where the previous one ended
+        increments = (coefficients * self.lengths[:, None] ** np.arange(order + 1)).sum(axis=1)
+        coefficients[1:, 0] = np.cumsum(increments)[:-1]
+        return PiecewisePolynomial(self.breaks, coefficients)
+
+    def add_linear(self, slope, intercept):
+        """Copy with slope * x + intercept added."""
+        coefficients = self.coefficients.copy()
+        coefficients[:, 0] += slope * self.breaks[:-1] + intercept
+        if coefficients.shape[1] > 1:
+            coefficients[:, 1] += slope
+        else:
+            coefficients = np.column_stack([coefficients, np.full(len(coefficients), slope)])
+        return PiecewisePolynomial(self.breaks, coefficients)
+
+    def integral(self, a, b):
+        """Exact integral from a to b."""
+        antiderivative = self.antiderivative()
+        return float(antiderivative(b) - antiderivative(a))
+
+    def _piece_roots(self, k, interior=True):
+        """Offsets of the real roots of piece k within it (excluding its ends when interior)."""
+        coefficients = np.trim_zeros(self.coefficients[k], "b")
+        if len(coefficients) < 2:
+            return np.array([])
+        roots = np.roots(coefficients[::-1])
+        scale = max(self.lengths[k], 1.0)
+        roots = roots[np.abs(roots.imag) <= 1e-9 * scale].real
+        low = 0.0 if not interior else 1e-12 * scale
+        return np.unique(roots[(roots >= low) & (roots < self.lengths[k])])
+
+    def _all_piece_roots(self, interior=True):
+        """(piece indices, offsets) of the real roots of every piece, like _piece_roots.
+
+        Pieces of degree <= 2, e.g. shear and the derivative of the moment, are
+        solved in closed form all at once; higher degrees go piece by piece.
+        """
+        order = self.coefficients.shape[1]
+        if order > 3:
+            found = [(k, offset) for k in range(len(self.coefficients)) for offset in self._piece_roots(k, interior)]
+            pieces, offsets = zip(*found) if found else ((), ())
+            return np.array(pieces, dtype=int), np.array(offsets, dtype=float)
+        padded = np.zeros((len(self.coefficients), 3))
+        padded[:, :order] = self.coefficients
+        c, b, a = padded.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            discriminant = b * b - 4 * a * c
+            # A tangent root may come out slightly negative
+            discriminant = np.where((discriminant < 0) & (discriminant > -1e-12 * b * b), 0.0, discriminant)
+            # Numerically stable quadratic roots; the second also covers the linear case a == 0
+            q = -0.5 * (b + np.copysign(np.sqrt(np.where(discriminant >= 0, discriminant, np.nan)), b))
+            roots = np.stack([q / a, c / q], axis=1)
+        scale = np.maximum(self.lengths, 1.0)[:, None]
+        low = 1e-12 * scale if interior else 0.0
+        inside = np.isfinite(roots) & (roots >= low) & (roots < self.lengths[:, None])
+        # A double root is reported once
+        inside[:, 1] &= ~(inside[:, 0] & (roots[:, 0] == roots[:, 1]))
+        pieces, which = np.nonzero(inside)
+        return pieces, roots[pieces, which]
+
+    def roots(self):
+        """Positions where the function is zero or changes sign across a break."""
+        pieces, offsets = self._all_piece_roots(interior=False)
+        found = [self.breaks[pieces] + offsets]
+        # A jump through zero, e.g. shear at a point load under the peak moment
+        start, end = self.end_values()
+        crossing = np.flatnonzero(np.sign(end[:-1]) * np.sign(start[1:]) < 0) + 1
+        found.append(self.breaks[crossing])
+        return np.unique(np.concatenate(found))
+
+    def extreme(self):
+        """(x, value) of the largest absolute value, over both sides of every break."""
+        start, end = self.end_values()
+        pieces, offsets = self.derivative()._all_piece_roots()
+        positions = np.concatenate([self.breaks[:-1], self.breaks[1:], self.breaks[pieces] + offsets])
+        # Stationary points are evaluated inside their own piece
+        powers = offsets[:, None] ** np.arange(self.coefficients.shape[1])
+        stationary = (self.coefficients[pieces] * powers).sum(axis=1)
+        values = np.concatenate([start, end, stationary])
+        idx = int(np.argmax(np.abs(values)))
+        return float(positions[idx]), float(values[idx])
+
+
+@dataclass
+class BeamPolynomials:
+    """Exact shear, moment and deflection of one beam."""
+
+    shear: PiecewisePolynomial
+    moment: PiecewisePolynomial
+    deflection: PiecewisePolynomial
+
+    def zero_shear(self):
+        """Positions of zero shear, where the bending moment has its local extrema."""
+        return self.shear.roots()
+
+
+def beam_polynomials(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length):
+    """Shear and moment PiecewisePolynomials for the same inputs as shear_force and bending_moment."""
+    forces = list(support_reactions or []) + list(point_loads)
+    couples = list(support_moments or []) + list(external_moments)
+    loads = active_distributed_loads(distributed_loads)
+    breaks = np.unique(np.clip(np.concatenate([
+        [0.0, beam_length],
+        [position for position, _ in forces + couples],
+        [position for load in loads for position in load[:2]],
+    ]), 0.0, beam_length))
+
+    # Values just right of each break from the closed-form engine, then the load intensity inside the piece
+    start, length = breaks[:-1], np.diff(breaks)
+    _, shear = shear_force(support_reactions, point_loads, distributed_loads, beam_length, None, x_coords=start)
+    _, moment = bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads,
+                               external_moments, beam_length, None, x_coords=start)
+    if loads:
+        intensity, gradient = load_intensity(start + 0.5 * length, loads)
+        intensity = intensity - gradient * 0.5 * length
+    else:
+        intensity = gradient = np.zeros(len(start))
+
+    shear_poly = PiecewisePolynomial(breaks, np.column_stack([shear, intensity, gradient / 2]))
+    moment_poly = PiecewisePolynomial(breaks, np.column_stack([moment, shear, intensity / 2, gradient / 6]))
+    return shear_poly, moment_poly
+
+
+def deflection_polynomial(moment, supports, EI):
+    """Exact deflection from a moment PiecewisePolynomial, with the support conditions of integrate_deflection."""
+    slope = (moment / EI).antiderivative()
+    deflection = slope.antiderivative()
+    positions = [supports[k][1] for k in primary_supports(supports)]
+    if len(positions) == 1:
+        c1 = -float(slope(positions[0]))
+        c0 = -float(deflection(positions[0])) - c1 * positions[0]
+    elif len(positions) == 2:
+        a, b = positions
+        v_a, v_b = float(deflection(a)), float(deflection(b))
+        c1 = -(v_b - v_a) / (b - a)
+        c0 = -v_a - c1 * a
+    else:
+        return PiecewisePolynomial(deflection.breaks, np.zeros((len(deflection.coefficients), 1)))
+    return deflection.add_linear(c1, c0)
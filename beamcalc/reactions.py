@@ -0,0 +1,166 @@
+"""Support reactions from static equilibrium, or the stiffness method for indeterminate beams."""
+import logging
+
+import numpy as np
+
+from beamcalc.fem import solve_load_cases, solve_support_reactions
+from beamcalc.solvers import MechanismError
+
+logger = logging.getLogger(__name__)
+
+
+class UnsolvableBeamError(ValueError):
+    """Raised when the supports cannot hold the beam in place."""
+
+
+def solve_reactions(supports, point_loads, distributed_loads, moments, beam_length):
+    """Calculate reaction forces and moments at supports.
+
+    The result lists one (position, force) per support sorted by position,
+    followed by one (position, moment) per Fixed support, e.g.
+    [(position, force), (position, moment)] for a cantilever and
+    [(position, force), (position, force)] for a simply supported beam. Moments use
+    the sign convention of the cantilever solver: clockwise positive at x = 0,
+    anticlockwise positive elsewhere. Cantilevers fixed at a beam end and two
+    Hinge/Roller supports are solved by statics; any other stable arrangement
+    (propped cantilevers, fixed-ended and continuous beams) by the direct
+    stiffness method. Unstable supports raise UnsolvableBeamError.
+    """
+    num_supports = len(supports)
+    if num_supports == 1 and supports[0][0] != "Fixed":
+        raise UnsolvableBeamError("Unable to Solve")
+
+    if num_supports == 1 and supports[0][1] in (0, beam_length):
+        support_type, fixed_support_pos = supports[0]
+
+        sum_point_loads = 0
+        sum_dist_loads = 0
+        sum_point_loads_moments = 0
+        sum_dist_loads_moments = 0
+        sum_external_moments = 0
+
+        for position, magnitude in point_loads:
+            sum_point_loads += magnitude
+            sum_point_loads_moments += magnitude * abs(position - fixed_support_pos)
+
+        for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+            sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
+            if end_mag+start_mag != 0 :
+                centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
+                centroid_right = abs(start_pos - end_pos) - centroid_left
+                distance_left = min(start_pos, end_pos)
+                distance_right = beam_length - max(start_pos, end_pos)
+                if fixed_support_pos == 0:
+                    sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
+                else:
+                    sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_right+distance_right)
+
+        for position, magnitude in moments:
+            sum_external_moments += magnitude
+
+        # External moments oppose the fixed end moment at x = 0 and add to it at the far end
+        if fixed_support_pos != 0:
+            sum_external_moments = -sum_external_moments
+
+        reaction_1 = -sum_point_loads - sum_dist_loads
+        moment_1 = sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments
+        return [(fixed_support_pos, reaction_1), (fixed_support_pos, moment_1)]
+
+    elif num_supports == 2 and not any(support_type == "Fixed" for support_type, position in supports):
+        sum_point_loads = 0
+        sum_dist_loads = 0
+        sum_point_loads_moments = 0
+        sum_dist_loads_moments = 0
+        sum_external_moments = 0
+
+        for position, magnitude in point_loads:
+            sum_point_loads += magnitude
+            sum_point_loads_moments += magnitude*(position)
+        for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+            sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
+            if end_mag+start_mag != 0 :
+                centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
+                distance_left = min(start_pos, end_pos)
+                sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
+
+        for position, magnitude in moments:
+            sum_external_moments += magnitude
+
+        support_position = [position for support_type, position in supports]
+        reaction_coefficient_mat = [(1, 1), support_position]
+        constant_mat = [(sum_point_loads + sum_dist_loads), (sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments)]
+
+        try:
+            r1, r2 = -np.linalg.solve(reaction_coefficient_mat, constant_mat)
+        except np.linalg.LinAlgError:
+            raise UnsolvableBeamError("Unable to Solve: Singular Matrix")
+
+        reactions = list(zip(support_position, [r1, r2]))
+        return sorted(reactions, key=lambda x: x[0])
+
+    return solve_indeterminate(supports, point_loads, distributed_loads, moments, beam_length)
+
+
+def _log_stats(stats, num_cases=1):
+    logger.debug("Stiffness solve: %s backend, %d unknowns, %d load cases, %d bytes, %.3f ms",
+                 stats.backend, stats.size, num_cases, stats.nbytes, stats.seconds * 1000)
+
+
+def _stiffness_reactions(supports, forces, couples):
+    """Reactions list in the solve_reactions layout from per-support forces and clockwise couples."""
+    order = sorted(range(len(supports)), key=lambda k: supports[k][1])
+    reactions = [(supports[k][1], float(forces[k])) for k in order]
+    for k in order:
+        support_type, position = supports[k]
+        if support_type == "Fixed":
+            # Clockwise couple on the beam, reported with the fixed end sign convention
+            sign = 1.0 if position == 0 else -1.0
+            reactions.append((position, sign * float(couples[k])))
+    return reactions
+
+
+def solve_indeterminate(supports, point_loads, distributed_loads, moments, beam_length):
+    """Reactions of any stable support arrangement by the direct stiffness method."""
+    if not supports:
+        raise UnsolvableBeamError("Unable to Solve")
+    try:
+        forces, couples, stats = solve_support_reactions(supports, point_loads, distributed_loads, moments, beam_length)
+    except MechanismError:
+        raise UnsolvableBeamError("Unable to Solve: Singular Matrix")
+    _log_stats(stats)
+    return _stiffness_reactions(supports, forces, couples)
+
+
+def is_statically_determinate(supports, beam_length):
+    """True for the arrangements solve_reactions solves by statics."""
+    if len(supports) == 1:
+        return supports[0][0] == "Fixed" and supports[0][1] in (0, beam_length)
+    return len(supports) == 2 and not any(support_type == "Fixed" for support_type, _ in supports)
+
+
+def solve_case_reactions(supports, load_cases, beam_length):
+    """Reactions for several load cases on the same supports, one list per case.
+
+    load_cases holds (point_loads, distributed_loads, moments) per case. Statically
+    determinate beams are solved case by case; indeterminate ones factorize the
+    stiffness matrix once for all cases.
+    """
+    if not load_cases:
+        return []
+    if is_statically_determinate(supports, beam_length) or (len(supports) == 1 and supports[0][0] != "Fixed"):
+        return [solve_reactions(supports, *case, beam_length) for case in load_cases]
+    if not supports:
+        raise UnsolvableBeamError("Unable to Solve")
+    try:
+        forces, couples, stats = solve_load_cases(supports, load_cases, beam_length)
+    except MechanismError:
+        raise UnsolvableBeamError("Unable to Solve: Singular Matrix")
+    _log_stats(stats, len(load_cases))
+    return [_stiffness_reactions(supports, forces[:, k], couples[:, k]) for k in range(len(load_cases))]
+
+
+def split_reactions(supports, reactions):
+    """Separate a reactions list into (support_reactions, support_moments) for the diagrams."""
+    if not reactions:
+        return [], []
+    return list(reactions[:len(supports)]), list(reactions[len(supports):])
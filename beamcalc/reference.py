@@ -0,0 +1,222 @@
+"""Original point-sampled loop implementations, kept to verify the vectorized engine.
+
+Run ``python -m beamcalc.reference`` to compare both engines on the fixed cases below,
+and the virtual work deflection with double integration on the same beams.
+"""
+import numpy as np
+
+from beamcalc import engine
+from beamcalc.analysis import analyse
+from beamcalc.model import BeamModel
+
+
+def shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution):
+    """Calculate shear force along the beam."""
+    shear = [0.0] * (int(beam_length * resolution) + 1)
+    x_coords = np.linspace(0, beam_length, len(shear))
+
+    # Add support reactions to shear force
+    if support_reactions:
+        for position, magnitude in support_reactions:
+            for i, x in enumerate(x_coords):
+                if x >= position:
+                    shear[i] += magnitude
+
+    # Add point loads to the shear force
+    for position, magnitude in point_loads:
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                shear[i] += magnitude
+
+    # Add distributed loads to the shear force
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        for i, x in enumerate(x_coords):
+            if start_pos <= x <= end_pos:
+                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
+                increment = load * (x_coords[1] - x_coords[0])
+                for j, y in enumerate(x_coords):
+                    if y >= x:
+                        shear[j] += increment
+
+    return x_coords, shear
+
+
+def bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
+    """Calculate bending moment along the beam."""
+    bending_moment = [0.0] * (int(beam_length * resolution) + 1)
+    x_coords = np.linspace(0, beam_length, len(bending_moment))
+
+    # Fixed support position
+    fixed_support_pos = 0
+    for support_types, position in supports:
+        if support_types == "Fixed":
+            fixed_support_pos = position
+
+    # Add support reaction moments to bending moment
+    if support_reactions:
+        for position, magnitude in support_reactions:
+            for i, x in enumerate(x_coords):
+                if x >= position:
+                    bending_moment[i] += magnitude * (x - position)
+
+    # Add support moments to bending moment
+    if support_moments:
+        for position, magnitude in support_moments:
+            for i, x in enumerate(x_coords):
+                if x >= position:
+                    if fixed_support_pos == 0:
+                        bending_moment[i] += magnitude
+                    else:
+                        bending_moment[i] -= magnitude
+
+    # Add point loads to the bending moment
+    for position, magnitude in point_loads:
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                bending_moment[i] += magnitude * (x - position)
+
+    # Add distributed loads to the bending moment
+    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+        for i, x in enumerate(x_coords):
+            if start_pos <= x <= end_pos:
+                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
+                increment = load * (x_coords[1] - x_coords[0])
+                for j, y in enumerate(x_coords):
+                    if y >= x:
+                        bending_moment[j] += (y - x) * increment
+
+    # Add external moments
+    for position, magnitude in external_moments:
+        for i, x in enumerate(x_coords):
+            if x >= position:
+                bending_moment[i] += magnitude
+
+    return x_coords, bending_moment
+
+
+REFERENCE_CASES = [
+    {
+        "name": "Cantilever, point load",
+        "supports": [("Fixed", 0.0)],
+        "support_reactions": [(0.0, 10.0)],
+        "support_moments": [(0.0, -50.0)],
+        "point_loads": [(5.0, -10.0)],
+        "distributed_loads": [],
+        "moments": [],
+        "beam_length": 10.0,
+        "resolution": 20,
+    },
+    {
+        "name": "Simply supported, full UDL",
+        "supports": [("Hinge", 0.0), ("Roller", 10.0)],
+        "support_reactions": [(0.0, 25.0), (10.0, 25.0)],
+        "support_moments": [],
+        "point_loads": [],
+        "distributed_loads": [(0.0, 10.0, -5.0, -5.0)],
+        "moments": [],
+        "beam_length": 10.0,
+        "resolution": 10,
+    },
+    {
+        "name": "Simply supported, triangular load, point load and moment",
+        "supports": [("Hinge", 0.0), ("Roller", 8.0)],
+        "support_reactions": [(0.0, 5.5), (8.0, 16.5)],
+        "support_moments": [],
+        "point_loads": [(3.0, -4.0)],
+        "distributed_loads": [(2.0, 8.0, 0.0, -6.0)],
+        "moments": [(5.0, 12.0)],
+        "beam_length": 8.0,
+        "resolution": 25,
+    },
+    {
+        "name": "Cantilever fixed on the right, partial UDL and moment",
+        "supports": [("Fixed", 6.0)],
+        "support_reactions": [(6.0, 9.0)],
+        "support_moments": [(6.0, -26.5)],
+        "point_loads": [],
+        "distributed_loads": [(1.0, 4.0, -3.0, -3.0)],
+        "moments": [(2.0, -5.0)],
+        "beam_length": 6.0,
+        "resolution": 50,
+    },
+    {
+        "name": "Cantilever fixed inside the span, loads either side",
+        "supports": [("Fixed", 4.0)],
+        "support_reactions": [(4.0, 21.0)],
+        "support_moments": [(4.0, 56.0)],
+        "point_loads": [(1.0, -5.0), (9.0, -10.0)],
+        "distributed_loads": [(5.0, 8.0, -2.0, -2.0)],
+        "moments": [(2.0, 6.0)],
+        "beam_length": 10.0,
+        "resolution": 20,
+    },
+    {
+        "name": "Overhanging beam, off-grid loads",
+        "supports": [("Hinge", 2.0), ("Roller", 9.0)],
+        "support_reactions": [(2.0, 7.0), (9.0, 3.0)],
+        "support_moments": [],
+        "point_loads": [(0.55, -3.0), (11.3, -2.0)],
+        "distributed_loads": [(0.0, 12.0, 4.0, -2.0), (3.3, 7.7, -1.5, -1.5)],
+        "moments": [(6.15, 4.0)],
+        "beam_length": 12.0,
+        "resolution": 10,
+    },
+]
+
+
+def check_engine(cases=REFERENCE_CASES):
+    """Compare the vectorized engine with the loop implementation.
+
+    Point terms must agree to rounding error. Distributed loads are a Riemann
+    sum in the loop version, so they may differ by a few grid steps of load.
+    Returns a list of (case name, diagram, max difference, tolerance) failures.
+    """
+    failures = []
+    for case in cases:
+        length, resolution = case["beam_length"], case["resolution"]
+        dx = 1.0 / resolution
+        peak_load = sum(max(abs(w1), abs(w2)) for _, _, w1, w2 in case["distributed_loads"])
+        shear_tol = 3 * dx * peak_load + 1e-9
+        moment_tol = 3 * dx * peak_load * length + 1e-9
+
+        _, ref_shear = shear_force(case["support_reactions"], case["point_loads"], case["distributed_loads"], length, resolution)
+        _, new_shear = engine.shear_force(case["support_reactions"], case["point_loads"], case["distributed_loads"], length, resolution)
+        _, ref_moment = bending_moment(case["supports"], case["support_reactions"], case["support_moments"], case["point_loads"],
+                                       case["distributed_loads"], case["moments"], length, resolution)
+        _, new_moment = engine.bending_moment(case["supports"], case["support_reactions"], case["support_moments"], case["point_loads"],
+                                              case["distributed_loads"], case["moments"], length, resolution)
+
+        for diagram, ref, new, tol in (("shear", ref_shear, new_shear, shear_tol), ("moment", ref_moment, new_moment, moment_tol)):
+            diff = float(np.max(np.abs(np.asarray(ref) - new)))
+            if diff > tol:
+                failures.append((case["name"], diagram, diff, tol))
+    return failures
+
+
+def check_deflection(cases=REFERENCE_CASES):
+    """Compare the virtual work deflection with Simpson double integration.
+
+    The virtual work sum is first order in the grid step, so the two may differ
+    by a few grid steps over the beam length of the peak deflection. Returns
+    (case name, "deflection", max difference, tolerance) failures.
+    """
+    failures = []
+    for case in cases:
+        loads = (case["point_loads"], case["distributed_loads"], case["moments"])
+        deflections = [
+            analyse(BeamModel(case["beam_length"], case["supports"], *loads, resolution=case["resolution"],
+                              deflection_method=method)).deflection
+            for method in ("simpson", "virtual_work")
+        ]
+        diff = float(np.max(np.abs(deflections[0] - deflections[1])))
+        tol = 5 / (case["resolution"] * case["beam_length"]) * float(np.max(np.abs(deflections[0]))) + 1e-12
+        if diff > tol:
+            failures.append((case["name"], "deflection", diff, tol))
+    return failures
+
+
+if __name__ == "__main__":
+    failures = check_engine() + check_deflection()
+    for name, diagram, diff, tol in failures:
+        print(f"FAIL {name} ({diagram}): max difference {diff:.3g} > {tol:.3g}")
+    print(f"{len(REFERENCE_CASES) - len({f[0] for f in failures})}/{len(REFERENCE_CASES)} cases match")
@@ -0,0 +1,213 @@
+"""Fast rendering of the SFD, BMD and deflection diagrams.
+
+DiagramTemplate builds the three-axes figure, its labels and reference lines
+once and afterwards only swaps line data, fills and annotations. Curves are
+min/max decimated to one bucket per pixel column of their axes before plotting,
+so drawing cost no longer grows with the grid resolution, and annotations at
+coinciding positions are drawn once. Axis limits are rounded to tick values, so
+most edits keep them; the rasterised axes, ticks and labels are then reused and
+only the curves, fills and annotations are drawn again. diagram_chart offers an interactive vector
+alternative rendered client side by Vega-Lite.
+
+Matplotlib is imported on first use, never at module import.
+"""
+import io
+from functools import lru_cache
+
+import numpy as np
+
+DIAGRAM_STYLE = "ggplot"
+# Fast zlib level: PNG encoding otherwise dominates the render time of a large figure
+PNG_OPTIONS = {"format": "png", "pil_kwargs": {"compress_level": 1}}
+# Limits snapped to ticks change less often than tight ones, so the cached axes are reused more
+TEMPLATE_RC = {"axes.autolimit_mode": "round_numbers"}
+WATERMARK = "Generated by Md. Asadur Rahman"
+
+# (y label, line colour) of the shear, bending moment and deflection axes
+DIAGRAMS = (
+    ("Shear Force (kN)", "blue"),
+    ("Bending Moment (kNm)", "green"),
+    ("Deflection (mm)", "red"),
+)
+
+
+def decimate_minmax(x_coords, values, max_points):
+    """Reduce a curve to at most about max_points samples, keeping each bucket's min and max.
+
+    Peaks and jumps survive, so the plot looks the same at screen resolution.
+    """
+    x_coords = np.asarray(x_coords)
+    values = np.asarray(values)
+    num_buckets = max_points // 2
+    if num_buckets < 1 or len(values) <= max_points:
+        return x_coords, values
+
+    # Pad with the last value so the samples reshape into equal buckets
+    bucket_len = -(-len(values) // num_buckets)
+    padded = np.pad(values, (0, num_buckets * bucket_len - len(values)), mode="edge").reshape(num_buckets, bucket_len)
+    offsets = np.arange(num_buckets) * bucket_len
+    low_idx = offsets + np.argmin(padded, axis=1)
+    high_idx = offsets + np.argmax(padded, axis=1)
+
+    keep = np.unique(np.concatenate([[0, len(values) - 1], low_idx, high_idx]).clip(0, len(values) - 1))
+    return x_coords[keep], values[keep]
+
+
+def annotation_indices(x_coords, positions):
+    """Grid indices closest to each position, without duplicates.
+
+    At a doubled mesh node the last copy is used, i.e. the value just right of the position.
+    """
+    x_coords = np.asarray(x_coords)
+    idx = np.searchsorted(x_coords, positions, side="right").clip(1, len(x_coords) - 1)
+    left_closer = np.abs(x_coords[idx - 1] - positions) <= np.abs(x_coords[idx] - positions)
+    return sorted(set((idx - left_closer).tolist()))
+
+
+@lru_cache(maxsize=None)
+def pyplot():
+    """matplotlib.pyplot on the non-interactive Agg backend, imported on first call."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+class DiagramTemplate:
+    """Reusable SFD/BMD/deflection figure whose artists are updated in place.
+
+    The figure is a plain matplotlib Figure (no pyplot state), so one template per
+    session can be kept between reruns.
+    """
+
+    def __init__(self, figsize=(12, 15), dpi=100):
+        from matplotlib import style
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        with style.context([DIAGRAM_STYLE, TEMPLATE_RC]):
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.axes = self.fig.subplots(3, 1)
+            self.lines = []
+            for ax, (ylabel, color) in zip(self.axes, DIAGRAMS):
+                # Animated artists are left out of the cached background and drawn over it
+                self.lines.append(ax.plot([], [], color=color, linewidth=2, animated=True)[0])
+                ax.axhline(0, color="black", linewidth=1, linestyle="--")
+                ax.set_ylabel(ylabel, fontsize=12)
+                ax.tick_params(axis="both", which="major", labelsize=10)
+            self.axes[1].set_xlabel("Beam Length (m)", fontsize=12)
+            self.fig.text(0.95, 0.0, WATERMARK, ha="right", va="bottom", fontsize=10, color="black", alpha=0.6)
+            self.fig.subplots_adjust(left=0.08, right=0.97, top=0.98, bottom=0.04, hspace=0.15)
+        self.fills = [None] * len(self.axes)
+        self._annotations = []
+        self._background = None
+        self._limits = None
+
+    def pixel_columns(self, ax):
+        """Width of an axes in pixels."""
+        return max(1, int(ax.get_window_extent().width))
+
+    def update(self, x_coords, shear, bending_moment, deflections, positions, beam_length, peak=None):
+        """Replace the plotted data and annotations.
+
+        peak is the exact (x, shear, moment) of the maximum bending moment; the
+        largest sampled moment is annotated when it is not given.
+        """
+        from matplotlib import style
+
+        with style.context([DIAGRAM_STYLE, TEMPLATE_RC]):
+            for i, (ax, values) in enumerate(zip(self.axes, (shear, bending_moment, deflections))):
+                # A min and a max per pixel column of a uniform grid
+                x_plot, y_plot = decimate_minmax(x_coords, values, 2 * self.pixel_columns(ax))
+                self.lines[i].set_data(x_plot, y_plot)
+                if self.fills[i] is not None:
+                    self.fills[i].remove()
+                self.fills[i] = ax.fill_between(x_plot, y_plot, 0, color=DIAGRAMS[i][1], alpha=0.2, animated=True)
+                ax.relim()
+                ax.autoscale_view(scalex=False)
+                ax.set_xlim([0, beam_length])
+
+            for artist in self._annotations:
+                artist.remove()
+            self._annotations = self._annotate(x_coords, shear, bending_moment, positions, peak)
+            for artist in self._annotations:
+                artist.set_animated(True)
+
+    def _annotate(self, x_coords, shear, bending_moment, positions, peak):
+        ax1, ax2, _ = self.axes
+        artists = []
+
+        # Zero shear position and maximum bending moment
+        if peak is None:
+            max_idx = int(np.argmax(np.abs(bending_moment)))
+            peak = (x_coords[max_idx], shear[max_idx], bending_moment[max_idx])
+        max_x, max_shear, max_moment = peak
+        artists.append(ax1.annotate(
+            f"x={max_x:.2f}", (max_x, max_shear), textcoords="offset points", xytext=(0, 10),
+            ha="center", fontsize=12, arrowprops=dict(facecolor="blue", arrowstyle="->", lw=0.5)))
+        artists.append(ax2.annotate(
+            f"Max M\nx={max_x:.2f}\nM={max_moment:.2f}", (max_x, max_moment),
+            textcoords="offset points", xytext=(10, -20), ha="center", fontsize=12,
+            arrowprops=dict(facecolor="green", arrowstyle="->", lw=0.5)))
+
+        # SF and BM at the key positions, one set of artists per distinct grid point
+        indices = annotation_indices(x_coords, positions)
+        for idx in indices:
+            for ax, values in ((ax1, shear), (ax2, bending_moment)):
+                artists.append(ax.annotate(
+                    f"{values[idx]:.2f}", (x_coords[idx], values[idx]), textcoords="offset points",
+                    xytext=(10, 5), ha="center", fontsize=12, color="brown"))
+        for line_x in {x_coords[idx] for idx in indices} | {max_x}:
+            artists.append(ax1.axvline(x=line_x, color="blue", linestyle="--", linewidth=0.5))
+            artists.append(ax2.axvline(x=line_x, color="green", linestyle="--", linewidth=0.5))
+        return artists
+
+    def to_png(self):
+        """Rasterise the figure at its own dpi, redrawing the axes only when their limits changed."""
+        from PIL import Image
+
+        limits = [(ax.get_xlim(), ax.get_ylim()) for ax in self.axes]
+        if limits != self._limits:
+            self.canvas.draw()
+            self._background = self.canvas.copy_from_bbox(self.fig.bbox)
+            self._limits = limits
+        else:
+            self.canvas.restore_region(self._background)
+        for artist in self.lines + self.fills + self._annotations:
+            self.fig.draw_artist(artist)
+        # The figure is opaque, and RGB encodes faster than RGBA
+        buffer = io.BytesIO()
+        Image.fromarray(np.asarray(self.canvas.buffer_rgba())).convert("RGB").save(buffer, **PNG_OPTIONS["pil_kwargs"],
+                                                                                   format="png")
+        return buffer.getvalue()
+
+
+def figure_png(fig, dpi=100):
+    """Rasterise any figure to PNG bytes."""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, dpi=dpi, **PNG_OPTIONS)
+    return buffer.getvalue()
+
+
+def diagram_chart(x_coords, shear, bending_moment, deflections, max_points=2400):
+    """Interactive Altair chart of the three diagrams, decimated to max_points per curve."""
+    import altair as alt
+    import pandas as pd
+
+    frames = []
+    for (ylabel, color), values in zip(DIAGRAMS, (shear, bending_moment, deflections)):
+        x_plot, y_plot = decimate_minmax(x_coords, values, max_points)
+        frames.append(pd.DataFrame({"x": x_plot, "value": y_plot, "diagram": ylabel}))
+    data = pd.concat(frames, ignore_index=True)
+
+    charts = []
+    for i, (ylabel, color) in enumerate(DIAGRAMS):
+        base = alt.Chart(data).transform_filter(alt.datum.diagram == ylabel)
+        area = base.mark_area(opacity=0.2, color=color).encode(
+            x=alt.X("x:Q", title="Beam Length (m)"), y=alt.Y("value:Q", title=ylabel))
+        line = base.mark_line(color=color).encode(x="x:Q", y="value:Q", tooltip=["x:Q", "value:Q"])
+        charts.append((area + line).properties(height=250).interactive(name=f"zoom{i}", bind_y=False))
+    return alt.vconcat(*charts)
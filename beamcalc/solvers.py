@@ -0,0 +1,164 @@
+"""Linear solver backends for symmetric positive definite banded systems.
+
+The stiffness solver assembles its matrix in LAPACK upper banded storage. Three
+backends solve such a system:
+
+- dense: expands the band into a full matrix and uses a NumPy Cholesky
+  factorization; lowest overhead for small systems and needs no SciPy.
+- banded: scipy.linalg.solveh_banded, O(n * bandwidth^2) time and
+  O(n * bandwidth) memory.
+- sparse: the band as a SciPy CSR matrix factorized by SuperLU, for bands too
+  wide for banded storage to pay off.
+
+select_solver picks one by problem size: dense up to DENSE_LIMIT unknowns, then
+banded while the band is at most BANDED_MAX_BANDWIDTH wide. The beam stiffness
+matrix always has a band of 3, so its large systems go to the banded backend;
+sparse is only chosen automatically for wider bands and is otherwise used by
+passing backend="sparse". Every solve returns SolveStats with the backend used,
+the memory held by the matrix and its factorization, and the wall time.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from beamcalc.lazy import has_module, optional_module
+
+# Systems up to this many unknowns are solved dense
+DENSE_LIMIT = 64
+# Wider bands than this go to the sparse backend
+BANDED_MAX_BANDWIDTH = 64
+
+
+class MechanismError(np.linalg.LinAlgError):
+    """Raised when the supports leave the beam free to move (singular stiffness matrix)."""
+
+
+@dataclass
+class SolveStats:
+    """What a solve cost: backend, number of unknowns, bytes held and seconds taken."""
+
+    backend: str
+    size: int
+    nbytes: int
+    seconds: float
+
+
+def band_to_dense(banded):
+    """Full symmetric matrix from upper banded storage."""
+    bandwidth, size = banded.shape[0] - 1, banded.shape[1]
+    matrix = np.zeros((size, size))
+    for offset in range(bandwidth + 1):
+        diagonal = banded[bandwidth - offset, offset:]
+        idx = np.arange(size - offset)
+        matrix[idx, idx + offset] = diagonal
+        matrix[idx + offset, idx] = diagonal
+    return matrix
+
+
+class LinearSolver:
+    """A backend solving A x = b for A in upper banded storage."""
+
+    name = None
+
+    def available(self):
+        return True
+
+    def _solve(self, banded, rhs):
+        """Return (solution, bytes held by the matrix and its factorization)."""
+        raise NotImplementedError
+
+    def solve(self, banded, rhs):
+        """Return (solution, SolveStats); raises MechanismError for a singular matrix."""
+        if not banded.shape[1]:
+            raise MechanismError("No unknowns to solve for")
+        started = time.perf_counter()
+        try:
+            solution, nbytes = self._solve(banded, rhs)
+        except (np.linalg.LinAlgError, RuntimeError) as error:
+            raise MechanismError(str(error)) from None
+        if not np.all(np.isfinite(solution)):
+            raise MechanismError("Singular matrix")
+        return solution, SolveStats(self.name, banded.shape[1], nbytes, time.perf_counter() - started)
+
+
+class DenseSolver(LinearSolver):
+    name = "dense"
+
+    def _solve(self, banded, rhs):
+        matrix = band_to_dense(banded)
+        lower = np.linalg.cholesky(matrix)
+        solution = np.linalg.solve(lower.T, np.linalg.solve(lower, rhs))
+        return solution, matrix.nbytes + lower.nbytes
+
+
+class BandedSolver(LinearSolver):
+    name = "banded"
+
+    def available(self):
+        return has_module("scipy")
+
+    def _solve(self, banded, rhs):
+        # SciPy is optional and slow to import, so it is loaded by the first solve that needs it
+        scipy_linalg = optional_module("scipy.linalg")
+        # The Cholesky factor overwrites a copy of the band, so memory is twice the band
+        return scipy_linalg.solveh_banded(banded, rhs, check_finite=False), 2 * banded.nbytes
+
+
+class SparseSolver(LinearSolver):
+    name = "sparse"
+
+    def available(self):
+        return has_module("scipy")
+
+    def _solve(self, banded, rhs):
+        scipy_sparse, scipy_sparse_linalg = optional_module("scipy.sparse"), optional_module("scipy.sparse.linalg")
+        bandwidth, size = banded.shape[0] - 1, banded.shape[1]
+        # Diagonals beyond the last row hold only padding when a system is narrower than its band
+        offsets = range(min(bandwidth, size - 1) + 1)
+        upper = [banded[bandwidth - offset, offset:] for offset in offsets]
+        matrix = scipy_sparse.diags(
+            [diagonal for diagonal in upper[:0:-1]] + upper,
+            [-offset for offset in offsets[:0:-1]] + list(offsets),
+            shape=(size, size),
+            format="csr",
+        )
+        matrix.eliminate_zeros()
+        factor = scipy_sparse_linalg.splu(matrix.tocsc())
+        nbytes = matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        # SuperLU keeps values and row indices for every nonzero of L and U
+        nbytes += (factor.L.nnz + factor.U.nnz) * (8 + 4)
+        return factor.solve(rhs), nbytes
+
+
+SOLVERS = {solver.name: solver for solver in (DenseSolver(), BandedSolver(), SparseSolver())}
+
+
+def select_solver(size, bandwidth):
+    """The backend for a system of size unknowns: dense when small, then banded or sparse by band width.
+
+    Sparse only wins for bands wider than BANDED_MAX_BANDWIDTH, which the beam
+    stiffness matrix never has; ask for it by name to use it there.
+    """
+    if size <= DENSE_LIMIT:
+        return SOLVERS["dense"]
+    if bandwidth <= BANDED_MAX_BANDWIDTH and SOLVERS["banded"].available():
+        return SOLVERS["banded"]
+    if SOLVERS["sparse"].available():
+        return SOLVERS["sparse"]
+    return SOLVERS["dense"]
+
+
+def solve_spd_banded(banded, rhs, backend=None):
+    """Solve a symmetric positive definite system in upper banded storage.
+
+    backend names one of SOLVERS; by default select_solver chooses. Returns
+    (solution, SolveStats) and raises MechanismError if the matrix is singular.
+    """
+    if backend is None:
+        solver = select_solver(banded.shape[1], banded.shape[0] - 1)
+    else:
+        solver = SOLVERS[backend]
+        if not solver.available():
+            raise ValueError(f"The {backend} solver needs SciPy")
+    return solver.solve(banded, rhs)
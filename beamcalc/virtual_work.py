@@ -0,0 +1,135 @@
+"""Virtual work deflection kernels for the unit-load moment matrix.
+
+The deflection at point i is -sum_j M[j] * m[i, j] * dx / EI, which is a single
+matrix-vector product over the unit-load moment matrix m. The blocked variant
+consumes row blocks as they are produced so the full matrix never has to exist.
+
+For reference runs too large for RAM the matrix can be stored on disk instead:
+an np.memmap over an anonymous temporary file, filled and read a block of rows
+at a time, which the operating system pages in and out as needed.
+"""
+import tempfile
+
+import numpy as np
+
+from beamcalc import jit
+from beamcalc.engine import beam_grid
+from beamcalc.influence import unit_load_moments
+
+DEFAULT_BLOCK_SIZE = 512
+MATRIX_STORAGE = ("memory", "disk")
+# Values per block of rows written to or read from a disk-backed matrix
+DISK_BLOCK_VALUES = 1 << 22
+
+
+def disk_block_size(num_points):
+    """Rows per block of a disk-backed matrix with num_points columns."""
+    return max(1, DISK_BLOCK_VALUES // num_points)
+
+
+def disk_matrix(shape, directory=None):
+    """Zeroed float64 np.memmap over a temporary file that is deleted once the array is released.
+
+    directory defaults to tempfile's (TMPDIR); on a tmpfs the file would still live in RAM.
+    """
+    with tempfile.TemporaryFile(dir=directory) as backing:
+        # The mapping keeps the unlinked file's pages alive after the handle is closed
+        return np.memmap(backing, dtype=np.float64, mode="w+", shape=shape)
+
+
+def iter_row_blocks(matrix, block_size=DEFAULT_BLOCK_SIZE):
+    """Yield (start_row, rows) slices of a 2-D array."""
+    for start in range(0, matrix.shape[0], block_size):
+        yield start, matrix[start:start + block_size]
+
+
+def _matvec(rows, moment):
+    """rows @ moment, by the compiled kernel when it runs on several threads, else BLAS."""
+    if jit.PARALLEL:
+        return jit.matvec(np.asarray(rows), moment)
+    return np.asarray(rows) @ moment
+
+
+def unit_load_deflection(bending_moment, unit_weight_moments, dx, EI):
+    """Deflection from a full unit-load moment matrix as one matrix-vector product."""
+    moment = np.asarray(bending_moment, dtype=float)
+    return -_matvec(unit_weight_moments, moment) * (dx / EI)
+
+
+def unit_load_deflection_blocked(bending_moment, row_blocks, num_points, dx, EI):
+    """Deflection from (start_row, rows) blocks of the unit-load moment matrix.
+
+    Peak memory is one block of rows plus the output vector.
+    """
+    moment = np.asarray(bending_moment, dtype=float)
+    deflections = np.zeros(num_points)
+    for start, rows in row_blocks:
+        deflections[start:start + len(rows)] = _matvec(rows, moment)
+    deflections *= -dx / EI
+    return deflections
+
+
+def iter_unit_load_moment_blocks(supports, beam_length, resolution, block_size=DEFAULT_BLOCK_SIZE):
+    """Yield (start_row, rows) blocks of the unit weight moment matrix, one block in memory at a time."""
+    x_coords = beam_grid(beam_length, resolution)
+    num_points = len(x_coords)
+
+    for start in range(0, num_points, block_size):
+        # Closed-form influence lines give the bending moment for every unit load position in the block
+        rows = unit_load_moments(supports, x_coords[start:start + block_size], x_coords)
+        yield start, rows
+
+
+def calculate_unit_load_moment(supports, beam_length, resolution, storage="memory", directory=None):
+    """Calculate the unit weight moment (bending moment due to unit load) at each point.
+
+    storage "disk" returns the matrix as an np.memmap in a temporary file under
+    directory (the system default if None), so only one block of rows is in RAM
+    while it is filled.
+    """
+    if storage not in MATRIX_STORAGE:
+        raise ValueError(f"Unknown matrix storage: {storage}")
+    x_coords = beam_grid(beam_length, resolution)
+    num_points = len(x_coords)
+    if storage == "disk":
+        unit_weight_moments = disk_matrix((num_points, num_points), directory)
+        block_size = disk_block_size(num_points)
+    else:
+        unit_weight_moments = np.zeros((num_points, num_points))  # Matrix to store m(x) for each unit load position
+        block_size = DEFAULT_BLOCK_SIZE
+
+    for start in range(0, num_points, block_size):
+        # Each block of rows is computed straight into the matrix
+        unit_load_moments(supports, x_coords[start:start + block_size], x_coords, out=unit_weight_moments[start:start + block_size])
+
+    if storage == "disk":
+        unit_weight_moments.flush()
+    return x_coords, unit_weight_moments
+
+
+def calculate_deflection(x_coords, bending_moment, unit_weight_moments, beam_length, resolution, EI, block_size=None):
+    """Calculate deflection by virtual work, sum of M * m * dx / EI for each unit load position.
+
+    With block_size set, rows of the matrix are multiplied block by block instead of in one product.
+    A disk-backed (np.memmap) matrix is always read in blocks.
+    """
+    num_points = len(x_coords)
+    dx = beam_length / (num_points - 1)
+    if not block_size and isinstance(unit_weight_moments, np.memmap):
+        block_size = disk_block_size(num_points)
+
+    if block_size:
+        deflections = unit_load_deflection_blocked(
+            bending_moment, iter_row_blocks(unit_weight_moments, block_size), num_points, dx, EI
+        )
+    else:
+        deflections = unit_load_deflection(bending_moment, unit_weight_moments, dx, EI)
+
+    return x_coords, deflections
+
+
+def calculate_deflection_streamed(x_coords, bending_moment, supports, beam_length, resolution, EI, block_size=DEFAULT_BLOCK_SIZE):
+    """Calculate the virtual work deflection without ever holding the full unit weight moment matrix."""
+    dx = beam_length / (len(x_coords) - 1)
+    row_blocks = iter_unit_load_moment_blocks(supports, beam_length, resolution, block_size)
+    return x_coords, unit_load_deflection_blocked(bending_moment, row_blocks, len(x_coords), dx, EI)
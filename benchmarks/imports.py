@@ -0,0 +1,86 @@
+"""Cold import time of the compute core, the batch CLI and the Streamlit app.
+
+Every target is imported in a fresh interpreter, so nothing is shared between
+runs, and the median of a few runs is reported together with the heavy optional
+libraries the import pulled in. Importing the app runs its module body but not
+main(), which is what a new Streamlit worker pays before the first rerun.
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --save benchmarks/imports.json
+    python -m benchmarks.imports --compare benchmarks/imports.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    "beamcalc": "import beamcalc",
+    "beamcalc.cli": "import beamcalc.cli",
+    "app": (
+        "import importlib.util; "
+        f"spec = importlib.util.spec_from_file_location('beam_app', {str(ROOT / 'main 1.0.py')!r}); "
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))"
+    ),
+}
+
+# Libraries that should only load on first use
+HEAVY_MODULES = ("scipy", "numba", "pandas", "matplotlib", "pyarrow", "altair", "PIL")
+
+DEFAULT_THRESHOLD = 0.25
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+seconds = time.perf_counter() - started
+print(json.dumps({{"seconds": seconds, "loaded": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def time_import(code, repeat=5):
+    """Median seconds of repeat cold imports and the heavy modules they loaded."""
+    probe = _PROBE.format(code=code, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return {"seconds": statistics.median(run["seconds"] for run in runs), "loaded": runs[-1]["loaded"]}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.imports", description="Measure cold import times.")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per target (default 5)")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a stored run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.25)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = {}
+    for name, code in TARGETS.items():
+        results[name] = time_import(code, args.repeat)
+        loaded = ", ".join(results[name]["loaded"]) or "none"
+        print(f"{name}: {results[name]['seconds'] * 1e3:.0f} ms (heavy modules loaded: {loaded})")
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+    if not args.compare:
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    regressions = [name for name, result in results.items()
+                   if name in baseline and result["seconds"] > baseline[name]["seconds"] * (1 + args.threshold)]
+    for name in regressions:
+        print(f"REGRESSION {name}: {baseline[name]['seconds'] * 1e3:.0f} ms -> {results[name]['seconds'] * 1e3:.0f} ms")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,232 @@
+"""Benchmarks of every analysis stage across beam sizes, load counts and resolutions.
+
+Each scenario is a cantilever or simply supported beam with a reproducible random
+mix of point loads, distributed loads and moments. For every stage the harness
+records the best wall time of a few runs and, in one extra run under tracemalloc,
+the peak memory the stage allocates (NumPy reports its arrays to tracemalloc).
+
+    python -m benchmarks.stages --save benchmarks/baseline.json
+    python -m benchmarks.stages --compare benchmarks/baseline.json
+    python -m benchmarks.stages --quick -k simply_supported --no-plots
+
+--compare prints every stage that got slower or hungrier than the stored run by
+more than the thresholds and exits with status 1 if there is any. Timings only
+compare meaningfully on the same machine; save a baseline there first.
+"""
+import argparse
+import datetime
+import importlib.util
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from beamcalc.analysis import compute_reactions
+from beamcalc.deflection import integrate_deflection
+from beamcalc.engine import bending_moment, shear_force
+from beamcalc.model import BeamModel
+from beamcalc.reactions import split_reactions
+from beamcalc.render import pyplot
+from beamcalc.virtual_work import calculate_deflection, calculate_unit_load_moment
+
+APP_PATH = Path(__file__).resolve().parent.parent / "main 1.0.py"
+
+SUPPORT_LAYOUTS = ("cantilever", "simply_supported")
+LOAD_COUNTS = (1, 10, 100, 1000)
+RESOLUTIONS = (10, 100, 1000)
+BEAM_LENGTHS = (10.0, 100.0)
+QUICK_LOAD_COUNTS = (1, 100)
+QUICK_RESOLUTIONS = (10, 100)
+
+# The O(N^2) unit-load matrix is only benchmarked up to this many grid points (about 800 MB)
+MAX_MATRIX_POINTS = 10001
+
+# A stage regresses when it is this much slower or larger than the baseline, beyond the noise floors
+DEFAULT_TIME_THRESHOLD = 0.25
+DEFAULT_MEMORY_THRESHOLD = 0.10
+TIME_FLOOR = 1e-3
+MEMORY_FLOOR = 1 << 20
+
+
+def scenario_name(layout, beam_length, resolution, num_loads):
+    return f"{layout}-L{beam_length:g}-r{resolution}-n{num_loads}"
+
+
+def build_model(layout, beam_length, resolution, num_loads, seed=0):
+    """BeamModel of a scenario; half the loads are point loads, a quarter each distributed loads and moments."""
+    rng = np.random.default_rng(seed)
+    supports = [("Fixed", 0.0)] if layout == "cantilever" else [("Hinge", 0.0), ("Roller", beam_length)]
+    num_distributed = num_loads // 4
+    num_moments = num_loads // 4
+    num_point = num_loads - num_distributed - num_moments
+    point_loads = [(p, -m) for p, m in zip(rng.uniform(0, beam_length, num_point), rng.uniform(1, 50, num_point))]
+    ends = np.sort(rng.uniform(0, beam_length, (num_distributed, 2)), axis=1)
+    magnitudes = -rng.uniform(1, 20, (num_distributed, 2))
+    distributed_loads = [(a, b, w1, w2) for (a, b), (w1, w2) in zip(ends, magnitudes)]
+    moments = [(p, m) for p, m in zip(rng.uniform(0, beam_length, num_moments), rng.uniform(-30, 30, num_moments))]
+    return BeamModel(beam_length, supports, point_loads, distributed_loads, moments, resolution=resolution,
+                     name=scenario_name(layout, beam_length, resolution, num_loads))
+
+
+def scenarios(quick=False, pattern=None):
+    """(name, model) of every scenario whose name contains pattern."""
+    load_counts = QUICK_LOAD_COUNTS if quick else LOAD_COUNTS
+    resolutions = QUICK_RESOLUTIONS if quick else RESOLUTIONS
+    for layout, beam_length, resolution, num_loads in itertools.product(SUPPORT_LAYOUTS, BEAM_LENGTHS, resolutions, load_counts):
+        name = scenario_name(layout, beam_length, resolution, num_loads)
+        if pattern is None or pattern in name:
+            yield name, build_model(layout, beam_length, resolution, num_loads)
+
+
+def load_app():
+    """The Streamlit app module, for its draw_beam and plot_sfd_bmd; None if it cannot be imported."""
+    try:
+        spec = importlib.util.spec_from_file_location("beam_app", APP_PATH)
+        app = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(app)
+    except ImportError:
+        return None
+    return app
+
+
+def stage_calls(model, app=None):
+    """(stage name, zero-argument callable) of every stage, each fed the previous stages' outputs."""
+    reactions = compute_reactions(model)
+    support_reactions, support_moments = split_reactions(model.supports, reactions)
+    loads = (model.point_loads, model.distributed_loads, model.moments)
+    L, resolution = model.beam_length, model.resolution
+    x_coords, shear = shear_force(support_reactions, model.point_loads, model.distributed_loads, L, resolution)
+    _, moment = bending_moment(model.supports, support_reactions, support_moments, *loads, L, resolution)
+    _, deflection = integrate_deflection(x_coords, moment, model.supports, model.EI)
+
+    calls = [
+        ("reactions", lambda: compute_reactions(model)),
+        ("shear_force", lambda: shear_force(support_reactions, model.point_loads, model.distributed_loads, L, resolution)),
+        ("bending_moment", lambda: bending_moment(model.supports, support_reactions, support_moments, *loads, L, resolution)),
+        ("integrate_deflection", lambda: integrate_deflection(x_coords, moment, model.supports, model.EI)),
+    ]
+    if len(x_coords) <= MAX_MATRIX_POINTS:
+        _, unit_weight_moments = calculate_unit_load_moment(model.supports, L, resolution)
+        calls += [
+            ("calculate_unit_load_moment", lambda: calculate_unit_load_moment(model.supports, L, resolution)),
+            ("calculate_deflection", lambda: calculate_deflection(x_coords, moment, unit_weight_moments, L, resolution, model.EI)),
+        ]
+    if app is not None:
+        def draw_beam():
+            fig, _ = app.draw_beam(L, model.supports, *loads)
+            pyplot().close(fig)
+
+        positions = sorted({0.0, L} | {position for _, position in model.supports})
+        calls += [
+            ("draw_beam", draw_beam),
+            ("plot_sfd_bmd", lambda: app.plot_sfd_bmd(x_coords, shear, moment, deflection, positions, L)),
+        ]
+    return calls
+
+
+def measure(call, repeat):
+    """Best and median wall time of repeat runs, and the peak traced memory of one more."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": min(times), "median_seconds": statistics.median(times), "peak_bytes": peak}
+
+
+def run(quick=False, pattern=None, repeat=3, plots=True, progress=None):
+    """Benchmark results as a JSON-ready dict of environment and per-scenario, per-stage measurements."""
+    app = load_app() if plots else None
+    results = {}
+    for name, model in scenarios(quick, pattern):
+        results[name] = {
+            "num_points": model.num_points,
+            "stages": {stage: measure(call, repeat) for stage, call in stage_calls(model, app)},
+        }
+        if progress:
+            progress(name, results[name])
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(current, baseline, time_threshold=DEFAULT_TIME_THRESHOLD, memory_threshold=DEFAULT_MEMORY_THRESHOLD):
+    """(scenario, stage, metric, baseline value, current value) of every regression against a stored run.
+
+    Only scenarios and stages present in both runs are compared.
+    """
+    regressions = []
+    for name, result in current["results"].items():
+        stored = baseline["results"].get(name)
+        if stored is None:
+            continue
+        for stage, values in result["stages"].items():
+            before = stored["stages"].get(stage)
+            if before is None:
+                continue
+            for metric, threshold, floor in (("seconds", time_threshold, TIME_FLOOR),
+                                             ("peak_bytes", memory_threshold, MEMORY_FLOOR)):
+                if values[metric] > before[metric] * (1 + threshold) and values[metric] - before[metric] > floor:
+                    regressions.append((name, stage, metric, before[metric], values[metric]))
+    return regressions
+
+
+def _format(metric, value):
+    return f"{value * 1e3:.2f} ms" if metric == "seconds" else f"{value / 2 ** 20:.1f} MB"
+
+
+def _print_progress(name, result):
+    cells = ", ".join(f"{stage} {_format('seconds', values['seconds'])}" for stage, values in result["stages"].items())
+    print(f"{name} ({result['num_points']} points): {cells}", file=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.stages", description="Benchmark the analysis stages.")
+    parser.add_argument("--quick", action="store_true", help="only the smaller load counts and resolutions")
+    parser.add_argument("-k", dest="pattern", help="only scenarios whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage (default 3)")
+    parser.add_argument("--no-plots", action="store_true", help="skip the draw_beam and plot_sfd_bmd stages")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="JSON results of a stored run to check for regressions")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="relative peak memory growth that counts as a regression (default 0.10)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    current = run(args.quick, args.pattern, args.repeat, not args.no_plots, progress=_print_progress)
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+    if not args.compare:
+        return 0
+
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+    regressions = compare(current, baseline, args.time_threshold, args.memory_threshold)
+    for name, stage, metric, before, after in regressions:
+        print(f"REGRESSION {name} {stage}: {_format(metric, before)} -> {_format(metric, after)}")
+    print(f"{len(regressions)} regressions against {args.compare} ({baseline.get('created', 'unknown date')})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,93 @@
+import tempfile
+
 import streamlit as st
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.image as mpimg
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+
+from beamcalc.analysis import (
+    compute_deflection,
+    changed_stages,
+    compute_diagrams,
+    compute_polynomials,
+    compute_reactions,
+    compute_unit_load_moments,
+)
+from beamcalc.cache import ANALYSIS_CACHE, canonical_key
+from beamcalc.cost import DEFAULT_MAX_BYTES, DEFAULT_MAX_SECONDS, estimate_cost
+from beamcalc.diagnostics import StageTimer
+from beamcalc.export import DIAGRAM_COLUMNS, EXPORT_FORMATS, estimate_export_bytes, export_diagrams, export_matrix
+from beamcalc.icons import ICON_ZOOMS, ICONS
+from beamcalc.incremental import IncrementalAnalysis
+from beamcalc.loadtable import LOAD_TABLE_COLUMNS, clean_load_rows, loads_to_csv, parse_load_csv
+from beamcalc.model import AnalysisResult, BeamModel
+from beamcalc.reactions import UnsolvableBeamError
+from beamcalc.lazy import has_module
+from beamcalc.render import DiagramTemplate, annotation_indices, diagram_chart, figure_png, pyplot
+from beamcalc.virtual_work import DEFAULT_BLOCK_SIZE, disk_block_size, iter_row_blocks
+
+DEFLECTION_METHODS = {
+    "Double integration (trapezoid)": "trapezoid",
+    "Double integration (Simpson)": "simpson",
+    "Virtual work (reference)": "virtual_work",
+}
+
+# Adaptive places nodes at every load and support and refines only where the diagrams curve
+MESH_TYPES = {
+    "Uniform": "uniform",
+    "Adaptive (load-aware)": "adaptive",
+}
+
+# On disk keeps the O(N^2) virtual work matrix in a memory-mapped temporary file, for very fine reference runs
+MATRIX_STORAGE_TYPES = {
+    "In memory": "memory",
+    "On disk (memory-mapped)": "disk",
+}
+
+LOAD_INPUT_MODES = ["Per load", "Table"]
+
+# Batched collects edits in a form and only analyses when "Analyse" is pressed, instead of on every change
+INPUT_MODES = ["Live", "Batched"]
+
+# Above these counts the beam sketch drops its per-load labels and the diagrams only annotate the supports
+SKETCH_LABEL_LIMIT = 30
+MAX_ANNOTATED_POSITIONS = 40
+
+# Fast reuses one figure per session and decimates curves; Interactive draws vector charts in the browser
+RENDER_MODES = ["Fast", "Standard", "Interactive"]
 
 def setup_page():
     """Set up the Streamlit page configuration."""
     st.set_page_config(layout="wide")
     st.title("Beam SFD, BMD & Deflection Calculator")
 
+def load_table_editor(kind, title, beam_length, download=True):
+    """Editable table of one load kind, optionally filled from an uploaded CSV; returns load tuples."""
+    import pandas as pd
+
+    columns = LOAD_TABLE_COLUMNS[kind]
+    uploaded = st.file_uploader(f"{title} CSV ({', '.join(columns)})", type="csv", key=f"{kind}_csv")
+    rows = []
+    if uploaded is not None:
+        try:
+            rows = parse_load_csv(uploaded.getvalue().decode("utf-8"), kind, beam_length)
+        except (UnicodeDecodeError, ValueError) as error:
+            st.error(f"{title} CSV: {error}")
+    # A new upload starts a new editor, replacing the rows edited so far
+    edited = st.data_editor(
+        pd.DataFrame(rows, columns=list(columns), dtype=float),
+        num_rows="dynamic",
+        hide_index=True,
+        key=f"{kind}_table_{uploaded.file_id if uploaded is not None else ''}",
+    )
+    try:
+        loads = clean_load_rows(edited.itertuples(index=False), kind, beam_length)
+    except ValueError as error:
+        st.error(f"{title}: {error}")
+        return []
+    # Download buttons are not allowed inside a form
+    if download:
+        st.download_button(f"Download {title.lower()} CSV", loads_to_csv(loads, kind), file_name=f"{kind}.csv", key=f"{kind}_download")
+    return loads
+
 def get_beam_inputs():
     """Collect beam input parameters from the user."""
     col_a, col_b = st.columns([2, 3.6])
@@ -30,151 +108,219 @@ def get_beam_inputs():
             </style>
         """, unsafe_allow_html=True)
 
-        tab1, tab2, tab3, tab4 = st.tabs([" Length ", " Supports ", " Loads ", " Moments "])
-        
-        # Tab 1: Length
-        with tab1:
-            beam_length = st.number_input("Beam Length (m)", min_value=1.0, max_value=100.0, value=10.0, step=0.1, key="length")
-
-        # Tab 2: Supports
-        with tab2:
-            support_types = ["Fixed", "Hinge", "Roller"]
-            num_supports = st.number_input('Number of Supports', min_value=1, max_value=2, value=1)
-            supports = []
-            for i in range(int(num_supports)):
-                col1, col2 = st.columns(2)
-                with col1:
-                    support_type = st.selectbox(
-                        f"Support {i+1} type:",
-                        support_types,
-                        index=0,
-                        key=f"support_type_{i}"
-                    )
-                with col2:
-                    position = st.number_input(
-                        f'Position of support {i+1} (m from left):',
-                        min_value=0.0,
-                        max_value=beam_length,
-                        value=0.0 if i == 0 else beam_length,
-                        step=1.0,
-                        key=f"support_pos_{i}"
-                    )
-                supports.append((support_type, position))
-        
-        # Tab 3: Loads
-        with tab3:
-            st.write("#### Define Point Loads")
+        input_mode = st.radio("Input mode", INPUT_MODES, horizontal=True, key="input_mode")
+        batched = input_mode == "Batched"
+        inputs = st.form("beam_inputs", border=False) if batched else st.container()
+        # In a form the widgets only hand their values over, and rerun the app, on submit
+        with inputs:
+            beam_inputs = get_beam_tabs(batched)
+            if batched:
+                st.form_submit_button("Analyse", type="primary")
+
+    return *beam_inputs, col_b
+
+def get_beam_tabs(batched=False):
+    """Length, supports, loads and moments tabs, and the analysis settings tab when batched."""
+    tab1, tab2, tab3, tab4, *analysis_tab = st.tabs(
+        [" Length ", " Supports ", " Loads ", " Moments "] + ([" Analysis "] if batched else [])
+    )
+    
+    # Tab 1: Length
+    with tab1:
+        beam_length = st.number_input("Beam Length (m)", min_value=1.0, value=10.0, step=0.1, key="length")
+
+    # Tab 2: Supports
+    with tab2:
+        support_types = ["Fixed", "Hinge", "Roller"]
+        # Any stable arrangement solves: cantilevers, propped, fixed-ended and continuous beams
+        num_supports = st.number_input('Number of Supports', min_value=1, value=1, key="num_supports")
+        supports = []
+        for i in range(int(num_supports)):
+            col1, col2 = st.columns(2)
+            with col1:
+                support_type = st.selectbox(
+                    f"Support {i+1} type:",
+                    support_types,
+                    index=0,
+                    key=f"support_type_{i}"
+                )
+            with col2:
+                position = st.number_input(
+                    f'Position of support {i+1} (m from left):',
+                    min_value=0.0,
+                    max_value=beam_length,
+                    value=beam_length * i / max(int(num_supports) - 1, 1),
+                    step=1.0,
+                    key=f"support_pos_{i}"
+                )
+            supports.append((support_type, position))
+    
+    # Tab 3: Loads
+    with tab3:
+        # The table accepts hundreds of loads, pasted from a spreadsheet or uploaded as CSV
+        load_input = st.radio("Load input", LOAD_INPUT_MODES, horizontal=True, key="load_input_mode")
+        st.write("#### Define Point Loads")
+        if load_input == "Table":
+            point_loads = load_table_editor("point_loads", "Point loads", beam_length, download=not batched)
+            num_point_loads = 0
+        else:
             num_point_loads = st.number_input(
                 'Number of Point Loads',
                 min_value=0,
-                max_value=15,
-                value=0
+                value=0,
+                key="num_point_loads"
             )
             point_loads = []
-            for i in range(int(num_point_loads)):
-                col1, col2, col3 = st.columns([3, 2.5, 1])
-                with col1:
-                    position = st.number_input(
-                        f"Point Load {i+1} position (m from left):",
-                        min_value=0.0,
-                        max_value=beam_length,
-                        value=0.0,
-                        step=1.0,
-                        key=f"point_load_pos_{i}"
-                    )
-                with col2:
-                    magnitude = st.number_input(
-                        f"Point Load {i+1} magnitude (kN):",
-                        value=0.0,
-                        step=0.5,
-                        key=f"point_load_mag_{i}"
-                    )
-                with col3:
+        for i in range(int(num_point_loads)):
+            col1, col2, col3 = st.columns([3, 2.5, 1])
+            with col1:
+                position = st.number_input(
+                    f"Point Load {i+1} position (m from left):",
+                    min_value=0.0,
+                    max_value=beam_length,
+                    value=0.0,
+                    step=1.0,
+                    key=f"point_load_pos_{i}"
+                )
+            with col2:
+                magnitude = st.number_input(
+                    f"Point Load {i+1} magnitude (kN):",
+                    value=0.0,
+                    step=0.5,
+                    key=f"point_load_mag_{i}"
+                )
+            # Plain buttons are not allowed inside a form; type the sign there
+            with col3:
+                if not batched:
                     upward_arrow = st.button("⬆️", key=f"upward_arrow_{i}")
                     downward_arrow = st.button("⬇️", key=f"downward_arrow_{i}")
                     if upward_arrow:
                         magnitude = abs(magnitude)
                     elif downward_arrow:
                         magnitude = -abs(magnitude)
-                point_loads.append((position, magnitude))
-            
-            st.write("#### Define Distributed Loads")
+            point_loads.append((position, magnitude))
+        
+        st.write("#### Define Distributed Loads")
+        if load_input == "Table":
+            distributed_loads = load_table_editor("distributed_loads", "Distributed loads", beam_length, download=not batched)
+            num_distributed_loads = 0
+        else:
             num_distributed_loads = st.number_input(
                 "Number of Distributed Loads",
                 min_value=0,
-                max_value=3,
-                value=0
+                value=0,
+                key="num_distributed_loads"
             )
             distributed_loads = []
-            for i in range(int(num_distributed_loads)):
-                st.divider()
-                col1, col2 = st.columns(2)
-                with col1:
-                    start_pos = st.number_input(
-                        f"Distributed Load {i+1} starting position (m from left):",
-                        min_value=0.0,
-                        max_value=beam_length,
-                        value=0.0,
-                        step=1.0,
-                        key=f"dist_load_start_{i}"
-                    )
-                    start_mag = st.number_input(
-                        f"Distributed Load {i+1} start magnitude (kN/m):",
-                        value=0.0,
-                        step=0.5,
-                        key=f"dist_load_start_mag_{i}"
-                    )
-                with col2:
-                    end_pos = st.number_input(
-                        f"Distributed Load {i+1} ending position (m from left):",
-                        min_value=0.0,
-                        max_value=beam_length,
-                        value=beam_length,
-                        step=1.0,
-                        key=f"dist_load_end_{i}"
-                    )
-                    end_mag = st.number_input(
-                        f"Distributed Load {i+1} end magnitude (kN/m):",
-                        value=start_mag,
-                        step=0.5,
-                        key=f"dist_load_end_mag_{i}"
-                    )
-                distributed_loads.append((start_pos, end_pos, start_mag, end_mag))
-        
-        # Tab 4: Moments
-        with tab4:
-            st.write("#### Define Moments")
+        for i in range(int(num_distributed_loads)):
+            st.divider()
+            col1, col2 = st.columns(2)
+            with col1:
+                start_pos = st.number_input(
+                    f"Distributed Load {i+1} starting position (m from left):",
+                    min_value=0.0,
+                    max_value=beam_length,
+                    value=0.0,
+                    step=1.0,
+                    key=f"dist_load_start_{i}"
+                )
+                start_mag = st.number_input(
+                    f"Distributed Load {i+1} start magnitude (kN/m):",
+                    value=0.0,
+                    step=0.5,
+                    key=f"dist_load_start_mag_{i}"
+                )
+            with col2:
+                end_pos = st.number_input(
+                    f"Distributed Load {i+1} ending position (m from left):",
+                    min_value=0.0,
+                    max_value=beam_length,
+                    value=beam_length,
+                    step=1.0,
+                    key=f"dist_load_end_{i}"
+                )
+                end_mag = st.number_input(
+                    f"Distributed Load {i+1} end magnitude (kN/m):",
+                    value=start_mag,
+                    step=0.5,
+                    key=f"dist_load_end_mag_{i}"
+                )
+            distributed_loads.append((start_pos, end_pos, start_mag, end_mag))
+    
+    # Tab 4: Moments
+    with tab4:
+        st.write("#### Define Moments")
+        if load_input == "Table":
+            moments = load_table_editor("moments", "Moments", beam_length, download=not batched)
+            num_moments = 0
+        else:
             num_moments = st.number_input(
                 "Number of Moments:",
                 min_value=0,
-                max_value=3,
-                value=0
+                value=0,
+                key="num_moments"
             )
             moments = []
-            for i in range(int(num_moments)):
-                col1, col2 = st.columns(2)
-                with col1:
-                    moment_position = st.number_input(
-                        f"Moment {i+1} position (m from left):",
-                        min_value=0.0,
-                        max_value=beam_length,
-                        value=0.0,
-                        step=1.0,
-                        key=f"moment_pos_{i}"
-                    )
-                with col2:
-                    moment_magnitude = st.number_input(
-                        f"Moment {i+1} magnitude (kNm):",
-                        value=0.0,
-                        step=1.0,
-                        key=f"moment_mag_{i}"
-                    )
-                moments.append((moment_position, moment_magnitude))
-    
-    return beam_length, supports, point_loads, distributed_loads, moments, col_b
+        for i in range(int(num_moments)):
+            col1, col2 = st.columns(2)
+            with col1:
+                moment_position = st.number_input(
+                    f"Moment {i+1} position (m from left):",
+                    min_value=0.0,
+                    max_value=beam_length,
+                    value=0.0,
+                    step=1.0,
+                    key=f"moment_pos_{i}"
+                )
+            with col2:
+                moment_magnitude = st.number_input(
+                    f"Moment {i+1} magnitude (kNm):",
+                    value=0.0,
+                    step=1.0,
+                    key=f"moment_mag_{i}"
+                )
+            moments.append((moment_position, moment_magnitude))
+
+    settings = None
+    if batched:
+        with analysis_tab[0]:
+            settings = analysis_settings(st.container(), st.container(), batched=True)
+    return beam_length, supports, point_loads, distributed_loads, moments, settings
+
+def draw_loads_compact(ax, point_loads, distributed_loads, moments):
+    """Draw many loads as a few collections: point load lines, distributed load areas and moment markers."""
+    from matplotlib.collections import PolyCollection
+
+    if point_loads:
+        positions, magnitudes = np.array(point_loads, dtype=float).T
+        scale = max(np.abs(magnitudes).max(), 1e-12)
+        direction = np.sign(magnitudes)
+        length = direction * np.maximum(0.3, np.abs(magnitudes) / scale * 8)
+        ax.vlines(positions, -2.2 * direction, -length, colors='red', lw=1)
+        for sign, marker in ((1, '^'), (-1, 'v')):
+            ax.scatter(positions[direction == sign], -2.2 * direction[direction == sign], marker=marker, c='red', s=12)
+    if distributed_loads:
+        loads = np.array(distributed_loads, dtype=float)
+        scale = max(np.abs(loads[:, 2:]).max(), 1e-12)
+        # Downward loads stand on top of the beam and upward ones hang below it
+        signs = np.sign(loads[:, 2:])
+        heights = -signs * np.maximum(0.3, np.abs(loads[:, 2:]) / scale * 8)
+        bases = np.where(signs > 0, -1.0, 1.0)
+        polygons = [[(start, b1), (start, h1), (end, h2), (end, b2)]
+                    for (start, end, _, _), (h1, h2), (b1, b2) in zip(loads, heights * (signs != 0), bases)]
+        ax.add_collection(PolyCollection(polygons, facecolors='green', edgecolors='green', alpha=0.3))
+    if moments:
+        positions, magnitudes = np.array(moments, dtype=float).T
+        ax.scatter(positions[magnitudes > 0], np.zeros(np.count_nonzero(magnitudes > 0)), marker=r'$\circlearrowright$', c='black', s=120)
+        ax.scatter(positions[magnitudes < 0], np.zeros(np.count_nonzero(magnitudes < 0)), marker=r'$\circlearrowleft$', c='black', s=120)
 
 def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
     """Draw the beam diagram with supports, loads, and moments."""
+    from matplotlib.offsetbox import AnnotationBbox
+
+    plt = pyplot()
+    # Per-load labels and dimensions would only overlap on a heavily loaded beam
+    labelled = len(point_loads) + len(distributed_loads) + len(moments) <= SKETCH_LABEL_LIMIT
     fig, ax = plt.subplots(figsize=(12, 4))
     ax.plot([0, beam_length], [1, 1], 'b-', lw=2)
     ax.plot([0, beam_length], [-1, -1], 'b-', lw=2)
@@ -193,37 +339,31 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
         alpha=0.7
     )
 
-    # Support icons
-    fixed_left_icon_path = 'src/icons/fixed_support_left.png'
-    fixed_right_icon_path = 'src/icons/fixed_support_right.png'
-    hinge_icon_path = 'src/icons/hinge_support.png'
-    roller_icon_path = 'src/icons/roller_support.png'
-
-    hinge_icon = mpimg.imread(hinge_icon_path)
-    fixed_icon_left = mpimg.imread(fixed_left_icon_path)
-    fixed_icon_right = mpimg.imread(fixed_right_icon_path)
-    roller_icon = mpimg.imread(roller_icon_path)
-
+    # Support icons, decoded once per process
     for support_type, position in supports:
         if support_type == "Fixed":
             if position == beam_length:
-                imagebox = OffsetImage(fixed_icon_right, zoom=0.5)
+                imagebox = ICONS.offset_image("fixed_right", ICON_ZOOMS["fixed_right"])
             else:
-                imagebox = OffsetImage(fixed_icon_left, zoom=0.5)
+                imagebox = ICONS.offset_image("fixed_left", ICON_ZOOMS["fixed_left"])
             ab = AnnotationBbox(imagebox, (position, 0), frameon=False)
             ax.add_artist(ab)
         elif support_type == "Hinge":
-            imagebox = OffsetImage(hinge_icon, zoom=0.3)
+            imagebox = ICONS.offset_image("hinge", ICON_ZOOMS["hinge"])
             ab = AnnotationBbox(imagebox, (position, -1.8), frameon=False)
             ax.add_artist(ab)
         elif support_type == "Roller":
-            imagebox = OffsetImage(roller_icon, zoom=0.3)
+            imagebox = ICONS.offset_image("roller", ICON_ZOOMS["roller"])
             ab = AnnotationBbox(imagebox, (position, -1.8), frameon=False)
             ax.add_artist(ab)
 
+    # Heavily loaded beams are drawn with one collection per load kind instead of artists per load
+    if not labelled:
+        draw_loads_compact(ax, point_loads, distributed_loads, moments)
+
     # Point Loads
     max_magnitude = max((abs(mag) for _, mag in point_loads), default=0)
-    for position, magnitude in point_loads:
+    for position, magnitude in (point_loads if labelled else []):
         if max_magnitude == 0:
             continue
         direction = 1 if magnitude > 0 else (-1 if magnitude < 0 else 0)
@@ -243,11 +383,12 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
         line_length = direction * max(0.3, (abs(magnitude) / max_magnitude) * 8)
         ax.plot([position, position], [start_y, -line_length], 'r-', lw=1.5)
         point_loads_text = -line_length - 1 if magnitude > 0 else -line_length + 0.05
-        ax.text(position, point_loads_text, f'{abs(magnitude)} kN', color='red', ha='center')
+        if labelled:
+            ax.text(position, point_loads_text, f'{abs(magnitude)} kN', color='red', ha='center')
 
     # Distributed Loads
     max_dist_magnitude = max((abs(mag) for _, _, mag1, mag2 in distributed_loads for mag in [mag1, mag2]), default=0)
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
+    for start_pos, end_pos, start_mag, end_mag in (distributed_loads if labelled else []):
         if max_dist_magnitude == 0:
             continue
         start_direction = 1 if start_mag > 0 else (-1 if start_mag < 0 else 0)
@@ -283,7 +424,7 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
         x_coords = [start_pos, start_pos, end_pos, end_pos]
         y_coords = [-start_line_length if start_direction != 0 else 0, -1 if start_direction > 0 else 1, -1 if end_direction > 0 else 1, -end_line_length if end_direction != 0 else 0]
         ax.fill(x_coords, y_coords, color='green', alpha=0.3)
-        if start_direction != 0:
+        if labelled and start_direction != 0:
             start_pos_text = -start_line_length - 1 if start_mag > 0 else -start_line_length + 0.03
             ax.text(
                 start_pos,
@@ -292,7 +433,7 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
                 color='green',
                 ha='center'
             )
-        if end_direction != 0:
+        if labelled and end_direction != 0:
             end_pos_text = -end_line_length - 1 if end_mag > 0 else -end_line_length + 0.03
             ax.text(
                 end_pos,
@@ -303,21 +444,19 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
             )
 
     # Moments
-    clockwise_moment_icon_path = 'src/icons/moment_clockwise.png'
-    anticlockwise_moment_icon_path = 'src/icons/moment_anticlockwise.png'
-    clockwise_moment_icon = mpimg.imread(clockwise_moment_icon_path)
-    anticlockwise_moment_icon = mpimg.imread(anticlockwise_moment_icon_path)
-    for moment_position, moment_magnitude in moments:
+    for moment_position, moment_magnitude in (moments if labelled else []):
         if moment_magnitude > 0:
-            imagebox = OffsetImage(clockwise_moment_icon, zoom=0.13)
+            imagebox = ICONS.offset_image("moment_clockwise", ICON_ZOOMS["moment_clockwise"])
             ab = AnnotationBbox(imagebox, (moment_position, 0.0), frameon=False)
             ax.add_artist(ab)
-            ax.text(moment_position, 4, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
+            if labelled:
+                ax.text(moment_position, 4, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
         elif moment_magnitude < 0:
-            imagebox = OffsetImage(anticlockwise_moment_icon, zoom=0.13)
+            imagebox = ICONS.offset_image("moment_anticlockwise", ICON_ZOOMS["moment_anticlockwise"])
             ab = AnnotationBbox(imagebox, (moment_position, 0), frameon=False)
             ax.add_artist(ab)
-            ax.text(moment_position, 4, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
+            if labelled:
+                ax.text(moment_position, 4, f'{abs(moment_magnitude)} kNm', color='black', ha='center')
 
     # Positions for dimensioning
     positions = []
@@ -333,8 +472,8 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
     # Dimension lines
     ax.plot([0, beam_length], [-12, -12], '-k', lw=1)
     dim_text_pos = 0
-    for i in range(len(positions) - 1):
-        ax.plot([positions[i], positions[i]], [-12.5, -10], '-k', lw=1)
+    ax.vlines(positions[:-1], -12.5, -10, colors='k', lw=1)
+    for i in range(len(positions) - 1 if labelled else 0):
         dim_text = positions[i + 1] - positions[i]
         formatted_dim_text = f"{dim_text:.2f}".rstrip('0').rstrip('.')
         dim_text_pos = positions[i]
@@ -350,346 +489,54 @@ def draw_beam(beam_length, supports, point_loads, distributed_loads, moments):
 
     return fig, positions
 
-def calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length):
-    """Calculate reaction forces and moments at supports."""
-    num_supports = len(supports)
-    if num_supports == 1:
-        for support_types, position in supports:
-            if support_types == "Fixed":
-                sum_point_loads = 0
-                sum_dist_loads = 0
-                sum_point_loads_moments = 0
-                sum_dist_loads_moments = 0
-                sum_external_moments = 0
-
-                fixed_support_pos = position
-
-                for position, magnitude in point_loads:
-                    sum_point_loads += magnitude
-                    sum_point_loads_moments += magnitude * abs(position - fixed_support_pos)
-
-                for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                    sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                    if end_mag+start_mag != 0 :
-                        centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                        centroid_right = abs(start_pos - end_pos) - centroid_left
-                        distance_left = min(start_pos, end_pos)
-                        distance_right = beam_length - max(start_pos, end_pos)
-                        if fixed_support_pos == 0:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-                        else:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_right+distance_right)
-
-                for position, magnitude in moments:
-                    sum_external_moments += magnitude
-
-                reaction_1 = -sum_point_loads - sum_dist_loads
-                moment_1 = sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments
-
-                reaction_moment = [reaction_1, moment_1]
-                reaction_moment_pos = []
-                for support_types, position in supports:
-                    reaction_moment_pos.append(position)
-                reactions = []
-                for i in reaction_moment:
-                    reactions.append((reaction_moment_pos[0],i))
-
-                reaction_direction ="🡻" if reactions[0][1] <0 else "🢁"
-                st.write('✍️Reaction at Fixed Support: ', abs(round(reactions[0][1],2)), " kN ", reaction_direction)
-                moment_direction = "Clockwise" if reactions[1][1] >0 else "Anticlockwise"
-                st.write('✍️Moment at Fixed Support: ', abs(round(reactions[1][1],2)), ' kNm (', moment_direction, ' )')
-                return reactions
-            else:
-                st.write("Unable to Solve")
-                return False
+def render_beam_png(beam_length, supports, point_loads, distributed_loads, moments):
+    """Draw the beam diagram and return it as PNG bytes along with the dimension positions."""
+    fig, positions = draw_beam(beam_length, supports, point_loads, distributed_loads, moments)
+    png = figure_png(fig)
+    pyplot().close(fig)
+    return png, positions
 
-    elif num_supports == 2:
-        if any(support_type == "Fixed" for support_type, position in supports):
-            st.write("Unable to Solve with Fixed Support and Two Supports")
-            return False
-        else:
-            sum_point_loads = 0
-            sum_dist_loads = 0
-            sum_point_loads_moments = 0
-            sum_dist_loads_moments = 0
-            sum_external_moments = 0
-
-            for position, magnitude in point_loads:
-                sum_point_loads += magnitude
-                sum_point_loads_moments += magnitude*(position)
-            for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                if end_mag+start_mag != 0 :
-                    centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                    distance_left = min(start_pos, end_pos)
-                    sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-
-            for position, magnitude in moments:
-                sum_external_moments += magnitude
-            
-            reaction_coefficient_mat = [(1,1)]
-            support_position = []
-            for support_type, position in supports:
-                support_position.append(position)
-            reaction_coefficient_mat.append(support_position)
-
-            constant_mat = [(sum_point_loads + sum_dist_loads), (sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments)]
-
-            try:
-                r = np.linalg.solve(reaction_coefficient_mat, constant_mat)
-                r1, r2 = -r
-            except np.linalg.LinAlgError:
-                r1 = 0
-                r2 = 0
-                st.write("Unable to Solve: Singular Matrix")
-                return False
-
-        reaction_mag = [r1, r2]
-        reaction_pos = []
-        for support_types, position in supports:
-            reaction_pos.append(position)
-        reactions = []
-        for a, b in zip(reaction_pos, reaction_mag):
-            reactions.append((a,b))
-
-        reactions = sorted(reactions, key=lambda x: x[0])
-        reaction_direction_A ="🡻" if reactions[0][1] <0 else "🢁"
-        st.write('✍️  Reaction at Support A: ', abs(round(reactions[0][1],2)), " kN ", " ", reaction_direction_A)
-        reaction_direction_B ="🡻" if reactions[1][1] <0 else "🢁"
-        st.write('✍️  Reaction at Support B: ', abs(round(reactions[1][1],2)), ' kN ', reaction_direction_B)
-        
-        return reactions
-    else:
-        st.write("Unsupported Number of Supports")
-        return False
+def support_label(index):
+    """Letter naming a support in position order: A, B, ..., Z, then numbers."""
+    return chr(ord("A") + index) if index < 26 else str(index + 1)
 
-def shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution):
-    """Calculate shear force along the beam."""
-    shear = [0.0] * (int(beam_length * resolution) + 1)
-    x_coords = np.linspace(0, beam_length, len(shear))
-
-    # Add support reactions to shear force
-    if support_reactions:
-        for position, magnitude in support_reactions:
-            for i, x in enumerate(x_coords):
-                if x >= position:
-                    shear[i] += magnitude
-
-    # Add point loads to the shear force
-    for position, magnitude in point_loads:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                shear[i] += magnitude
-
-    # Add distributed loads to the shear force
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-        for i, x in enumerate(x_coords):
-            if start_pos <= x <= end_pos:
-                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
-                increment = load * (x_coords[1] - x_coords[0])
-                for j, y in enumerate(x_coords):
-                    if y >= x:
-                        shear[j] += increment
-
-    return x_coords, shear
-
-def bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, external_moments, beam_length, resolution):
-    """Calculate bending moment along the beam."""
-    bending_moment = [0.0] * (int(beam_length * resolution) + 1)
-    x_coords = np.linspace(0, beam_length, len(bending_moment))
-
-    # Fixed support position
-    fixed_support_pos = 0
-    for support_types, position in supports:
-        if support_types == "Fixed":
-            fixed_support_pos = position
-
-    # Add support reaction moments to bending moment
-    if support_reactions:
-        for position, magnitude in support_reactions:
-            for i, x in enumerate(x_coords):
-                if x >= position:
-                    bending_moment[i] += magnitude * (x - position)
-
-    # Add support moments to bending moment
-    if support_moments:
-        for position, magnitude in support_moments:
-            for i, x in enumerate(x_coords):
-                if x >= position:
-                    if fixed_support_pos == 0:
-                        bending_moment[i] += magnitude
-                    else:
-                        bending_moment[i] -= magnitude
-    
-    # Add point loads to the bending moment
-    for position, magnitude in point_loads:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                bending_moment[i] += magnitude * (x - position)
-    
-    # Add distributed loads to the bending moment
-    for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-        for i, x in enumerate(x_coords):
-            if start_pos <= x <= end_pos:
-                load = start_mag + (end_mag - start_mag) * ((x - start_pos) / (end_pos - start_pos))
-                increment = load * (x_coords[1] - x_coords[0])
-                for j, y in enumerate(x_coords):
-                    if y >= x:
-                        bending_moment[j] += (y - x) * increment
-    
-    # Add external moments
-    for position, magnitude in external_moments:
-        for i, x in enumerate(x_coords):
-            if x >= position:
-                bending_moment[i] += magnitude
-
-    # st.write(bending_moment)
-
-    return x_coords, bending_moment
-
-def calculate_reactions_for_unit_weight(supports, point_loads, distributed_loads, moments, beam_length):
-    num_supports = len(supports)
-    if num_supports == 1:
-        for support_types, position in supports:
-            if support_types == "Fixed":
-                sum_point_loads = 0
-                sum_dist_loads = 0
-                sum_point_loads_moments = 0
-                sum_dist_loads_moments = 0
-                sum_external_moments = 0
-
-                fixed_support_pos = position
-
-                for position, magnitude in point_loads:
-                    sum_point_loads += magnitude
-                    sum_point_loads_moments += magnitude * abs(position - fixed_support_pos)
-
-                for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                    sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                    if end_mag+start_mag != 0 :
-                        centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                        centroid_right = abs(start_pos - end_pos) - centroid_left
-                        distance_left = min(start_pos, end_pos)
-                        distance_right = beam_length - max(start_pos, end_pos)
-                        if fixed_support_pos == 0:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-                        else:
-                            sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_right+distance_right)
-
-                for position, magnitude in moments:
-                    sum_external_moments += magnitude
-
-                reaction_1 = -sum_point_loads - sum_dist_loads
-                moment_1 = sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments
-
-                reaction_moment = [reaction_1, moment_1]
-                reaction_moment_pos = []
-                for support_types, position in supports:
-                    reaction_moment_pos.append(position)
-                reactions = []
-                for i in reaction_moment:
-                    reactions.append((reaction_moment_pos[0],i))
-
-                return reactions
-
-    elif num_supports == 2:
-        if any(support_type == "Fixed" for support_type, position in supports):
-            st.write("Unable to Solve with Fixed Support and Two Supports")
-            return False
-        else:
-            sum_point_loads = 0
-            sum_dist_loads = 0
-            sum_point_loads_moments = 0
-            sum_dist_loads_moments = 0
-            sum_external_moments = 0
-
-            for position, magnitude in point_loads:
-                sum_point_loads += magnitude
-                sum_point_loads_moments += magnitude*(position)
-            for start_pos, end_pos, start_mag, end_mag in distributed_loads:
-                sum_dist_loads += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos))
-                if end_mag+start_mag != 0 :
-                    centroid_left = ((abs(end_pos-start_pos))/3) * ((2*end_mag+start_mag)/(end_mag+start_mag))
-                    distance_left = min(start_pos, end_pos)
-                    sum_dist_loads_moments += 0.5 * (start_mag + end_mag) * (abs(end_pos-start_pos)) * (centroid_left+distance_left)
-
-            for position, magnitude in moments:
-                sum_external_moments += magnitude
-            
-            reaction_coefficient_mat = [(1,1)]
-            support_position = []
-            for support_type, position in supports:
-                support_position.append(position)
-            reaction_coefficient_mat.append(support_position)
-
-            constant_mat = [(sum_point_loads + sum_dist_loads), (sum_point_loads_moments + sum_dist_loads_moments - sum_external_moments)]
-
-            try:
-                r = np.linalg.solve(reaction_coefficient_mat, constant_mat)
-                r1, r2 = -r
-            except np.linalg.LinAlgError:
-                r1 = 0
-                r2 = 0
-                st.write("Unable to Solve: Singular Matrix")
-                return False
-
-        reaction_mag = [r1, r2]
-        reaction_pos = []
-        for support_types, position in supports:
-            reaction_pos.append(position)
-        reactions = []
-        for a, b in zip(reaction_pos, reaction_mag):
-            reactions.append((a,b))
-        
-        return reactions
-
-def calculate_unit_load_moment(supports, beam_length, resolution):
-    """Calculate the unit weight moment (bending moment due to unit load) at each point."""
-    num_points = int(beam_length * resolution) + 1
-    x_coords = np.linspace(0, beam_length, num_points)
-    unit_weight_moments = np.zeros((num_points, num_points))  # Matrix to store m(x) for each unit load position
-
-    for i in range(num_points):
-        # Apply a unit load at x_coords[i]
-        unit_load = [(x_coords[i], -1.0)]
-        reactions = calculate_reactions_for_unit_weight(supports, unit_load, [], [], beam_length)
-        
-        # Separate reactions and moments
-        support_reactions = []
-        support_moments = []
-        if reactions:
-            if len(supports) == 1 and supports[0][0] == "Fixed":
-                support_reactions = [(reactions[0][0], reactions[0][1])]
-                support_moments = [(reactions[1][0], reactions[1][1])]
-            else:
-                support_reactions = reactions
-
-        # Calculate bending moment due to this unit load
-        _, unit_moment = bending_moment(
-            supports, support_reactions, support_moments, unit_load, [], [], beam_length, resolution
-        )
-        unit_weight_moments[i, :] = unit_moment
-    # st.write(unit_weight_moments)
-
-    return x_coords, unit_weight_moments     
-
-def calculate_deflection(x_coords, bending_moment, unit_weight_moments, beam_length, resolution, EI):
-    num_points = len(x_coords)
-    deflections = np.zeros(num_points)
-    dx = beam_length / (num_points - 1)
-
-    for i in range(num_points):
-        # Sum over all j from 0 to i
-        sum_deflection = 0.0
-        for j in range(num_points):
-            sum_deflection += bending_moment[j] * -unit_weight_moments[i][j] * dx
-        deflections[i] = sum_deflection / (EI)  # Convert to mm
-        
+def moment_direction(position, moment):
+    """Sense of a reported fixed-end moment: clockwise positive at x = 0, anticlockwise positive elsewhere."""
+    clockwise = moment > 0 if position == 0 else moment < 0
+    return "Clockwise" if clockwise else "Anticlockwise"
 
-    return x_coords, deflections
+def calculate_reactions(model):
+    """Calculate reaction forces and moments at supports."""
+    try:
+        reactions = compute_reactions(model, ANALYSIS_CACHE)
+    except UnsolvableBeamError as error:
+        st.write(str(error))
+        return False
 
-def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_length):
-    """Plot Shear Force and Bending Moment Diagrams with annotations."""
+    if len(model.supports) == 1:
+        reaction_direction ="🡻" if reactions[0][1] <0 else "🢁"
+        st.write('✍️Reaction at Fixed Support: ', abs(round(reactions[0][1],2)), " kN ", reaction_direction)
+        direction = moment_direction(*reactions[1])
+        st.write('✍️Moment at Fixed Support: ', abs(round(reactions[1][1],2)), ' kNm (', direction, ' )')
+    else:
+        # One force per support sorted by position, then the moments at Fixed supports
+        labels = {}
+        for i, (position, force) in enumerate(reactions[:len(model.supports)]):
+            labels.setdefault(position, support_label(i))
+            reaction_direction ="🡻" if force <0 else "🢁"
+            st.write(f'✍️  Reaction at Support {support_label(i)}: ', abs(round(force,2)), " kN ", " ", reaction_direction)
+        for position, moment in reactions[len(model.supports):]:
+            direction = moment_direction(position, moment)
+            st.write(f'✍️  Moment at Support {labels[position]}: ', abs(round(moment,2)), ' kNm (', direction, ' )')
+
+    return reactions
+
+def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_length, peak=None):
+    """Plot Shear Force and Bending Moment Diagrams with annotations.
+
+    peak is the exact (x, shear, moment) of the maximum bending moment.
+    """
+    plt = pyplot()
     plt.style.use("ggplot")
 
     fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 15), gridspec_kw={"height_ratios": [1, 1, 1]})
@@ -702,12 +549,14 @@ def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_l
     ax1.tick_params(axis="both", which="major", labelsize=10)
     ax1.set_xlim([0, beam_length])
 
-    # Annotate zero shear position (approximate, near max bending moment)
-    max_bending_idx = np.argmax(np.abs(bending_moment))
-    max_bending_x = x_coords[max_bending_idx]
+    # Annotate zero shear position (exact when peak is given, else the largest sampled moment)
+    if peak is None:
+        max_bending_idx = np.argmax(np.abs(bending_moment))
+        peak = (x_coords[max_bending_idx], shear[max_bending_idx], bending_moment[max_bending_idx])
+    max_bending_x, max_shear, max_bending = peak
     ax1.annotate(
         f"x={max_bending_x:.2f}",
-        (max_bending_x, shear[max_bending_idx]),
+        (max_bending_x, max_shear),
         textcoords="offset points",
         xytext=(0, 10),
         ha="center",
@@ -726,8 +575,8 @@ def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_l
 
     # Annotate maximum bending moment
     ax2.annotate(
-        f"Max M\nx={x_coords[max_bending_idx]:.2f}\nM={bending_moment[max_bending_idx]:.2f}",
-        (x_coords[max_bending_idx], bending_moment[max_bending_idx]),
+        f"Max M\nx={max_bending_x:.2f}\nM={max_bending:.2f}",
+        (max_bending_x, max_bending),
         textcoords="offset points",
         xytext=(10, -20),
         ha="center",
@@ -746,8 +595,7 @@ def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_l
     # st.write(deflections)
 
     # Annotate SF and BM at specified positions
-    for pos in positions:
-        closest_idx = np.argmin(np.abs(x_coords - pos))
+    for closest_idx in annotation_indices(x_coords, positions):
         ax1.annotate(
             f"{shear[closest_idx]:.2f}",
             (x_coords[closest_idx], shear[closest_idx]),
@@ -768,26 +616,31 @@ def plot_sfd_bmd(x_coords, shear, bending_moment, deflections, positions, beam_l
         )
         ax1.axvline(x=x_coords[closest_idx], color="blue", linestyle="--", linewidth=0.5)
         ax2.axvline(x=x_coords[closest_idx], color="green", linestyle="--", linewidth=0.5)
-        ax1.axvline(x=x_coords[max_bending_idx], color="blue", linestyle="--", linewidth=0.5)
-        ax2.axvline(x=x_coords[max_bending_idx], color="green", linestyle="--", linewidth=0.5)
+    ax1.axvline(x=max_bending_x, color="blue", linestyle="--", linewidth=0.5)
+    ax2.axvline(x=max_bending_x, color="green", linestyle="--", linewidth=0.5)
 
     fig.text(0.95, 0.0, 'Generated by Md. Asadur Rahman', ha='right', va='bottom', fontsize=10, color='black', alpha=0.6)
     plt.tight_layout()
     st.pyplot(fig)
     plt.close(fig)
 
+def station_indices(x_coords, beam_length, interval):
+    """Grid indices at every 'interval' meters and at the beam end."""
+    x_coords = np.asarray(x_coords)
+    at_station = np.isclose(x_coords % interval, 0, atol=1e-6) | np.isclose(x_coords, beam_length, atol=1e-6)
+    return np.flatnonzero(at_station).tolist()
+
 def display_bending_moment_table(x_coords, bending_moment, beam_length, interval=2.0):
     """
     Display a table of bending moments at every 'interval' meters along the beam.
     """
     table_data = []
-    for i, x in enumerate(x_coords):
-        # Show value at every interval and at the beam end
-        if np.isclose(x % interval, 0, atol=1e-6) or np.isclose(x, beam_length, atol=1e-6):
-            table_data.append({
-                "Position (m)": round(x, 2),
-                "Bending Moment (kNm)": round(bending_moment[i], 3)
-            })
+    # Show value at every interval and at the beam end
+    for i in station_indices(x_coords, beam_length, interval):
+        table_data.append({
+            "Position (m)": round(x_coords[i], 2),
+            "Bending Moment (kNm)": round(bending_moment[i], 3)
+        })
     if table_data:
         st.write(f"### Bending Moment Table (every {interval} meters)")
         st.table(table_data)
@@ -796,8 +649,11 @@ def display_unit_load_moment_matrix(x_coords, unit_weight_moments, beam_length,
     """
     Display the unit load moment matrix at every 'interval' meters along the beam.
     """
-    indices = [i for i, x in enumerate(x_coords) if np.isclose(x % interval, 0, atol=1e-6) or np.isclose(x, beam_length, atol=1e-6)]
-    reduced_matrix = unit_weight_moments[np.ix_(indices, indices)]
+    import pandas as pd
+
+    indices = station_indices(x_coords, beam_length, interval)
+    # Gather only the station rows and columns, so a disk-backed matrix is never read in full
+    reduced_matrix = np.asarray(unit_weight_moments[np.ix_(indices, indices)])
     reduced_positions = [round(x_coords[i], 2) for i in indices]
     df_unit_moment = pd.DataFrame(reduced_matrix, index=reduced_positions, columns=reduced_positions)
     st.write(f"### Unit Load Moment Matrix (every {interval} meters)")
@@ -808,88 +664,252 @@ def display_deflection_table(x_coords, deflections, beam_length, interval=2.0):
     Display a table of deflections at every 'interval' meters along the beam.
     """
     table_data = []
-    for i, x in enumerate(x_coords):
-        if np.isclose(x % interval, 0, atol=1e-6) or np.isclose(x, beam_length, atol=1e-6):
-            table_data.append({
-                "Position (m)": round(x, 2),
-                "Deflection (mm)": round(deflections[i]*1000, 4)  # Convert to mm if deflection is in meters
-            })
+    for i in station_indices(x_coords, beam_length, interval):
+        table_data.append({
+            "Position (m)": round(x_coords[i], 2),
+            "Deflection (mm)": round(deflections[i]*1000, 4)  # Convert to mm if deflection is in meters
+        })
     if table_data:
         st.write(f"### Deflection Table (every {interval} meters)")
         st.table(table_data)
 
-def display_beam_diagram(col_b, beam_length, supports, point_loads, distributed_loads, moments):
-    """Display the beam diagram in the right column."""
+def display_export(model, x_coords, shear, moment, deflections, unit_weight_moments=None):
+    """
+    Offer the full-resolution diagrams (and the unit load moment matrix, if any) as a file download.
+    """
+    st.write("### Export")
+    formats = [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or has_module("pyarrow")]
+    col_format, col_precision = st.columns(2)
+    fmt = col_format.selectbox("Format", formats, key="export_format")
+    dtype = np.float32 if col_precision.checkbox("float32 (smaller file)", key="export_float32") else np.float64
+    contents = ["Diagrams"] + (["Unit load moment matrix"] if unit_weight_moments is not None else [])
+    content = st.radio("Contents", contents, horizontal=True, key="export_contents")
+    # Streamlit keeps a download's bytes in memory for the session, so the file must fit the memory budget
+    num_columns = len(DIAGRAM_COLUMNS) if content == "Diagrams" else len(x_coords) + 1
+    nbytes = estimate_export_bytes(len(x_coords), num_columns, fmt, dtype)
+    if nbytes > DEFAULT_MAX_BYTES:
+        st.warning(
+            f"This export would be up to {nbytes / 2 ** 20:,.0f} MB, over the app's {DEFAULT_MAX_BYTES / 2 ** 20:.0f} MB "
+            "memory budget for downloads. Use a binary format, float32 or a lower resolution, or write the file "
+            "locally with beamcalc.export.export_matrix, which streams rows to disk."
+        )
+        return
+    # Files are written only on request, a chunk of rows at a time
+    if not st.button("Prepare export file", key="export_prepare"):
+        return
+    # The chunked writer goes to a temporary file, so no second, buffer copy is held; the download button
+    # still reads the whole file into Streamlit's in-memory media store
+    with tempfile.TemporaryFile() as export_file:
+        if content == "Diagrams":
+            result = AnalysisResult(model=model, x_coords=x_coords, shear=shear, moment=moment, deflection=deflections)
+            export_diagrams(result, export_file, fmt, dtype)
+            file_name = f"beam_diagrams.{fmt}"
+        else:
+            block_size = disk_block_size(len(x_coords)) if isinstance(unit_weight_moments, np.memmap) else DEFAULT_BLOCK_SIZE
+            export_matrix(x_coords, iter_row_blocks(unit_weight_moments, block_size), export_file, fmt, dtype)
+            file_name = f"unit_load_moments.{fmt}"
+        export_file.seek(0)
+        # The download button takes raw or read-only file objects, not the read-write buffered one
+        st.download_button(f"Download {file_name}", export_file.raw, file_name=file_name, key="export_download")
+
+def display_diagnostics(timer, estimate):
+    """
+    Show the per-stage timings and memory of this run next to the up-front estimate.
+    """
+    with st.expander("Diagnostics", expanded=True):
+        st.write(
+            f"Total {timer.total_seconds * 1e3:.1f} ms over {len(timer.records)} stages; "
+            f"estimated {estimate.seconds * 1e3:.1f} ms and {estimate.nbytes / 2 ** 20:.1f} MB "
+            f"for {estimate.num_points} grid points"
+            + (f" and {estimate.matrix_entries:,} unit-load matrix entries." if estimate.matrix_entries else ".")
+        )
+        st.dataframe(timer.rows(), hide_index=True)
+
+def analysis_settings(left, right, batched=False):
+    """Resolution, deflection method, mesh, E and I inputs in two columns, as BeamModel keyword arguments."""
+    with left:
+        resolution = st.number_input("Resolution (higher = more precision)", min_value=10, value=100, step=10,
+                                     key="resolution")
+        deflection_method = st.selectbox("Deflection method", list(DEFLECTION_METHODS), index=0, key="deflection_method")
+        mesh = st.selectbox("Mesh", list(MESH_TYPES), index=0, key="mesh")
+        matrix_storage = "In memory"
+        # A form only reruns on submit, so there the storage choice is always shown
+        if batched or DEFLECTION_METHODS[deflection_method] == "virtual_work":
+            matrix_storage = st.selectbox("Unit load matrix storage", list(MATRIX_STORAGE_TYPES), index=0,
+                                          key="matrix_storage")
+
+    with right:
+        E = st.number_input(
+        "Young's Modulus E (kN/m²)",
+        min_value=1e6,
+        max_value=1e9,
+        value=2e8,  # ~20 GPa for concrete
+        step=1e6,
+        format="%.0f",
+        key="E"
+    )
+        I = st.number_input(
+            "Moment of Inertia I (m⁴)",
+            min_value=1e-8,
+            max_value=1e-2,
+            value=1e-4,  # Typical for a beam
+            step=1e-8,
+            format="%.8f",
+            key="I"
+        )
+    return dict(resolution=resolution, E=E, I=I, deflection_method=DEFLECTION_METHODS[deflection_method],
+                mesh=MESH_TYPES[mesh], matrix_storage=MATRIX_STORAGE_TYPES[matrix_storage])
+
+def display_stage_changes(previous, model):
+    """Say which analysis stages the submitted model changed; the others are served from the cache."""
+    if previous is None or previous == model:
+        return
+    stages = changed_stages(previous, model)
+    if stages:
+        st.caption(f"Recomputed: {', '.join(stages)}. Other stages reused.")
+    elif (previous.E, previous.I) != (model.E, model.I):
+        st.caption("Only E or I changed: the cached deflection was rescaled.")
+    else:
+        st.caption("No analysis input changed: every stage was reused.")
+
+def display_beam_diagram(col_b, beam_length, supports, point_loads, distributed_loads, moments, settings=None):
+    """Display the beam diagram in the right column.
+
+    settings are the submitted analysis settings in batched input mode; otherwise
+    their inputs are shown here.
+    """
     with col_b:
         col_b1, col_b2 = st.columns([2,2])
 
         # Reaction and Resolution
         with col_b1:
-            
-            reactions = calculate_reactions(supports, point_loads, distributed_loads, moments, beam_length)
-            resolution = st.number_input("Resolution (higher = more precision)", min_value=10, max_value=1000, value=100, step=10)
-            
-            
-
+            reaction_area = st.container()
+        batched = settings is not None
+        if not batched:
+            settings = analysis_settings(col_b1, col_b2)
         with col_b2:
-            E = st.number_input(
-            "Young's Modulus E (kN/m²)",
-            min_value=1e6,
-            max_value=1e9,
-            value=2e8,  # ~20 GPa for concrete
-            step=1e6,
-            format="%.0f"
-        )
-            I = st.number_input(
-                "Moment of Inertia I (m⁴)",
-                min_value=1e-8,
-                max_value=1e-2,
-                value=1e-4,  # Typical for a beam
-                step=1e-8,
-                format="%.8f"
+            render_mode = st.selectbox("Rendering", RENDER_MODES, index=0)
+
+        try:
+            model = BeamModel(beam_length, supports, point_loads, distributed_loads, moments, **settings)
+        except ValueError as error:
+            st.error(str(error))
+            st.stop()
+
+        # The model of the previous run; reruns that change no input (rendering, export, diagnostics) reuse every stage
+        previous = st.session_state.get("analysed_model")
+        st.session_state.analysed_model = model
+        if batched:
+            display_stage_changes(previous, model)
+
+        # Opt-in timing and memory of every stage below, shown in a panel and logged
+        diagnostics = st.checkbox("Diagnostics", key="diagnostics")
+        max_seconds = DEFAULT_MAX_SECONDS
+        if diagnostics:
+            max_seconds = st.number_input("Time budget (s)", min_value=0.1, value=DEFAULT_MAX_SECONDS, step=0.5,
+                                          key="time_budget")
+        # Log lines of one run share a short hash of the model, to tell reruns of the same beam apart from edits
+        timer = StageTimer(enabled=diagnostics, run=canonical_key(model.to_dict())[:12] if diagnostics else "")
+
+        # Large inputs are allowed, but check what they would cost before computing
+        estimate = estimate_cost(model)
+        over_budget = estimate.over_budget(max_seconds=max_seconds)
+        if over_budget:
+            st.warning(
+                f"This beam ({estimate.num_points} grid points, {estimate.num_loads} loads) needs "
+                + " and ".join(over_budget)
+                + ". Lower the resolution, use the adaptive mesh or double integration, or run it anyway."
             )
-            EI = E * I  # Flexural rigidity in kNm²
+            if not st.checkbox("Run anyway", key="run_over_budget"):
+                st.stop()
+
+        with reaction_area, timer.stage("reactions") as stage:
+            reactions = calculate_reactions(model)
+            stage.arrays(reactions)
 
         # Draw Beam
-        fig, positions = draw_beam(beam_length, supports, point_loads, distributed_loads, moments)
-        st.pyplot(fig)
-
-        # SFD and BMD
-        # Prepare data for shear force and bending moment
-        support_reactions = []
-        support_moments = []
-        if reactions:
-            if len(supports) == 1 and supports[0][0] == "Fixed":
-                support_reactions = [(reactions[0][0], reactions[0][1])]
-                support_moments = [(reactions[1][0], reactions[1][1])]
+        with timer.stage("beam_sketch"):
+            if render_mode == "Standard":
+                fig, positions = draw_beam(beam_length, supports, point_loads, distributed_loads, moments)
+                st.pyplot(fig)
+                pyplot().close(fig)
             else:
-                support_reactions = reactions
-
-        # Shear Force and Bending Moment Diagrams
-        x_coords, shear = shear_force(support_reactions, point_loads, distributed_loads, beam_length, resolution)
-        x_coords, moment = bending_moment(supports, support_reactions, support_moments, point_loads, distributed_loads, moments, beam_length, resolution)
-
-        x_coords, unit_weight_moments = calculate_unit_load_moment(supports, beam_length, resolution)
-        x_coords, deflections = calculate_deflection(x_coords, moment, unit_weight_moments, beam_length, resolution, EI)
-        # st.write(deflections)
-
-        plot_sfd_bmd(x_coords, shear, moment, deflections, positions, beam_length)
+                # The sketch only depends on the geometry and loads, so its image is reused across reruns
+                beam_png, positions = ANALYSIS_CACHE.get_or_compute(
+                    "beam_figure",
+                    (supports, point_loads, distributed_loads, moments, beam_length),
+                    lambda: render_beam_png(beam_length, supports, point_loads, distributed_loads, moments),
+                )
+                st.image(beam_png)
+
+        # Shear Force, Bending Moment and Deflection
+        # Loads are usually edited one at a time, so the session's analysis only swaps the edited load's contribution
+        with timer.stage("diagrams_and_deflection") as stage:
+            if "incremental" not in st.session_state:
+                st.session_state.incremental = IncrementalAnalysis(ANALYSIS_CACHE)
+            result = st.session_state.incremental.sync(model) if reactions else None
+            if result is not None and result.ok:
+                x_coords, shear, moment, deflections = result.x_coords, result.shear, result.moment, result.deflection
+            else:
+                # Each stage is cached on its own inputs, so e.g. an E or I edit only rescales the deflection
+                x_coords, shear, moment = compute_diagrams(model, reactions, ANALYSIS_CACHE)
+                deflections = compute_deflection(model, reactions, x_coords, moment, ANALYSIS_CACHE)
+            stage.arrays(x_coords, shear, moment, deflections)
+
+        # Deflection: O(N) double integration, or the O(N^2) virtual work matrix for verification
+        unit_weight_moments = None
+        if model.deflection_method == "virtual_work":
+            with timer.stage("unit_load_matrix") as stage:
+                x_coords, unit_weight_moments = compute_unit_load_moments(model, ANALYSIS_CACHE)
+                stage.arrays(unit_weight_moments)
+
+        # Annotate every load position on lightly loaded beams, otherwise only the supports and beam ends
+        if len(positions) > MAX_ANNOTATED_POSITIONS:
+            positions = sorted({0.0, beam_length} | {position for _, position in supports})
+
+        # Exact position and value of the peak moment from the piecewise polynomials
+        with timer.stage("polynomials"):
+            polynomials = compute_polynomials(model, reactions, ANALYSIS_CACHE)
+            peak_x, peak_moment = polynomials.moment.extreme()
+            peak = (peak_x, float(polynomials.shear(peak_x)), peak_moment)
+
+        with timer.stage(f"diagram_render ({render_mode})"):
+            if render_mode == "Fast":
+                # Keep one figure per session and only swap its data
+                if "diagram_template" not in st.session_state:
+                    st.session_state.diagram_template = DiagramTemplate()
+                template = st.session_state.diagram_template
+                template.update(x_coords, shear, moment, deflections, positions, beam_length, peak)
+                st.image(template.to_png())
+            elif render_mode == "Interactive":
+                st.altair_chart(diagram_chart(x_coords, shear, moment, deflections))
+            else:
+                plot_sfd_bmd(x_coords, shear, moment, deflections, positions, beam_length, peak)
 
         # --- Bending Moment Table Section ---
-        display_bending_moment_table(x_coords, moment, beam_length, interval=2.0)
+        with timer.stage("moment_table"):
+            display_bending_moment_table(x_coords, moment, beam_length, interval=2.0)
         # --- Unit Load Moment Matrix Section ---
-        display_unit_load_moment_matrix(x_coords, unit_weight_moments, beam_length, interval=2.0)
+        if unit_weight_moments is not None:
+            with timer.stage("unit_load_matrix_table"):
+                display_unit_load_moment_matrix(x_coords, unit_weight_moments, beam_length, interval=2.0)
         # --- Deflection Table Section ---
-        display_deflection_table(x_coords, deflections, beam_length, interval=2.0)
+        with timer.stage("deflection_table"):
+            display_deflection_table(x_coords, deflections, beam_length, interval=2.0)
+        # --- Export Section ---
+        with timer.stage("export"):
+            display_export(model, x_coords, shear, moment, deflections, unit_weight_moments)
 
+        if diagnostics:
+            display_diagnostics(timer, estimate)
 
-        return positions, reactions, resolution, moment
+        return positions, reactions, model.resolution, moment
 
 def main():
     """Main function to run the Streamlit app."""
     setup_page()
-    beam_length, supports, point_loads, distributed_loads, moments, col_b = get_beam_inputs()
-    positions, reactions, resolution, bending_moment = display_beam_diagram(col_b, beam_length, supports, point_loads, distributed_loads, moments)
+    beam_length, supports, point_loads, distributed_loads, moments, settings, col_b = get_beam_inputs()
+    positions, reactions, resolution, bending_moment = display_beam_diagram(col_b, beam_length, supports, point_loads, distributed_loads, moments, settings)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from beamcalc.analysis import analyse
+from beamcalc.cache import AnalysisCache, canonical_key, load_key
+from beamcalc.model import BeamModel
+
+POINT_LOADS = [(2.0, -10.0), (7.5, -4.0), (5.0, 3.0)]
+DISTRIBUTED_LOADS = [(0.0, 10.0, -2.0, -2.0), (3.0, 6.0, -1.0, -5.0)]
+MOMENTS = [(4.0, 6.0), (8.0, -2.5)]
+
+
+def test_load_key_ignores_load_order():
+    key = canonical_key(load_key(POINT_LOADS, DISTRIBUTED_LOADS, MOMENTS))
+    shuffled = canonical_key(load_key(POINT_LOADS[::-1], DISTRIBUTED_LOADS[::-1], [list(m) for m in MOMENTS[::-1]]))
+    assert key == shuffled
+    assert key != canonical_key(load_key(POINT_LOADS[:2], DISTRIBUTED_LOADS, MOMENTS))
+
+
+def test_canonical_key_ignores_numeric_types():
+    assert canonical_key([1, 2.5]) == canonical_key((np.float32(1.0), np.float64(2.5)))
+    assert canonical_key(0.0) == canonical_key(-0.0)
+
+
+@pytest.mark.parametrize("method", ["trapezoid", "virtual_work"])
+def test_reordered_loads_hit_the_cache(method):
+    cache = AnalysisCache()
+    supports = [("Hinge", 0.0), ("Roller", 6.0), ("Roller", 10.0)]
+    first = analyse(BeamModel(10.0, supports, POINT_LOADS, DISTRIBUTED_LOADS, MOMENTS, resolution=20,
+                              deflection_method=method), cache)
+    misses = cache.misses
+    second = analyse(BeamModel(10.0, supports, POINT_LOADS[::-1], DISTRIBUTED_LOADS[::-1], MOMENTS[::-1],
+                               resolution=20, deflection_method=method), cache)
+    assert cache.misses == misses
+    assert second.reactions == first.reactions
+    np.testing.assert_array_equal(second.deflection, first.deflection)
+
+
+def test_cached_arrays_are_read_only():
+    cache = AnalysisCache()
+    result = analyse(BeamModel(10.0, [("Fixed", 0.0)], POINT_LOADS, resolution=20), cache)
+    with pytest.raises(ValueError):
+        result.moment[0] = 1.0
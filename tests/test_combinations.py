@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from beamcalc.analysis import analyse
+from beamcalc.combinations import Combination, LoadCase, solve_load_cases
+from beamcalc.model import BeamModel
+
+CASES = [
+    LoadCase("dead", distributed_loads=[(0.0, 12.0, -4.0, -4.0)]),
+    LoadCase("live", point_loads=[(3.0, -15.0), (9.5, -10.0)]),
+    LoadCase("wind", moments=[(6.0, 8.0)], distributed_loads=[(2.0, 7.0, 1.0, -2.0)]),
+]
+COMBINATIONS = [
+    Combination("1.4D", {"dead": 1.4}),
+    Combination("1.2D+1.6L", {"dead": 1.2, "live": 1.6}),
+    Combination("1.2D+L+W", {"dead": 1.2, "live": 1.0, "wind": 1.0}),
+    Combination("0.9D-W", {"dead": 0.9, "wind": -1.0}),
+]
+SUPPORTS = {
+    "simply supported": [("Hinge", 0.0), ("Roller", 12.0)],
+    "continuous": [("Hinge", 0.0), ("Roller", 5.0), ("Roller", 12.0)],
+    "fixed-fixed": [("Fixed", 0.0), ("Fixed", 12.0)],
+}
+
+
+def _summed(supports, combination, method):
+    """The combination as one beam carrying every factored load."""
+    loads = {"point_loads": [], "distributed_loads": [], "moments": []}
+    for case in CASES:
+        factor = combination.factors.get(case.name, 0.0)
+        loads["point_loads"] += [(x, factor * p) for x, p in case.point_loads]
+        loads["distributed_loads"] += [(a, b, factor * w1, factor * w2) for a, b, w1, w2 in case.distributed_loads]
+        loads["moments"] += [(x, factor * m) for x, m in case.moments]
+    return analyse(BeamModel(12.0, supports, resolution=20, deflection_method=method, **loads))
+
+
+@pytest.mark.parametrize("method", ["trapezoid", "virtual_work"])
+@pytest.mark.parametrize("supports", SUPPORTS.values(), ids=list(SUPPORTS))
+def test_combinations_match_summed_analyses(supports, method):
+    model = BeamModel(12.0, supports, resolution=20, deflection_method=method)
+    results = solve_load_cases(model, CASES)
+    envelope = results.combine(COMBINATIONS, block_elements=500)
+    combined = [results.result(combination) for combination in COMBINATIONS]
+    expected = [_summed(supports, combination, method) for combination in COMBINATIONS]
+
+    for result, single in zip(combined, expected):
+        np.testing.assert_allclose([v for _, v in result.reactions], [v for _, v in single.reactions], atol=1e-9)
+        for diagram in ("shear", "moment", "deflection"):
+            np.testing.assert_allclose(getattr(result, diagram), getattr(single, diagram), rtol=1e-9, atol=1e-9)
+
+    for diagram in ("shear", "moment", "deflection"):
+        stacked = np.array([getattr(single, diagram) for single in expected])
+        np.testing.assert_allclose(envelope.upper[diagram], stacked.max(axis=0), atol=1e-9)
+        np.testing.assert_allclose(envelope.lower[diagram], stacked.min(axis=0), atol=1e-9)
+
+
+def test_unknown_case_name_raises():
+    results = solve_load_cases(BeamModel(12.0, SUPPORTS["simply supported"], resolution=20), CASES)
+    with pytest.raises(ValueError):
+        results.combine([Combination("bad", {"snow": 1.0})])
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from beamcalc.analysis import analyse
+from beamcalc.model import DEFLECTION_METHODS, BeamModel
+
+L = 6.0
+W = -10.0
+P = -20.0
+EI = 2e8 * 1e-4
+
+
+def cantilever_point(x):
+    # Fixed at 0, point load P at the free end
+    return P * x ** 2 * (3 * L - x) / (6 * EI)
+
+
+def simply_supported_udl(x):
+    return W * x * (L ** 3 - 2 * L * x ** 2 + x ** 3) / (24 * EI)
+
+
+def propped_udl(x):
+    # Fixed at 0, roller at L
+    return W * x ** 2 * (3 * L ** 2 - 5 * L * x + 2 * x ** 2) / (48 * EI)
+
+
+def fixed_fixed_udl(x):
+    return W * x ** 2 * (L - x) ** 2 / (24 * EI)
+
+
+CASES = {
+    "cantilever": ([("Fixed", 0)], [(L, P)], [], cantilever_point),
+    "simply supported": ([("Hinge", 0), ("Roller", L)], [], [(0, L, W, W)], simply_supported_udl),
+    "propped": ([("Fixed", 0), ("Roller", L)], [], [(0, L, W, W)], propped_udl),
+    "fixed-fixed": ([("Fixed", 0), ("Fixed", L)], [], [(0, L, W, W)], fixed_fixed_udl),
+}
+
+
+@pytest.mark.parametrize("method", DEFLECTION_METHODS)
+@pytest.mark.parametrize("name", CASES)
+def test_deflection_matches_closed_form(name, method):
+    supports, point_loads, distributed_loads, exact = CASES[name]
+    result = analyse(BeamModel(L, supports, point_loads, distributed_loads, resolution=50, deflection_method=method))
+    expected = exact(result.x_coords)
+    peak = np.max(np.abs(expected))
+    # Virtual work is first order in the grid step, the double integrations second order
+    tolerance = 5 / (50 * L) if method == "virtual_work" else 1e-3
+    assert np.max(np.abs(result.deflection - expected)) <= tolerance * peak
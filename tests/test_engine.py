@@ -0,0 +1,13 @@
+import pytest
+
+from beamcalc.reference import REFERENCE_CASES, check_deflection, check_engine
+
+
+@pytest.mark.parametrize("case", REFERENCE_CASES, ids=[case["name"] for case in REFERENCE_CASES])
+def test_engine_matches_reference_loops(case):
+    assert check_engine([case]) == []
+
+
+@pytest.mark.parametrize("case", REFERENCE_CASES, ids=[case["name"] for case in REFERENCE_CASES])
+def test_virtual_work_matches_simpson(case):
+    assert check_deflection([case]) == []
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from beamcalc.analysis import analyse
+from beamcalc.model import BeamModel
+from beamcalc.moving import AxleTrain, moving_load_envelopes
+
+SUPPORTS = {
+    "simply supported": [("Hinge", 0.0), ("Roller", 10.0)],
+    "cantilever": [("Fixed", 0.0)],
+    "continuous": [("Hinge", 0.0), ("Roller", 4.0), ("Roller", 10.0)],
+}
+# Axle offsets on the 0.1 m grid, so every train position loads grid points only
+TRAIN = AxleTrain("truck", [(0.0, -40.0), (1.3, -60.0), (2.5, -25.0)])
+
+
+def _brute_force(supports, train):
+    """Envelopes from one full analysis per reference axle position on the grid."""
+    offsets = [offset for offset, _ in train.axles]
+    responses = {"shear": [], "moment": [], "deflection": []}
+    for step in range(-round(max(offsets) * 10), round((10.0 - min(offsets)) * 10) + 1):
+        position = step / 10
+        point_loads = [(round(position + offset, 9), load) for offset, load in train.axles
+                       if 0 <= round(position + offset, 9) <= 10.0]
+        result = analyse(BeamModel(10.0, supports, point_loads, resolution=10))
+        for diagram, values in responses.items():
+            values.append(getattr(result, diagram))
+    return {diagram: np.array(values) for diagram, values in responses.items()}
+
+
+@pytest.mark.parametrize("method", ["direct", "fft"])
+@pytest.mark.parametrize("supports", SUPPORTS.values(), ids=list(SUPPORTS))
+def test_envelopes_match_brute_force_placement(supports, method):
+    envelope = moving_load_envelopes(BeamModel(10.0, supports, resolution=10), [TRAIN], method)["truck"]
+    expected = _brute_force(supports, TRAIN)
+    for diagram, values in expected.items():
+        scale = 1e-9 * (1 + np.max(np.abs(values)))
+        np.testing.assert_allclose(envelope.upper[diagram], values.max(axis=0), atol=scale)
+        np.testing.assert_allclose(envelope.lower[diagram], values.min(axis=0), atol=scale)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from beamcalc.analysis import analyse
+from beamcalc.model import BeamModel
+from beamcalc.multi import analyse_stack
+from beamcalc.reactions import is_statically_determinate
+
+SUPPORTS = [
+    [("Fixed", 0.0)],
+    [("Fixed", 8.0)],
+    [("Hinge", 0.0), ("Roller", 8.0)],
+    [("Hinge", 1.5), ("Roller", 6.0)],
+    [("Fixed", 0.0), ("Roller", 8.0)],
+    [("Hinge", 0.0), ("Roller", 3.0), ("Roller", 8.0)],
+    [("Roller", 4.0)],
+]
+
+
+def _models(method):
+    rng = np.random.default_rng(7)
+    models = []
+    for k, supports in enumerate(SUPPORTS * 3):
+        start, end = sorted(rng.uniform(0, 8, 2))
+        models.append(BeamModel(
+            8.0, supports,
+            point_loads=[(float(rng.uniform(0, 8)), float(rng.uniform(-20, 5)))],
+            distributed_loads=[(float(start), float(end), float(rng.uniform(-5, 0)), float(rng.uniform(-5, 0)))],
+            moments=[(float(rng.uniform(0, 8)), float(rng.uniform(-10, 10)))],
+            resolution=25, deflection_method=method, name=str(k),
+        ))
+    return models
+
+
+def test_analyse_stack_matches_analyse():
+    for method in ("trapezoid", "simpson"):
+        models = _models(method)
+        # A small block size exercises several row blocks
+        stacked = analyse_stack(models, method, block_elements=1000)
+        for k, model in enumerate(models):
+            single, result = analyse(model), stacked.result(k)
+            # The stacked solver leaves indeterminate and unstable beams to analyse
+            assert result.ok == is_statically_determinate(model.supports, model.beam_length)
+            if not result.ok:
+                assert np.all(np.isnan(stacked.shear[k]))
+                continue
+            np.testing.assert_allclose([v for _, v in result.reactions], [v for _, v in single.reactions], atol=1e-9)
+            for diagram in ("shear", "moment", "deflection"):
+                expected = getattr(single, diagram)
+                np.testing.assert_allclose(getattr(result, diagram), expected, atol=1e-9 * (1 + np.max(np.abs(expected))))
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from beamcalc.reactions import UnsolvableBeamError, solve_indeterminate, solve_reactions
+
+LOADS = ([(3.0, -2.0), (7.5, -5.0)], [(1.0, 8.0, -1.0, -3.0), (0.0, 10.0, 2.0, 2.0)], [(5.0, 4.0), (9.0, -1.5)])
+
+DETERMINATE = {
+    "cantilever fixed at 0": [("Fixed", 0.0)],
+    "cantilever fixed at L": [("Fixed", 10.0)],
+    "simply supported": [("Hinge", 0.0), ("Roller", 10.0)],
+    "overhanging": [("Hinge", 2.0), ("Roller", 9.0)],
+}
+
+
+@pytest.mark.parametrize("supports", DETERMINATE.values(), ids=list(DETERMINATE))
+def test_stiffness_method_matches_statics(supports):
+    statics = solve_reactions(supports, *LOADS, 10.0)
+    stiffness = solve_indeterminate(supports, *LOADS, 10.0)
+    assert [position for position, _ in stiffness] == [position for position, _ in statics]
+    np.testing.assert_allclose([value for _, value in stiffness], [value for _, value in statics], atol=1e-9)
+
+
+def _equilibrium(supports, reactions, point_loads, distributed_loads, moments):
+    """Net vertical force and net clockwise moment about x = 0 of loads and reactions."""
+    forces = [(position, value) for position, value in reactions[:len(supports)]]
+    for start, end, w1, w2 in distributed_loads:
+        length = end - start
+        forces.append((start + length * (w1 + 2 * w2) / (3 * (w1 + w2)), 0.5 * (w1 + w2) * length))
+    forces += point_loads
+    couples = [moment for _, moment in moments]
+    for position, moment in reactions[len(supports):]:
+        # Reported fixed moments are clockwise positive at x = 0 and anticlockwise positive elsewhere
+        couples.append(moment if position == 0 else -moment)
+    net_force = sum(value for _, value in forces)
+    net_moment = sum(couples) - sum(position * value for position, value in forces)
+    return net_force, net_moment
+
+
+@pytest.mark.parametrize("supports", [
+    [("Fixed", 0.0), ("Roller", 10.0)],
+    [("Fixed", 0.0), ("Fixed", 10.0)],
+    [("Fixed", 4.0)],
+    [("Hinge", 0.0), ("Roller", 4.0), ("Roller", 10.0)],
+    [("Roller", 1.0), ("Fixed", 6.0), ("Hinge", 8.5)],
+])
+def test_indeterminate_reactions_satisfy_statics(supports):
+    reactions = solve_reactions(supports, *LOADS, 10.0)
+    net_force, net_moment = _equilibrium(supports, reactions, *LOADS)
+    assert abs(net_force) < 1e-9
+    assert abs(net_moment) < 1e-8
+
+
+def test_three_equal_spans_udl():
+    span, w = 5.0, 12.0
+    supports = [("Hinge", 0.0), ("Roller", span), ("Roller", 2 * span), ("Roller", 3 * span)]
+    reactions = solve_reactions(supports, [], [(0.0, 3 * span, -w, -w)], [], 3 * span)
+    np.testing.assert_allclose([value for _, value in reactions], np.array([0.4, 1.1, 1.1, 0.4]) * w * span)
+
+
+def test_single_roller_is_unsolvable():
+    with pytest.raises(UnsolvableBeamError):
+        solve_reactions([("Roller", 3.0)], *LOADS, 10.0)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from beamcalc.fem import BANDWIDTH, solve_support_reactions
+from beamcalc.solvers import BANDED_MAX_BANDWIDTH, DENSE_LIMIT, SOLVERS, MechanismError, select_solver
+
+pytest.importorskip("scipy")
+
+BACKENDS = ("dense", "banded", "sparse")
+LOADS = ([(3.3, -12.0), (17.0, -5.0)], [(0.0, 40.0, -2.0, -2.0)], [(21.5, 7.0)])
+
+
+def _supports(num_spans):
+    spacing = 40.0 / num_spans
+    return [("Fixed", 0.0)] + [("Roller", k * spacing) for k in range(1, num_spans + 1)]
+
+
+def test_select_solver_by_size_and_band():
+    assert select_solver(DENSE_LIMIT, BANDWIDTH).name == "dense"
+    assert select_solver(DENSE_LIMIT + 1, BANDWIDTH).name == "banded"
+    assert select_solver(10 * DENSE_LIMIT, BANDED_MAX_BANDWIDTH + 1).name == "sparse"
+
+
+@pytest.mark.parametrize("num_spans", [1, 3, 50])
+def test_backends_agree(num_spans):
+    supports = _supports(num_spans)
+    results = {backend: solve_support_reactions(supports, *LOADS, 40.0, backend) for backend in BACKENDS}
+    forces, couples, _ = results["dense"]
+    for backend, (backend_forces, backend_couples, stats) in results.items():
+        assert stats.backend == backend
+        assert stats.size == 2 * len(supports)
+        assert stats.nbytes > 0
+        np.testing.assert_allclose(backend_forces, forces, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(backend_couples, couples, rtol=1e-9, atol=1e-9)
+    # Total reaction balances the loads
+    assert abs(forces.sum() - (12.0 + 5.0 + 2.0 * 40.0)) < 1e-8
+
+
+def test_default_backend_for_many_supports_is_banded():
+    _, _, stats = solve_support_reactions(_supports(50), *LOADS, 40.0)
+    assert stats.backend == "banded"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("supports", [[("Hinge", 5.0)], [("Roller", 0.0)]])
+def test_mechanism_raises(supports, backend):
+    with pytest.raises(MechanismError):
+        solve_support_reactions(supports, *LOADS, 40.0, backend)
+
+
+def test_sparse_solver_matches_dense_on_a_wide_band():
+    rng = np.random.default_rng(3)
+    size, bandwidth = 120, BANDED_MAX_BANDWIDTH + 6
+    banded = rng.uniform(-1.0, 1.0, (bandwidth + 1, size))
+    # Diagonally dominant, so symmetric positive definite
+    banded[bandwidth] = 2.0 * bandwidth + 1.0
+    for offset in range(1, bandwidth + 1):
+        banded[bandwidth - offset, :offset] = 0.0
+    rhs = rng.uniform(-1.0, 1.0, (size, 2))
+    solver = select_solver(size, bandwidth)
+    assert solver is SOLVERS["sparse"]
+    solution, stats = solver.solve(banded, rhs)
+    expected, _ = SOLVERS["dense"].solve(banded, rhs)
+    np.testing.assert_allclose(solution, expected, rtol=1e-9, atol=1e-12)
+    assert stats.backend == "sparse"